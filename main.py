@@ -2,8 +2,8 @@ import os
 import json
 import argparse
 from itertools import product
-from sierra.run_basin_model import run_model
-from functools import partial
+from sierra.run_basin_model import run_model, run_model_chunks
+from sierra.utilities.climates import climate_dates
 import pandas as pd
 from loguru import logger
 
@@ -16,16 +16,47 @@ load_dotenv()
 parser = argparse.ArgumentParser()
 parser.add_argument("-b", "--basin", help="Basin to run")
 parser.add_argument("-d", "--debug", help="Debug", action='store_true')
-parser.add_argument("-mp", "--multiprocessing", help="Multiprocessing protocol (omit for none)")
-parser.add_argument("-c", "--num_cores", help="Number of cores to use in joblib multiprocessing", type=int)
+parser.add_argument("-mp", "--multiprocessing", help="Run models in parallel with dask (omit to run serially)",
+                    nargs='?', const='dask')
+parser.add_argument("-c", "--num_cores", help="Number of cores (local dask workers) to use", type=int)
+parser.add_argument("-ml", "--memory_limit", help="Memory limit of each local dask worker (e.g., 4GB)")
+parser.add_argument("-ds", "--scheduler", help="Address of a dask scheduler to run models on (defaults to "
+                                               "SIERRA_DASK_SCHEDULER, or a local cluster)")
+parser.add_argument("-rt", "--retries", help="Number of times to retry a failed model", type=int, default=1)
 parser.add_argument("-p", "--include_planning", help="Include planning model", action='store_true')
 parser.add_argument("-m", "--planning_months", help="Planning months", type=int)
+parser.add_argument("-rp", "--rolling_planning", help="Re-plan monthly keeping the planning solver's basis",
+                    action='store_true')
+parser.add_argument("-of", "--output_format", help="Results format (csv or hdf5)", default='csv')
+parser.add_argument("-f32", "--float32", help="Save HDF5 results as 32-bit floats", action='store_true')
 parser.add_argument("-sc", "--scenario_set", help="Scenario set")
 parser.add_argument("-s", "--start_year", help="Start year", type=int)
 parser.add_argument("-e", "--end_year", help="End year", type=int)
 parser.add_argument("-y", "--years", help="Years to run (useful for debugging)", type=int)
 parser.add_argument("-n", "--run_name", help="Run name")
 parser.add_argument("-pb", "--progress_bar", help="Show progress bar", action='store_true')
+parser.add_argument("-cs", "--climate_scenarios", help="Run climates with the same dates together, as a scenario",
+                    action='store_true')
+parser.add_argument("-pr", "--profile", help="Profile model components, saving a report as csv (default) or json",
+                    nargs='?', const='csv', choices=['csv', 'json'])
+parser.add_argument("-ck", "--checkpoint", help="Save a checkpoint at the end of each water year",
+                    action='store_true')
+parser.add_argument("-r", "--resume", help="Resume from the latest checkpoint (and keep saving checkpoints)",
+                    action='store_true')
+parser.add_argument("-tc", "--time_chunks", help="Run each model in this many parallel chunks of water years",
+                    type=int)
+parser.add_argument("-su", "--spinup_years", help="Water years to run before each time chunk", type=int, default=2)
+parser.add_argument("-nc", "--no_cache", help="Rebuild the model files instead of using cached versions",
+                    action='store_true')
+parser.add_argument("-rm", "--reuse_models", help="Reuse each process's loaded models for later climates, replacing "
+                                                  "their climate inputs instead of loading the models again",
+                    action='store_true')
+parser.add_argument("-op", "--output_profile", help="Recorders to save, and how to aggregate them: full (default), "
+                                                    "energy_only, ensemble_summary or a JSON file of rules",
+                    default='full')
+parser.add_argument("-sr", "--stream_results", help="Write results to disk at the end of each water year, rather than "
+                                                    "keeping them in memory until the end of the run",
+                    action='store_true')
 args = parser.parse_args()
 
 basin = args.basin
@@ -100,6 +131,14 @@ if basin == 'all':
 else:
     basins = [basin]
 
+if args.climate_scenarios:
+    # group climates with the same dates, to be run together in one model
+    climate_groups = {}
+    for climate in climate_scenarios:
+        dates = (start, end) if start and end else climate_dates(climate)
+        climate_groups.setdefault(dates, []).append(climate)
+    climate_scenarios = list(climate_groups.values())
+
 model_args = list(product(climate_scenarios, basins))
 
 file_suffix = None if debug else date.today().strftime('%Y-%m-%d')
@@ -109,6 +148,16 @@ kwargs = dict(
     include_planning=include_planning,
     debug=debug,
     planning_months=planning_months,
+    rolling_planning=args.rolling_planning,
+    use_cache=not args.no_cache,
+    reuse_model=args.reuse_models,
+    output_profile=os.path.abspath(args.output_profile) if os.path.isfile(args.output_profile) else args.output_profile,
+    stream_results=args.stream_results,
+    results_format=args.output_format,
+    float32=args.float32,
+    profile=args.profile,
+    checkpoint=args.checkpoint,
+    resume=args.resume,
     use_multiprocessing=multiprocessing is not None,
     start=start,
     end=end,
@@ -119,29 +168,23 @@ kwargs = dict(
     file_suffix=file_suffix
 )
 
-if not multiprocessing:  # serial processing for debugging
+if args.time_chunks:  # each model is run in parallel chunks, so models are run one at a time
+    for model_arg in model_args:
+        run_model_chunks(*model_arg, args.time_chunks, spinup_years=args.spinup_years, num_cores=args.num_cores,
+                         **kwargs)
+
+elif not multiprocessing:  # serial processing for debugging
     for args in model_args:
         run_model(*args, **kwargs)
 
 else:
-    import multiprocessing as mp
-
-    num_cores = args.num_cores or mp.cpu_count() - 1
-
-    run_partial = partial(run_model, **kwargs)
-
-    if multiprocessing == 'joblib':
-        from joblib import Parallel, delayed
-
-        n_jobs = min(num_cores, len(climate_scenarios))
-        output = Parallel(n_jobs=n_jobs)(delayed(run_partial)(*args) for args in model_args)
+    from sierra.run_batch import run_batch
 
-    else:
-        pool = mp.Pool(processes=num_cores)
-        for args in model_args:
-            pool.apply_async(run_partial, *args)
+    if multiprocessing != 'dask':
+        logger.info('Multiprocessing with {} is replaced by dask'.format(multiprocessing))
 
-        pool.close()
-        pool.join()
+    num_workers = min(args.num_cores or max(os.cpu_count() - 1, 1), len(model_args))
+    run_batch(model_args, scheduler=args.scheduler, num_workers=num_workers, memory_limit=args.memory_limit,
+              retries=args.retries, **kwargs)
 
 logger.info('Done!')
@@ -13,6 +13,7 @@ import preprocessing.hydrology.merced as mer
 import preprocessing.hydrology.upper_san_joaquin as usj
 
 from sierra.utilities.constants import basin_lookup
+from sierra.utilities.hydrology_store import build_store
 
 # import preprocessing.tuolumne as tuo
 
@@ -102,10 +103,15 @@ def process_basin_climate(tasks, basin, dataset, climate):
             usj.sjrrp_below_friant(src, dst)
             usj.calculate_millerton_snowmelt_inflow(src, dst)
 
+    # after processing hydrology
+    if "store" in tasks:
+        # binary copy of the climate's time series, read by models instead of the CSV files
+        build_store(climate_path)
+
 
 def preprocess_hydrology(dataset, basins_to_process=None, tasks=None, debug=False):
     basins_to_process = basins_to_process or ['stn', 'tuo', 'mer', 'usj']
-    tasks = tasks or ["pre", "common", "basins"]
+    tasks = tasks or ["pre", "common", "basins", "store"]
 
     climates = {}
 
@@ -177,7 +183,7 @@ if __name__ == '__main__':
 
     parser = argparse.ArgumentParser()
     parser.add_argument("-t", "--tasks",
-                        help="Tasks to run. Options include 'pre', 'common', and 'basins'. Default is all.")
+                        help="Tasks to run. Options include 'pre', 'common', 'basins', and 'store'. Default is all.")
     parser.add_argument("-b", "--basin",
                         help="Basin to run. Options include 'stn', 'tuo', 'mer', and 'usj'. Default is all.")
     parser.add_argument("-d", "--dataset",
@@ -186,7 +192,7 @@ if __name__ == '__main__':
                         """)
     args = parser.parse_args()
 
-    tasks = args.tasks or ["pre", "common", "basins"]
+    tasks = args.tasks or ["pre", "common", "basins", "store"]
     basins = [args.basin] if args.basin else None
     dataset = args.dataset
     if not dataset:
@@ -0,0 +1,103 @@
+"""
+Microbenchmark of the PH_Water_Demand price threshold and production hours calculations, comparing the original
+string-indexed pandas approach with the precomputed EnergyPriceIndex.
+
+This mimics a 30-year Stanislaus run with 14 PH_Water_Demand parameters, using synthetic hourly prices in the same
+format as "All Energy Price Values" (one row per YYYY-MM-DD date, one column per hour).
+
+Usage: python scripts/benchmark_price_index.py [num_scenarios]
+"""
+
+import sys
+import time
+from calendar import isleap
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+from dateutil.relativedelta import relativedelta
+
+sys.path.append('.')
+from sierra.utilities.prices import EnergyPriceIndex
+
+NUM_YEARS = 30
+NUM_PARAMETERS = 14
+START_YEAR = 1980
+
+
+def make_prices(start_year=START_YEAR, num_years=NUM_YEARS):
+    dates = pd.date_range('{}-01-01'.format(start_year), '{}-12-31'.format(start_year + num_years - 1))
+    hourly = np.random.lognormal(3.5, 0.4, size=(len(dates), 24))
+    hourly[np.random.random(hourly.shape) < 0.01] *= -1  # a few negative prices
+    return pd.DataFrame(hourly, index=dates.strftime('%Y-%m-%d'), columns=[str(h) for h in range(1, 25)])
+
+
+def run_original(prices, dates, num_scenarios, block):
+    price_threshold = np.zeros(num_scenarios)
+    total_hours = 0
+    for date in dates:
+        price_year = date.year
+        if date.month == 2 and date.day == 29:
+            price_date = date.strftime('{}-02-28'.format(price_year))
+        else:
+            price_date = date.strftime('{}-%m-%d'.format(price_year))
+        for sid in range(num_scenarios):
+            if date.day == 1:
+                end = date + relativedelta(months=+1) - relativedelta(days=+1)
+                if not isleap(price_year) and date.month == 2:
+                    price_end = '{}-02-28'.format(price_year)
+                else:
+                    price_end = end.strftime('{}-%m-%d'.format(price_year))
+                energy_prices = prices[price_date:price_end].values.flatten()
+                energy_prices[::-1].sort()
+                price_index = int(len(energy_prices) * 0.5) - 1
+                price_threshold[sid] = energy_prices[price_index]
+            energy_prices_today = prices.loc[price_date].values
+            if block == 1:
+                total_hours += len([1 for p in energy_prices_today if p >= price_threshold[sid]])
+            else:
+                total_hours += len([1 for p in energy_prices_today if 0.0 < p < price_threshold[sid]])
+    return total_hours
+
+
+def run_indexed(price_index, dates, num_scenarios, block):
+    price_threshold = np.zeros(num_scenarios)
+    release_fractions = np.full(num_scenarios, 0.5)
+    total_hours = 0
+    for date in dates:
+        if date.day == 1:
+            end = date + relativedelta(months=+1) - relativedelta(days=+1)
+            price_threshold[:] = price_index.price_thresholds(date.year, date.month, end.day, release_fractions)
+        total_hours += price_index.production_hours(date.year, date.month, date.day, price_threshold,
+                                                    block=block).sum()
+    return total_hours
+
+
+def main(num_scenarios=1):
+    prices = make_prices()
+    dates = pd.date_range(datetime(START_YEAR, 1, 1), periods=365 * NUM_YEARS).to_pydatetime()
+
+    t0 = time.time()
+    original_hours = 0
+    for i in range(NUM_PARAMETERS):
+        original_hours += run_original(prices, dates, num_scenarios, block=i % 3 + 1)
+    original_seconds = time.time() - t0
+
+    t0 = time.time()
+    price_index = EnergyPriceIndex(prices)
+    setup_seconds = time.time() - t0
+    indexed_hours = 0
+    for i in range(NUM_PARAMETERS):
+        indexed_hours += run_indexed(price_index, dates, num_scenarios, block=i % 3 + 1)
+    indexed_seconds = time.time() - t0
+
+    assert original_hours == indexed_hours, 'Production hours differ: {} vs {}'.format(original_hours, indexed_hours)
+
+    print('{} parameters x {} scenarios x {} days'.format(NUM_PARAMETERS, num_scenarios, len(dates)))
+    print('Original: {:.2f} seconds'.format(original_seconds))
+    print('Indexed: {:.2f} seconds (including {:.2f} seconds to build the index)'.format(indexed_seconds, setup_seconds))
+    print('Speedup: {:.1f}x'.format(original_seconds / indexed_seconds))
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1)
@@ -0,0 +1,63 @@
+"""
+Benchmark of custom type registration at model startup, comparing importing every parameter module (as _run_model did)
+with importing only the modules of types used by the basin's model (see sierra.utilities.registry).
+
+Each measurement is made in a fresh Python process, as for each model run of an ensemble on a new worker.
+
+Usage: python scripts/benchmark_startup.py [repeats]
+"""
+
+import sys
+import subprocess
+
+import numpy as np
+
+BASINS = ['stanislaus', 'tuolumne', 'merced', 'upper_san_joaquin']
+
+IMPORT_ALL = """
+import os, time
+from importlib import import_module
+import pywr.core
+t0 = time.perf_counter()
+for folder, package in [('sierra/parameters', 'sierra.parameters'),
+                        ('sierra/models/{basin}/_parameters', 'sierra.models.{basin}._parameters')]:
+    for filename in os.listdir(folder):
+        if filename.endswith('.py') and '__init__' not in filename:
+            import_module(package + '.' + os.path.splitext(filename)[0])
+import_module('sierra.domains')
+import_module('sierra.recorders.hydropower')
+print(time.perf_counter() - t0, len(os.listdir('sierra/models/{basin}/_parameters')))
+"""
+
+IMPORT_USED = """
+import json, time
+import pywr.core
+t0 = time.perf_counter()
+from sierra.utilities.registry import register_model_types
+with open('sierra/models/{basin}/pywr_model.json') as f:
+    data = json.load(f)
+modules = register_model_types(data, basin='{basin}')
+print(time.perf_counter() - t0, len(modules))
+"""
+
+
+def measure(code, repeats):
+    seconds = []
+    for i in range(repeats):
+        output = subprocess.check_output([sys.executable, '-c', code]).decode().split()
+        seconds.append(float(output[0]))
+    return np.median(seconds), int(output[1])
+
+
+if __name__ == '__main__':
+    repeats = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+
+    # build the manifest, so that it is not rebuilt in the first measurement
+    subprocess.check_call([sys.executable, '-m', 'sierra.utilities.registry'])
+
+    print('{:<20}{:>18}{:>18}{:>10}'.format('basin', 'import all (s)', 'import used (s)', 'speedup'))
+    for basin in BASINS:
+        all_seconds, all_modules = measure(IMPORT_ALL.format(basin=basin), repeats)
+        used_seconds, used_modules = measure(IMPORT_USED.format(basin=basin), repeats)
+        print('{:<20}{:>12.3f} ({:>3}){:>12.3f} ({:>3}){:>9.1f}x'.format(
+            basin, all_seconds, all_modules, used_seconds, used_modules, all_seconds / used_seconds))
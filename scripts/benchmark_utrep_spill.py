@@ -0,0 +1,124 @@
+"""
+Benchmark of the Hetch Hetchy UTREP spill forecast.
+
+By default, this is a microbenchmark comparing the original day-by-day forecast (pandas date range, with per-day
+inflow and IFR schedule lookups) with the NumPy recurrence used by IFR_bl_Hetch_Hetchy_Reservoir_UTREP_Spill, using
+synthetic Livneh-length (1950-2012) inflows and forecasting from every day of the Apr-Jul snowmelt season.
+
+With --model, a full Tuolumne Livneh run is profiled instead, and the share of the run's time spent in the UTREP spill
+parameter is reported. Run this before and after a change to compare (requires SIERRA_DATA_PATH).
+
+Usage: python scripts/benchmark_utrep_spill.py [--model] [num_scenarios]
+"""
+
+import os
+import sys
+import time
+import cProfile
+import pstats
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+sys.path.append('.')
+from sierra.models.tuolumne._parameters.IFR_bl_Hetch_Hetchy_Reservoir_UTREP_Spill import forecast_spill
+
+START_YEAR = 1950
+END_YEAR = 2012
+POWER_TUNNEL_MAX_MCM = 4.0
+MAX_STORAGE_MCM = 444.0
+
+
+def make_inputs():
+    dates = pd.date_range('{}-10-01'.format(START_YEAR), '{}-09-30'.format(END_YEAR))
+    snowmelt = np.exp(-((dates.dayofyear.values - 150) / 40.0) ** 2)
+    inflow = pd.Series(np.random.gamma(2.0, 1.0, len(dates)) * (0.5 + 15 * snowmelt), index=dates)
+    schedule_cfs = pd.DataFrame(np.random.uniform(35, 125, size=(12, 5)))
+    return inflow, schedule_cfs
+
+
+def original_spill(start, end, storage, wyt, inflow, schedule_cfs):
+    total_spill = 0.0
+    add_ifr = 0.1565 if wyt <= 2 else 0
+    lookup_col = min([3, 2, 1].index(int(wyt)) * 2 + 1, 4)
+    for date in pd.date_range(start=start, end=end, freq='D'):
+        base_ifr = (schedule_cfs.iat[date.month - 1, lookup_col] + 5) / 35.31 * 0.0864
+        storage_temp = storage + inflow[date] - POWER_TUNNEL_MAX_MCM - (base_ifr + add_ifr)
+        spill = max(storage - MAX_STORAGE_MCM, 0.0)
+        storage = storage_temp - spill
+        total_spill += spill
+    return total_spill
+
+
+def recurrence_spill(start, end, storage, wyt, dates, months, inflow_mcm, base_ifr_mcm, cache):
+    key = (start, end, wyt, round(storage, 6))
+    if key in cache:
+        return cache[key]
+    start_row = dates.get_loc(start)
+    end_row = dates.get_loc(end)
+    add_ifr = 0.1565 if wyt <= 2 else 0
+    lookup_col = min([3, 2, 1].index(int(wyt)) * 2 + 1, 4)
+    ifr = base_ifr_mcm[months[start_row:end_row + 1] - 1, lookup_col] + add_ifr
+    net_inflow = inflow_mcm[start_row:end_row + 1] - POWER_TUNNEL_MAX_MCM - ifr
+    cache[key] = total_spill = forecast_spill(storage, MAX_STORAGE_MCM, net_inflow)
+    return total_spill
+
+
+def run_microbenchmark(num_scenarios):
+    inflow, schedule_cfs = make_inputs()
+    calls = []
+    for year in range(START_YEAR + 1, END_YEAR + 1):
+        for date in pd.date_range(datetime(year, 4, 1), datetime(year, 7, 15)):
+            for s in range(num_scenarios):
+                calls.append((date, datetime(year, 7, 15), 300.0 + 10 * (s % 2), 1 + s % 3))
+
+    t0 = time.time()
+    original = [original_spill(start, end, storage, wyt, inflow, schedule_cfs)
+                for start, end, storage, wyt in calls]
+    original_seconds = time.time() - t0
+
+    t0 = time.time()
+    dates = pd.DatetimeIndex(inflow.index)
+    months = dates.month.values
+    inflow_mcm = inflow.values
+    base_ifr_mcm = (schedule_cfs.values + 5) / 35.31 * 0.0864
+    cache = {}
+    recurrence = [recurrence_spill(pd.Timestamp(start), end, storage, wyt, dates, months, inflow_mcm, base_ifr_mcm,
+                                   cache) for start, end, storage, wyt in calls]
+    recurrence_seconds = time.time() - t0
+
+    assert np.allclose(original, recurrence), 'Spill forecasts differ'
+
+    print('{} forecasts ({} scenarios)'.format(len(calls), num_scenarios))
+    print('Original: {:.2f} seconds'.format(original_seconds))
+    print('Recurrence: {:.2f} seconds'.format(recurrence_seconds))
+    print('Speedup: {:.1f}x'.format(original_seconds / recurrence_seconds))
+
+
+def run_model_profile():
+    from sierra.run_basin_model import _run_model
+
+    profiler = cProfile.Profile()
+    profiler.enable()
+    _run_model('historical/Livneh', 'tuolumne', data_path=os.environ['SIERRA_DATA_PATH'], run_name='benchmark')
+    profiler.disable()
+
+    stats = pstats.Stats(profiler)
+    total_seconds = stats.total_tt
+    utrep_seconds = 0.0
+    for (filename, line, name), (cc, nc, tt, ct, callers) in stats.stats.items():
+        if filename.endswith('IFR_bl_Hetch_Hetchy_Reservoir_UTREP_Spill.py') and name == 'value':
+            utrep_seconds += ct
+
+    print('Total run: {:.1f} seconds'.format(total_seconds))
+    print('UTREP spill parameter: {:.1f} seconds ({:.1f}% of total)'.format(
+        utrep_seconds, utrep_seconds / total_seconds * 100))
+
+
+if __name__ == '__main__':
+    args = sys.argv[1:]
+    if '--model' in args:
+        run_model_profile()
+    else:
+        run_microbenchmark(int(args[0]) if args else 1)
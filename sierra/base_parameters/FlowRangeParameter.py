@@ -1,5 +1,4 @@
 from sierra.base_parameters import IFRParameter
-from sierra.utilities.converter import convert
 
 
 class FlowRangeParameter(IFRParameter):
@@ -26,7 +25,7 @@ class FlowRangeParameter(IFRParameter):
         elif default:
             flow_range = default(timestep, scenario_index)
 
-        flow_range_mcm = convert(flow_range, "m^3 s^-1", "m^3 day^-1", scale_in=1, scale_out=1000000.0)
+        flow_range_mcm = self.cms_to_mcm(flow_range)
 
         return flow_range_mcm
 
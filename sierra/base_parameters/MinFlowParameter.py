@@ -1,4 +1,5 @@
 import random
+import numpy as np
 from dateutil.relativedelta import relativedelta
 from datetime import datetime
 from sierra.base_parameters import IFRParameter
@@ -19,6 +20,12 @@ class MinFlowParameter(IFRParameter):
     ramp_rate = None
     spring_recession = False
 
+    # Requirements for all scenarios, calculated once per time step
+    ifr_scenario_indices = None
+    scenario_climates = None
+    _requirements = None
+    _requirements_datetime = None
+
     # Functional flows parameters
     magnitude_col = None
     dry_season_baseflow_mcm = None
@@ -26,17 +33,40 @@ class MinFlowParameter(IFRParameter):
     wet_baseflow_start = 100
     flood_lengths = {2: 7, 5: 2, 10: 2}
 
+    state_attributes = ['current_flow_period', 'water_year_type', 'close_wet_season_gates', 'ramp_rate',
+                        'spring_recession', 'prev_requirement', 'flood_days', 'flood_duration', 'prev_flood_mcm',
+                        'flood_year']
+
     def setup(self, *args, **kwargs):
         super().setup(*args, **kwargs)
 
+        # group scenario combinations by IFR scenario, so each IFR regime is calculated once per time step
+        self.ifr_scenario_indices = {}
+        for scenario_index in self.model.scenarios.combinations:
+            if self.ifrs_idx is not None:
+                scenario_name = self.ifr_names[scenario_index.indices[self.ifrs_idx]]
+            else:
+                scenario_name = None
+            self.ifr_scenario_indices.setdefault(scenario_name, []).append(scenario_index)
+
         for s in self.model.scenarios.scenarios:
             if 'Functional Flows' in s.ensemble_names:
                 self.current_flow_period = [FlowPeriods.DRY_SEASON] * self.num_scenarios
 
                 self.include_functional_flows = True
                 self.metrics = self.model.tables['functional flows metrics']
-                self.water_year_type = 'moderate'
-                self.close_wet_season_gates = False
+
+                # the water year type and season state are kept per climate (see WaterLPParameter.climate_index)
+                self.scenario_climates = np.array(
+                    [self.climate_index(scenario_index) for scenario_index in self.model.scenarios.combinations], int)
+                self.climate_scenario_indices = {}
+                for scenario_index in self.model.scenarios.combinations:
+                    self.climate_scenario_indices.setdefault(self.climate_index(scenario_index), scenario_index)
+                num_climates = int(self.scenario_climates.max()) + 1
+                self.water_year_type = ['moderate'] * num_climates
+                self.close_wet_season_gates = [False] * num_climates
+                self.ramp_rate = [None] * num_climates
+                self.spring_recession = [False] * num_climates
 
                 self.water_year_types = {
                     1: 'dry',
@@ -44,7 +74,7 @@ class MinFlowParameter(IFRParameter):
                     3: 'wet'
                 }
 
-                self.prev_requirement = [0] * self.num_scenarios
+                self.prev_requirement = np.zeros(self.num_scenarios)
                 self.flood_days = [0] * self.num_scenarios
                 self.flood_duration = [0] * self.num_scenarios
                 self.prev_flood_mcm = [0] * self.num_scenarios
@@ -60,6 +90,11 @@ class MinFlowParameter(IFRParameter):
                 #     self.flood_volumes_mcm[return_interval] \
                 #         = floods['{}-year'.format(return_interval)] / 35.315 * 0.0864 * flood_lengths[return_interval]
 
+    def reset(self):
+        super().reset()
+        self._requirements = None
+        self._requirements_datetime = None
+
     def before(self):
         super().before()
 
@@ -74,15 +109,16 @@ class MinFlowParameter(IFRParameter):
         if self.include_functional_flows:
 
             if timestep.month == 10 and timestep.day == 1:
-                # update water year type, assuming perfect foresight
+                # update water year types, assuming perfect foresight
                 wy = timestep.year + 1
-                fnf_annual = self.model.tables['Annual Full Natural Flow']
-                terciles = fnf_annual.quantile([0, 0.33, 0.66]).values
-                wyt = sum([1 for q in terciles if fnf_annual[datetime.strptime(str(wy), '%Y')] >= q]) 
-                self.water_year_type = self.water_year_types[wyt]
-                self.close_wet_season_gates = True
-                self.ramp_rate = None
-                self.spring_recession = False
+                for climate, scenario_index in self.climate_scenario_indices.items():
+                    fnf_annual = self.climate_table('Annual Full Natural Flow', scenario_index)
+                    terciles = fnf_annual.quantile([0, 0.33, 0.66]).values
+                    wyt = sum([1 for q in terciles if fnf_annual[datetime.strptime(str(wy), '%Y')] >= q])
+                    self.water_year_type[climate] = self.water_year_types[wyt]
+                    self.close_wet_season_gates[climate] = True
+                    self.ramp_rate[climate] = None
+                    self.spring_recession[climate] = False
 
     def get_down_ramp_ifr(self, timestep, scenario_index, value, initial_value=None, rate=0.25):
         """
@@ -110,51 +146,106 @@ class MinFlowParameter(IFRParameter):
         :param scenario_index:
         :return:
         """
+        if self._requirements is None or self._requirements_datetime != timestep.datetime:
+            self._requirements = self.requirements(timestep, default=default)
+            self._requirements_datetime = timestep.datetime
+        return self._requirements[scenario_index.global_id]
 
-        if self.ifrs_idx is not None:
-            scenario_name = self.ifr_names[scenario_index.indices[self.ifrs_idx]]
-        else:
-            scenario_name = None
+    def requirements(self, timestep, default=None):
+        """
+        Calculate the custom IFRs for all scenario combinations at once
+        :param timestep:
+        :param default: the baseline IFR function, called for each scenario without a custom IFR
+        :return: an array of requirements, indexed by scenario global id
+        """
 
-        min_flow_mcm = 0.0
+        min_flows = np.zeros(self.num_scenarios)
 
-        if scenario_name == 'No IFRs':
-            min_flow_mcm = 0.0
+        for scenario_name, scenario_indices in self.ifr_scenario_indices.items():
+            sids = [s.global_id for s in scenario_indices]
 
-        elif scenario_name == 'SWRCB' and self.ifr_type == 'enhanced':
-            min_flow_mcm = self.swrcb_flows_min_flow(timestep, scenario_index)
+            if scenario_name == 'No IFRs':
+                min_flows[sids] = 0.0
 
-        elif scenario_name == 'Functional Flows' and self.ifr_type == 'enhanced':
-            if self.model.mode == 'scheduling':
-                min_flow_mcm = self.functional_flows_min_flow_scheduling(timestep, scenario_index, scenario_name)
-            else:
-                min_flow_mcm = self.functional_flows_min_flow_planning(timestep, scenario_index, scenario_name)
+            elif scenario_name == 'SWRCB' and self.ifr_type == 'enhanced':
+                min_flows[sids] = self.swrcb_flows_min_flow(timestep, sids)
+
+            elif scenario_name == 'Functional Flows' and self.ifr_type == 'enhanced':
+                if self.model.mode == 'scheduling':
+                    min_flows[sids] = self.functional_flows_min_flow_scheduling(timestep, sids)
+                else:
+                    min_flows[sids] = self.functional_flows_min_flow_planning(timestep, sids)
 
-        elif default:
-            min_flow_mcm = default(timestep, scenario_index)
+            elif default:
+                min_flows[sids] = [default(timestep, s) or 0.0 for s in scenario_indices]
 
-        return min_flow_mcm
+        return min_flows
 
-    def swrcb_flows_min_flow(self, timestep, scenario_index):
-        fnf_mcm = self.model.parameters['Full Natural Flow'].get_value(scenario_index)
+    def swrcb_flows_min_flow(self, timestep, sids):
+        fnf_mcm = np.asarray(self.model.parameters['Full Natural Flow'].get_all_values())[sids]
         ifr_mcm = fnf_mcm * 0.4
         ifr_cms = ifr_mcm / 0.0864
         return ifr_cms
 
-    def functional_flows_min_flow_scheduling(self, timestep, scenario_index, scenario_name=None):
+    def functional_flows_min_flow_scheduling(self, timestep, sids):
         """
         Calculate the minimum functional flow
         :param timestep:
-        :param scenario_index:
+        :param sids: the global ids of the functional flows scenarios
         :return:
         """
-        sid = scenario_index.global_id
 
-        metrics = self.metrics[self.water_year_type]
+        sids = np.asarray(sids, int)
+        climates = self.scenario_climates[sids]
+
+        # full natural flow of each scenario's climate
+        fnf_mcm = self.flow_window_sum('Full Natural Flow', timestep.datetime, timestep.datetime)
+
+        ifr_cfs = np.zeros(len(sids))
+        for climate in np.unique(climates):
+            rows = climates == climate
+            ifr_cfs[rows] = self.functional_flow_cfs(timestep, climate, fnf_mcm[sids[rows][0]])
+
+        if 4 <= timestep.month <= 9:
+
+            # ...ramp down rate
+            ramp_down_rate = 0.07
+
+            prev_flow_mcm = self.model.nodes[self.res_name].prev_flow[sids]
+            ifr_ramp_down_cfs = prev_flow_mcm * (1 - ramp_down_rate) / 0.0864 * 35.315
+
+            spring_recession = np.array([self.spring_recession[climate] for climate in climates], bool)
+            dry_season_cfs = np.array([self.metrics[self.water_year_type[climate]]['DS_Mag_50'] for climate in climates])
+
+            # Spring recession ramp down, or non-spring recession ramp down
+            ifr_cfs = np.where(spring_recession, np.maximum(ifr_ramp_down_cfs, dry_season_cfs),
+                               np.maximum(ifr_ramp_down_cfs, ifr_cfs))
+
+        ifr_mcm = ifr_cfs / 35.315 * 0.0864
+
+        # This releases the minimum of functional flows and full natural flow
+        # Commented out because probably not needed, but retained for posterity (and to show we explicitly
+        # commented this out)
+        # ifr_mcm = np.minimum(ifr_mcm, fnf_mcm[sids])
+
+        self.prev_requirement[sids] = ifr_mcm
+
+        ifr_cms = ifr_mcm / 0.0864
+
+        return ifr_cms
+
+    def functional_flow_cfs(self, timestep, climate, fnf_mcm):
+        """
+        Calculate the functional flow of a climate, before ramping down
+        :param timestep:
+        :param climate: the climate index
+        :param fnf_mcm: the climate's full natural flow
+        :return: the flow, in cfs
+        """
+
+        metrics = self.metrics[self.water_year_type[climate]]
 
-        ifr_mcm = 0.0
         ifr_cfs = 0.0
-        fnf = self.model.parameters['Full Natural Flow'].dataframe
 
         # Dry season baseflow
         if self.dowy < metrics['Wet_Tim']:
@@ -171,7 +262,7 @@ class MinFlowParameter(IFRParameter):
             ramp_up_cfs = 0.0  # set default pre-spring ramp up
 
             # Look forward 1 day and release anything between 2-year and 10-year flood peak
-            fnf_cfs = fnf[timestep.datetime] / 0.0864 * 35.315  # fnf mcm -> cfs
+            fnf_cfs = fnf_mcm / 0.0864 * 35.315  # fnf mcm -> cfs
 
             # TODO: update based on Ann's estimation; might have an early & late wet season baseflow
             ifr_cfs = metrics['Wet_BFL_Mag_10']
@@ -180,8 +271,9 @@ class MinFlowParameter(IFRParameter):
                 ifr_cfs = min(fnf_cfs, metrics['Peak_10'])
 
             # Check and see if we should start the spring recession
-            if (timestep.month, timestep.day) >= (5, 10) and ifr_cfs >= metrics['SP_Mag'] and not self.spring_recession:
-                self.spring_recession = True
+            if (timestep.month, timestep.day) >= (5, 10) and ifr_cfs >= metrics['SP_Mag'] \
+                    and not self.spring_recession[climate]:
+                self.spring_recession[climate] = True
 
             else:
                 # Calculate pre-spring ramp up
@@ -190,45 +282,17 @@ class MinFlowParameter(IFRParameter):
                 ramp_up_cfs = metrics['SP_Mag'] * (1 - ramp_up_rate)
                 ifr_cfs = max(ifr_cfs, ramp_up_cfs)
 
-        elif self.dowy == metrics['SP_Tim'] and not self.spring_recession:
+        elif self.dowy == metrics['SP_Tim'] and not self.spring_recession[climate]:
             ifr_cfs = metrics['SP_Mag']
-            self.spring_recession = True
-
-        if 4 <= timestep.month <= 9:
+            self.spring_recession[climate] = True
 
-            # ...ramp down rate
-            ramp_down_rate = 0.07
-
-            prev_flow_mcm = self.model.nodes[self.res_name].prev_flow[sid]
-            ifr_ramp_down_cfs = prev_flow_mcm * (1 - ramp_down_rate) / 0.0864 * 35.315
+        return ifr_cfs
 
-            if self.spring_recession:
-                # Spring recession ramp down
-                ifr_cfs = max(ifr_ramp_down_cfs, metrics['DS_Mag_50'])
-
-            else:
-                # Non-spring recession ramp down
-                ifr_cfs = max(ifr_ramp_down_cfs, ifr_cfs)
-
-        ifr_mcm = ifr_mcm or (ifr_cfs / 35.315 * 0.0864)
-
-        # This releases the minimum of functional flows and full natural flow
-        # Commented out because probably not needed, but retained for posterity (and to show we explicitly
-        # commented this out)
-        # fnf_mcm = fnf[timestep.datetime]
-        # ifr_mcm = min(ifr_mcm, fnf_mcm)
-
-        self.prev_requirement[sid] = ifr_mcm
-
-        ifr_cms = ifr_mcm / 0.0864
-
-        return ifr_cms
-
-    def functional_flows_min_flow_planning(self, timestep, scenario_index, scenario_name=None):
+    def functional_flows_min_flow_planning(self, timestep, sids):
         """
         Calculate the minimum functional flow
         :param timestep:
-        :param scenario_index:
+        :param sids: the global ids of the functional flows scenarios
         :return:
         """
 
@@ -1,9 +1,15 @@
+from copy import deepcopy
 from dateutil.relativedelta import relativedelta
 from calendar import monthrange
 
+import numpy as np
 import pandas as pd
 from pywr.parameters import Parameter
 
+from sierra.utilities.tables import prepare_tables
+from sierra.utilities.flow_index import get_flow_index
+from sierra.utilities.converter import get_converter
+
 
 class Timestep(object):
     step = None
@@ -30,11 +36,25 @@ class WaterLPParameter(Parameter):
     elevation_param = ''
     num_scenarios = 0
 
+    # Set to True in subclasses that calculate all scenarios at once via `values`
+    vectorized = False
+    _values_cache = None
+    _values_datetime = None
+
+    # Attributes that carry over from one time step to the next (e.g., per-scenario arrays updated in value), which
+    # are saved to and restored from checkpoints via get_state and set_state
+    state_attributes = []
+
     timestep = Timestep()
 
+    # cms to mcm per day; bound in setup, since converting is in the value hot path
+    cms_to_mcm = None
+
     def setup(self):
         super().setup()
 
+        self.cms_to_mcm = get_converter("m^3 s^-1", "m^3 day^-1", scale_in=1, scale_out=1000000.0)
+
         self.num_scenarios = len(self.model.scenarios.combinations)
 
         self.mode = getattr(self.model, 'mode', self.mode)
@@ -78,6 +98,15 @@ class WaterLPParameter(Parameter):
         if node and 'level' in node.component_attrs or self.attr_name == 'Storage Value':
             self.elevation_param = '{}/Elevation'.format(self.res_name) + self.month_suffix
 
+        # tables are normally prepared by the model loader, but models loaded elsewhere are prepared here
+        if getattr(self.model, 'table_arrays', None) is None:
+            prepare_tables(self.model)
+
+    def reset(self):
+        super().reset()
+        self._values_cache = None
+        self._values_datetime = None
+
     def before(self):
         super(WaterLPParameter, self).before()
         self.datetime = self.model.timestepper.current.datetime
@@ -97,9 +126,125 @@ class WaterLPParameter(Parameter):
         if self.datetime.day == 1:
             self.days_in_month = monthrange(self.datetime.year, self.datetime.month)[1]
 
+    def get_state(self):
+        """
+        Get the state of the parameter, i.e., copies of its state attributes.
+        :return: a dict of attribute values
+        """
+        return {attr: deepcopy(getattr(self, attr)) for attr in self.state_attributes if hasattr(self, attr)}
+
+    def set_state(self, state):
+        """
+        Set the state of the parameter, as returned by get_state (e.g., when resuming a run from a checkpoint).
+        This should be called after the model is reset.
+        :param state: a dict of attribute values
+        :return:
+        """
+        for attr, value in state.items():
+            setattr(self, attr, deepcopy(value))
+        self._values_cache = None
+        self._values_datetime = None
+
+    def value(self, timestep, scenario_index):
+        return self.get_values(timestep)[scenario_index.global_id]
+
+    def values(self, timestep):
+        """
+        Calculate the parameter value for all scenario combinations at once.
+        Subclasses that set `vectorized = True` implement this instead of `value`; the per-scenario calls made by Pywr
+        are then served from a cache that is filled once per time step.
+        :param timestep:
+        :return: an array of values, indexed by scenario global id
+        """
+        raise NotImplementedError
+
+    def get_values(self, timestep):
+        if self._values_cache is None or self._values_datetime != timestep.datetime:
+            self._values_cache = self.values(timestep)
+            self._values_datetime = timestep.datetime
+        return self._values_cache
+
     def get(self, param, timestep, scenario_index):
         return self.model.parameters[param].value(timestep, scenario_index)
 
+    def get_all(self, param, timestep):
+        """
+        Get the values of a parameter for all scenario combinations.
+        :param param: the parameter name
+        :param timestep:
+        :return: an array of values, indexed by scenario global id
+        """
+        parameter = self.model.parameters[param]
+        if getattr(parameter, 'vectorized', False):
+            return parameter.get_values(timestep)
+        return np.array([parameter.value(timestep, s) for s in self.model.scenarios.combinations], np.float64)
+
+    def table_value(self, name, column=None, timestep=None, year=None, month=None, day=None, scenario_index=None):
+        """
+        Look up a value in a model table using a precomputed integer date index, rather than date strings.
+        The date defaults to the parameter's current date (which includes any planning month offset) or, if given, the
+        time step's date. Any of year, month and day can be overridden (e.g., year with a price year).
+        :param name: the table name
+        :param column: the column name (None for a single-column table)
+        :param timestep:
+        :param year:
+        :param month:
+        :param day:
+        :param scenario_index: the scenario, for climate-dependent tables
+        :return: the table value
+        """
+        date = self.datetime if timestep is None else timestep
+        table_arrays = self.model.climate_table_arrays.get(name)
+        if table_arrays and scenario_index is not None:
+            table_array = table_arrays[self.climate_index(scenario_index)]
+        else:
+            table_array = self.model.table_arrays[name]
+        return table_array.value(
+            column,
+            year=date.year if year is None else year,
+            month=date.month if month is None else month,
+            day=date.day if day is None else day
+        )
+
+    def flow_window_sum(self, name, start, end, scenario_index=None):
+        """
+        Sum the daily flow input of a dataframe parameter or table (e.g., runoff) from the start date to the end date,
+        inclusive, using a precomputed cumulative sum rather than slicing the dataframe.
+        :param name: the parameter or table name
+        :param start: the start date
+        :param end: the end date
+        :param scenario_index: the scenario (None for all scenarios)
+        :return: the sum for the scenario, or an array of sums indexed by scenario global id
+        """
+        sums = get_flow_index(self.model, name).date_window_sum(start, end)
+        if scenario_index is None:
+            return sums
+        return sums[scenario_index.global_id]
+
+    def climate_index(self, scenario_index):
+        """
+        Get the index of a scenario's climate, if climates are run as a scenario.
+        :param scenario_index:
+        :return: the climate index, or 0 if climates are not run as a scenario
+        """
+        climate_scenario = getattr(self.model, 'climate_scenario', None)
+        if climate_scenario is None:
+            return 0
+        return scenario_index.indices[climate_scenario]
+
+    def climate_table(self, name, scenario_index=None):
+        """
+        Get a model table for a scenario's climate. This is the model table itself unless climates are run as a
+        scenario and the table depends on climate (see sierra.utilities.climates).
+        :param name: the table name
+        :param scenario_index:
+        :return: the table
+        """
+        tables = getattr(self.model, 'climate_tables', {}).get(name)
+        if tables is None or scenario_index is None:
+            return self.model.tables[name]
+        return tables[self.climate_index(scenario_index)]
+
     def get_days_in_month(self, year=None, month=None):
         if year is None:
             year = self.year
@@ -1,6 +1,6 @@
+import numpy as np
 from sierra.base_parameters import WaterLPParameter
 from scipy import interpolate
-from sierra.utilities.converter import convert
 
 
 class Exchequer_Dam_Flood_Release_Requirement(WaterLPParameter):
@@ -8,6 +8,8 @@ class Exchequer_Dam_Flood_Release_Requirement(WaterLPParameter):
     This policy calculates release from Exchequer Dam.
     """
 
+    vectorized = True
+
     esrd_spline = None
 
     zones = {
@@ -23,6 +25,8 @@ class Exchequer_Dam_Flood_Release_Requirement(WaterLPParameter):
 
     wyt = 'normal'
 
+    state_attributes = ['wyt']
+
     max_release_cms = 6500 / 35.315  # 6500 cfs
 
     def setup(self):
@@ -34,40 +38,46 @@ class Exchequer_Dam_Flood_Release_Requirement(WaterLPParameter):
         values = table.values[1:, 1:]
         self.esrd_spline = interpolate.RectBivariateSpline(rows, cols, values, kx=1, ky=1)
 
+        self.wyt = ['normal'] * self.num_scenarios
+
     def before(self):
         super().before()
         if (self.model.timestep.month, self.model.timestep.day) == (10, 1):
-            SJVI = self.model.tables["San Joaquin Valley Index"][self.model.timestep.year + 1]
-            if SJVI <= 2.5:
-                self.wyt = 'dry'
-            elif SJVI < 3.8:
-                self.wyt = 'normal'
-            else:
-                self.wyt = 'wet'
+            for scenario_index in self.model.scenarios.combinations:
+                SJVI = self.climate_table("San Joaquin Valley Index", scenario_index)[self.model.timestep.year + 1]
+                if SJVI <= 2.5:
+                    wyt = 'dry'
+                elif SJVI < 3.8:
+                    wyt = 'normal'
+                else:
+                    wyt = 'wet'
+                self.wyt[scenario_index.global_id] = wyt
 
-    def _value(self, timestep, scenario_index):
+    def _values(self, timestep):
 
-        elevation = self.model.parameters["Lake McClure/Elevation"].value(timestep, scenario_index)
+        elevation = self.get_all("Lake McClure/Elevation", timestep)
 
         # FLOOD RELEASE
 
-        date_str = '1900-{:02}-{:02}'.format(timestep.month, timestep.day)
-        target_mcm = self.model.tables["Lake McClure/Guide Curve"].at[date_str, self.wyt] * 1233.5 / 1e6
-        curr_inflow = self.model.parameters["Full Natural Flow"].value(timestep, scenario_index)
-        lake_mcclure_volume = self.model.nodes["Lake McClure"].volume[scenario_index.global_id]
+        target_af = np.array([
+            self.table_value("Lake McClure/Guide Curve", wyt, timestep, year=1900) for wyt in self.wyt
+        ])
+        target_mcm = target_af * 1233.5 / 1e6
+        curr_inflow = self.get_all("Full Natural Flow", timestep)
+        lake_mcclure_volume = np.array(self.model.nodes["Lake McClure"].volume)
         flood_release_mcm = lake_mcclure_volume + curr_inflow - target_mcm
-        flood_release_cms = max(flood_release_mcm, 0.0) / 0.0864
+        flood_release_cms = np.maximum(flood_release_mcm, 0.0) / 0.0864
 
         # ESRD
 
-        esrd_release_cms = 0.0
+        esrd_release_cms = np.zeros(self.num_scenarios)
 
-        if elevation >= 255.83388:
-            curr_inflow_mcm = self.model.parameters["Full Natural Flow"].value(timestep, scenario_index)  # mcm/day
-            curr_inflow_cms = curr_inflow_mcm / 0.0864  # Convert mcm/day to cms
-            esrd_release_cms = self.esrd_spline(elevation, curr_inflow_cms)
+        esrd = elevation >= 255.83388
+        if esrd.any():
+            curr_inflow_cms = curr_inflow[esrd] / 0.0864  # Convert mcm/day to cms
+            esrd_release_cms[esrd] = self.esrd_spline(elevation[esrd], curr_inflow_cms, grid=False)
 
-        is_conservation_zone = False
+        is_conservation_zone = np.zeros(self.num_scenarios, bool)
         month_day = (timestep.month, timestep.day)
         # Floor function for the entries in the dict. Looks for the first value that is greater than our given date
         # Which means the dict value we are looking for is the one before.
@@ -76,20 +86,22 @@ class Exchequer_Dam_Flood_Release_Requirement(WaterLPParameter):
                 is_conservation_zone = elevation > zone_value
                 break
 
-        release_cms = 0.0
-        if is_conservation_zone and elevation <= 264.9779:  # Between conservation zone and 869.35 ft
-            release_cms = min(esrd_release_cms, self.max_release_cms)  # Min of ESRD release or 6500 cfs
-        elif 264.9779 < elevation < 269.4432:  # Between 869.35 ft and 884 ft
-            release_cms = esrd_release_cms  # ESRD release in cms
+        release_cms = np.zeros(self.num_scenarios)
+        # Between conservation zone and 869.35 ft: min of ESRD release or 6500 cfs
+        conservation = is_conservation_zone & (elevation <= 264.9779)
+        release_cms[conservation] = np.minimum(esrd_release_cms[conservation], self.max_release_cms)
+        # Between 869.35 ft and 884 ft: ESRD release in cms
+        surcharge = ~conservation & (264.9779 < elevation) & (elevation < 269.4432)
+        release_cms[surcharge] = esrd_release_cms[surcharge]
 
-        flood_release_cms = min(flood_release_cms, self.max_release_cms)
-        release_cms = max(release_cms, flood_release_cms)
+        flood_release_cms = np.minimum(flood_release_cms, self.max_release_cms)
+        release_cms = np.maximum(release_cms, flood_release_cms)
 
         return release_cms
 
-    def value(self, timestep, scenario_index):
-        val = self._value(timestep, scenario_index)
-        return convert(val, "m^3 s^-1", "m^3 day^-1", scale_in=1, scale_out=1000000.0)
+    def values(self, timestep):
+        vals = self._values(timestep)
+        return self.cms_to_mcm.array(vals)
 
     @classmethod
     def load(cls, model, data):
@@ -1,7 +1,6 @@
 from datetime import date
 import numpy as np
 from sierra.base_parameters import MinFlowParameter
-from sierra.utilities.converter import convert
 
 
 class IFR_at_Shaffer_Bridge_Min_Flow(MinFlowParameter):
@@ -15,6 +14,8 @@ class IFR_at_Shaffer_Bridge_Min_Flow(MinFlowParameter):
     nov_dec_mean = 0
     ifr_names = None
 
+    state_attributes = MinFlowParameter.state_attributes + ['nov_dec_mean', 'cowell_day_cnt']
+
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
 
@@ -31,7 +32,7 @@ class IFR_at_Shaffer_Bridge_Min_Flow(MinFlowParameter):
             return ifr_mcm / 0.0864  # convert to cms
 
         # FERC REQUIREMENT
-        WYT = self.model.tables['WYT for IFR Below Exchequer'][self.operational_water_year]
+        WYT = self.climate_table('WYT for IFR Below Exchequer', scenario_index)[self.operational_water_year]
         ferc_flow_req = self.ferc_req(timestep, scenario_index, WYT)
 
         # DAVIS-GRUNSKY AGREEMENT REQUIREMENT
@@ -55,7 +56,7 @@ class IFR_at_Shaffer_Bridge_Min_Flow(MinFlowParameter):
 
     def value(self, timestep, scenario_index):
         val = self.requirement(timestep, scenario_index, default=self._value)
-        return convert(val, "m^3 s^-1", "m^3 day^-1", scale_in=1, scale_out=1000000.0)
+        return self.cms_to_mcm(val)
 
     def ferc_req(self, timestep, scenario_index, wyt):
         #sid = scenario_index.global_id
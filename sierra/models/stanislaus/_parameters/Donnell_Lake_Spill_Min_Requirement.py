@@ -1,16 +1,21 @@
 from sierra.base_parameters import MinFlowParameter
 
-from sierra.utilities.converter import convert
-
 
 class Donnell_Lake_Spill_Min_Requirement(MinFlowParameter):
     """"""
 
+    state_attributes = MinFlowParameter.state_attributes + ['peak_dt']
+
+    def setup(self):
+        super().setup()
+        num_scenarios = len(self.model.scenarios.combinations)
+        self.peak_dt = [None] * num_scenarios
+
     def _value(self, timestep, scenario_index):
 
         # Default WYT is 3, for instances where we don't have pre-calculated WYT for the first operational water year
         # This is needed particularly for sequences.
-        WYT = self.model.tables["WYT P2005 & P2130"].get(self.operational_water_year, 3)
+        WYT = self.climate_table("WYT P2005 & P2130", scenario_index).get(self.operational_water_year, 3)
 
         # Critically Dry: 1,Dry: 2,Normal-Dry: 3,Normal-Wet: 4,Wet: 5
         # Calculate regular IFR
@@ -20,9 +25,10 @@ class Donnell_Lake_Spill_Min_Requirement(MinFlowParameter):
         if self.mode == 'scheduling':
 
             if self.datetime.month == 10 and self.datetime.day == 1:
-                self.peak_dt = self.model.tables["Peak Donnells Runoff"][timestep.year + 1]
+                peak_donnells_runoff = self.climate_table("Peak Donnells Runoff", scenario_index)
+                self.peak_dt[scenario_index.global_id] = peak_donnells_runoff[timestep.year + 1]
 
-            diff_day = (timestep.datetime - self.peak_dt).days
+            diff_day = (timestep.datetime - self.peak_dt[scenario_index.global_id]).days
             if 0 <= diff_day < 91:
                 data_supp = self.model.tables["Supplemental IFR below Donnell Lake"]
                 start_idx = diff_day - diff_day % 7
@@ -46,8 +52,7 @@ class Donnell_Lake_Spill_Min_Requirement(MinFlowParameter):
 
     def value(self, timestep, scenario_index):
         try:
-            return convert(self._value(timestep, scenario_index), "m^3 s^-1", "m^3 day^-1", scale_in=1,
-                           scale_out=1000000.0)
+            return self.cms_to_mcm(self._value(timestep, scenario_index))
         except Exception as err:
             print('\nERROR for parameter "{}" in {} model'.format(self.name, self.model.mode))
             print('File where error occurred: {}'.format(__file__))
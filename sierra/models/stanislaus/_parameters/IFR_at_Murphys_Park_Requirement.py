@@ -1,8 +1,6 @@
 import numpy as np
 from sierra.base_parameters import MinFlowParameter
 
-from sierra.utilities.converter import convert
-
 
 class IFR_at_Murphys_Park_Requirement(MinFlowParameter):
     """"""
@@ -12,6 +10,8 @@ class IFR_at_Murphys_Park_Requirement(MinFlowParameter):
     apr = [12, 16, 22, 26, 30]
     year_type = None
 
+    state_attributes = MinFlowParameter.state_attributes + ['year_type']
+
     def setup(self):
         super().setup()
         num_scenarios = len(self.model.scenarios.combinations)
@@ -28,7 +28,7 @@ class IFR_at_Murphys_Park_Requirement(MinFlowParameter):
             operational_water_year = self.datetime.year - 1
 
         # default to 3 for first year of sequences
-        self.year_type[sid] = self.model.tables["WYT P2019"].get(operational_water_year, 3)
+        self.year_type[sid] = self.climate_table("WYT P2019", scenario_index).get(operational_water_year, 3)
 
         # Calculate water year type based on Apr-Jul inflow forecast
         if month == 5 and self.datetime.day == 1:
@@ -63,7 +63,7 @@ class IFR_at_Murphys_Park_Requirement(MinFlowParameter):
 
     def value(self, timestep, scenario_index):
         val = self.requirement(timestep, scenario_index, default=self._value)
-        return convert(val, "m^3 s^-1", "m^3 day^-1", scale_in=1, scale_out=1000000.0)
+        return self.cms_to_mcm(val)
 
     @classmethod
     def load(cls, model, data):
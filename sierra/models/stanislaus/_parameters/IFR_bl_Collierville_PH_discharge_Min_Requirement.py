@@ -1,7 +1,5 @@
 from sierra.base_parameters import MinFlowParameter
 
-from sierra.utilities.converter import convert
-
 
 class IFR_bl_Collierville_PH_discharge_Min_Requirement(MinFlowParameter):
     """"""
@@ -22,7 +20,7 @@ class IFR_bl_Collierville_PH_discharge_Min_Requirement(MinFlowParameter):
 
     def value(self, timestep, scenario_index):
         val = self.requirement(timestep, scenario_index, default=self._value)
-        return convert(val, "m^3 s^-1", "m^3 day^-1", scale_in=1, scale_out=1000000.0)
+        return self.cms_to_mcm(val)
 
     @classmethod
     def load(cls, model, data):
@@ -1,7 +1,5 @@
 from sierra.base_parameters import MinFlowParameter
 
-from sierra.utilities.converter import convert
-
 
 class IFR_bl_Lyons_Res_Requirement(MinFlowParameter):
     """"""
@@ -37,7 +35,7 @@ class IFR_bl_Lyons_Res_Requirement(MinFlowParameter):
 
     def value(self, timestep, scenario_index):
         try:
-            return convert(self._value(timestep, scenario_index), "m^3 s^-1", "m^3 day^-1", scale_in=1, scale_out=1000000.0)
+            return self.cms_to_mcm(self._value(timestep, scenario_index))
         except Exception as err:
             print('\nERROR for parameter {}'.format(self.name))
             print('File where error occurred: {}'.format(__file__))
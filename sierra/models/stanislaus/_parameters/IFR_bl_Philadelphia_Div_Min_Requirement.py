@@ -1,7 +1,5 @@
 from sierra.base_parameters import MinFlowParameter
 
-from sierra.utilities.converter import convert
-
 
 class IFR_bl_Philadelphia_Div_Min_Requirement(MinFlowParameter):
     """"""
@@ -11,7 +9,7 @@ class IFR_bl_Philadelphia_Div_Min_Requirement(MinFlowParameter):
         year = self.datetime.year
         month = self.datetime.month
 
-        WYT = self.model.tables["WYT P2005 & P2130"].get(self.operational_water_year, 3)
+        WYT = self.climate_table("WYT P2005 & P2130", scenario_index).get(self.operational_water_year, 3)
         schedule = self.model.tables["IFR Below Philadelphia Div Schedule"]
 
         if self.model.mode == 'scheduling':
@@ -33,7 +31,7 @@ class IFR_bl_Philadelphia_Div_Min_Requirement(MinFlowParameter):
 
     def value(self, timestep, scenario_index):
         val = self.requirement(timestep, scenario_index, default=self._value)
-        return convert(val, "m^3 s^-1", "m^3 day^-1", scale_in=1, scale_out=1000000.0)
+        return self.cms_to_mcm(val)
 
     @classmethod
     def load(cls, model, data):
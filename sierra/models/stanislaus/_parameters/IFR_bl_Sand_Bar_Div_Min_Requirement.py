@@ -1,10 +1,11 @@
 from sierra.base_parameters import MinFlowParameter
-from sierra.utilities.converter import convert
 
 
 class IFR_bl_Sand_Bar_Div_Min_Requirement(MinFlowParameter):
     """"""
 
+    state_attributes = MinFlowParameter.state_attributes + ['peak_dt']
+
     def setup(self):
         super().setup()
         num_scenarios = len(self.model.scenarios.combinations)
@@ -12,7 +13,7 @@ class IFR_bl_Sand_Bar_Div_Min_Requirement(MinFlowParameter):
 
     def _value(self, timestep, scenario_index):
 
-        WYT = self.model.tables["WYT P2005 & P2130"].get(self.operational_water_year, 3)
+        WYT = self.climate_table("WYT P2005 & P2130", scenario_index).get(self.operational_water_year, 3)
         schedule = self.model.tables["IFR Below Sand Bar Div Schedule"]
 
         month = self.datetime.month
@@ -33,7 +34,8 @@ class IFR_bl_Sand_Bar_Div_Min_Requirement(MinFlowParameter):
 
         if self.mode == 'scheduling':
             if self.datetime.month == 10 and self.datetime.day == 1:
-                self.peak_dt[scenario_index.global_id] = self.model.tables["Peak Donnells Runoff"][timestep.year + 1]
+                peak_donnells_runoff = self.climate_table("Peak Donnells Runoff", scenario_index)
+                self.peak_dt[scenario_index.global_id] = peak_donnells_runoff[timestep.year + 1]
             diff_day = (self.datetime - self.peak_dt[scenario_index.global_id]).days
             if 0 <= diff_day < 91:
                 data_supp = self.model.tables["Supplemental IFR below Sand Bar Div"]
@@ -58,7 +60,7 @@ class IFR_bl_Sand_Bar_Div_Min_Requirement(MinFlowParameter):
 
     def value(self, timestep, scenario_index):
         val = self.requirement(timestep, scenario_index, default=self._value)
-        return convert(val, "m^3 s^-1", "m^3 day^-1", scale_in=1, scale_out=1000000.0)
+        return self.cms_to_mcm(val)
 
     @classmethod
     def load(cls, model, data):
@@ -2,18 +2,25 @@ import numpy as np
 from datetime import datetime, timedelta
 from sierra.base_parameters import WaterLPParameter
 
-from sierra.utilities.converter import convert
-
 
 class New_Melones_Lake_Flood_Control_Requirement(WaterLPParameter):
     """"""
 
+    vectorized = True
+
+    # the previous day's storage is kept, rather than looked up in the storage recorder, so that it is part of the
+    # parameter's state
+    prev_storage_mcm = None
+
+    state_attributes = ['should_drawdown', 'prev_storage_mcm']
+
     def setup(self):
         super().setup()
         num_scenarios = len(self.model.scenarios.combinations)
         self.should_drawdown = np.empty(num_scenarios, np.bool)
+        self.prev_storage_mcm = None
 
-    def _value(self, timestep, scenario_index):
+    def _values(self, timestep):
 
         # For the planning model, we don't care about reservoir volume, at least for now
         # In the future, we might, since ag. diversions could depend on storage.
@@ -22,7 +29,7 @@ class New_Melones_Lake_Flood_Control_Requirement(WaterLPParameter):
         # Instead, a piecewise reservoir approach will need to be applied.
         # TODO: revisit the above rationale for not including flood control in the planning model.
         if self.model.mode == 'planning':
-            return 0
+            return np.zeros(self.num_scenarios)
 
         # Flood control has 2 components, based on USACE manuals:
         # 1. Flood control space
@@ -37,59 +44,60 @@ class New_Melones_Lake_Flood_Control_Requirement(WaterLPParameter):
         start_tuple = (month, day)
 
         # Get expected ag. releases, so we can release more if needed
-        WYT = self.get('San Joaquin Valley WYT' + self.month_suffix, timestep, scenario_index)
-        SSJID_df = self.model.tables["South San Joaquin Irrigation District Demand"][WYT]
-        OID_df = self.model.tables["Oakdale Irrigation District Demand"][WYT]
+        WYTs = self.get_all('San Joaquin Valley WYT' + self.month_suffix, timestep)
+        ag_demand_mcm = np.empty(self.num_scenarios)
+        for WYT in np.unique(WYTs):
+            SSJID_mcm = self.table_value("South San Joaquin Irrigation District Demand", WYT)
+            OID_mcm = self.table_value("Oakdale Irrigation District Demand", WYT)
+            ag_demand_mcm[WYTs == WYT] = SSJID_mcm + OID_mcm
 
         # 1. Flood control space operations
 
         # Get target storage
-        month_day = '{}-{}'.format(month, day)
-        flood_curves = self.model.tables["New Melones Lake Flood Control"]
+        flood_curves = "New Melones Lake Flood Control"
 
         # Get previous storage
         NML = self.model.nodes["New Melones Lake"]
-        prev_storage_mcm = NML.volume[scenario_index.global_id]
+        prev_storage_mcm = np.array(NML.volume)
+        prev_prev_storage_mcm = self.prev_storage_mcm
+        self.prev_storage_mcm = prev_storage_mcm
 
         # Today's release volume, just based on flooding
         # This only looks back one day. Although it doesn't anticipate inflows, it does account for ag. diversions
         # inflow_mcm = self.model.tables["Full Natural Flow"][self.datetime]
         # release_mcm = prev_storage_mcm + inflow_mcm - ag_demand_mcm - max_storage_mcm
 
-        flood_control_curve_mcm = flood_curves.at[month_day, 'rainflood']
-        conditional_curve_mcm = flood_curves.at[month_day, 'conditional']
+        flood_control_curve_mcm = self.table_value(flood_curves, 'rainflood')
+        conditional_curve_mcm = self.table_value(flood_curves, 'conditional')
 
-        ag_demand_mcm = SSJID_df[start_tuple] + OID_df[start_tuple]
-        IFR_below_Goodwin_Dam_mcm = self.get("IFR bl Goodwin Reservoir/Requirement", timestep, scenario_index)
+        IFR_below_Goodwin_Dam_mcm = self.get_all("IFR bl Goodwin Reservoir/Requirement", timestep)
         # release_mcm = IFR_below_Goodwin_Dam_mcm + ag_demand_mcm
 
-        release_mcm = 0.0
+        release_mcm = np.zeros(self.num_scenarios)
 
-        if prev_storage_mcm >= flood_control_curve_mcm:
-            # 1. flood control operations we are in the flood control space
-            release_mcm = prev_storage_mcm - flood_control_curve_mcm
+        # 1. flood control operations we are in the flood control space
+        flood_space = prev_storage_mcm >= flood_control_curve_mcm
+        release_mcm[flood_space] = prev_storage_mcm[flood_space] - flood_control_curve_mcm
 
         # 2. Conditional space operations
-        elif prev_storage_mcm >= conditional_curve_mcm:
+        conditional_space = ~flood_space & (prev_storage_mcm >= conditional_curve_mcm)
+        if conditional_space.any():
 
             forecast_days = 7
             forecast_date = self.datetime + timedelta(days=forecast_days)
-            end_month_day = '{}-{}'.format(forecast_date.month, forecast_date.day)
 
             # forecasted target
-            forecasted_target_storage_mcm = flood_curves.at[end_month_day, 'rainflood']
+            forecasted_target_storage_mcm = self.table_value(flood_curves, 'rainflood', forecast_date)
 
             # Get expected FNF inflow
-            forecasted_inflow_mcm = self.model.parameters["Full Natural Flow"].dataframe[self.datetime:forecast_date].sum()
+            forecasted_inflow_mcm = self.flow_window_sum("Full Natural Flow", self.datetime, forecast_date)
 
             # Forecasted release volume
-            release_mcm \
-                = prev_storage_mcm \
-                  + forecasted_inflow_mcm \
-                  - forecasted_target_storage_mcm
-
             # divide by forecast days to get the release today (will spread this out over time)
-            release_mcm /= forecast_days
+            release_mcm[conditional_space] \
+                = (prev_storage_mcm[conditional_space]
+                   + forecasted_inflow_mcm[conditional_space]
+                   - forecasted_target_storage_mcm) / forecast_days
 
             # Forecasted ag demand
             # end_tuple = (forecast_date.month, forecast_date.day)
@@ -101,23 +109,22 @@ class New_Melones_Lake_Flood_Control_Requirement(WaterLPParameter):
             # ag_demand_mcm /= forecast_days
 
         # This is our overall target release, without accounting for max downstream releases
-        release_mcm = float(max(release_mcm, 0))
+        release_mcm = np.maximum(release_mcm, 0)
 
         # Release a bit more to fill Lake Tulloch during the refill period
-        refill_release_mcm = 0.0
+        refill_release_mcm = np.zeros(self.num_scenarios)
         if (3, 21) <= start_tuple <= (5, 30):  # refill period
             # Subtract 1 TAF as buffer based on observation
-            TUL_fc = self.model.tables["Lake Tulloch Flood Control"].at[month_day] - 1 * 1.2335
-            TUL_prev_mcm = self.model.nodes["Lake Tulloch"].volume[scenario_index.global_id]
-            if TUL_prev_mcm < TUL_fc:
-                refill_release_mcm += TUL_fc - TUL_prev_mcm
+            TUL_fc = self.table_value("Lake Tulloch Flood Control") - 1 * 1.2335
+            TUL_prev_mcm = np.array(self.model.nodes["Lake Tulloch"].volume)
+            refill_release_mcm += np.maximum(TUL_fc - TUL_prev_mcm, 0.0)
 
         # ...however, this should be reduced as needed to limit flow Orange Blossom Bridge to <= 8000 cfs
         # 8000 cfs =
         orange_blossom_bridge_max_mcm = 8000 / 35.31 * 0.0864
         non_flood_demand = ag_demand_mcm + IFR_below_Goodwin_Dam_mcm + refill_release_mcm
         max_release_mcm = ag_demand_mcm + refill_release_mcm + orange_blossom_bridge_max_mcm
-        release_mcm = min(max(release_mcm, non_flood_demand), max_release_mcm)
+        release_mcm = np.minimum(np.maximum(release_mcm, non_flood_demand), max_release_mcm)
 
         # Let's also release extra if the reservoir filled and release slowly to a target storage of 1970 TAF (2430 MCM)
         # by Oct 31. This is based on observation, though need to confirm
@@ -125,48 +132,45 @@ class New_Melones_Lake_Flood_Control_Requirement(WaterLPParameter):
         nov1_target = 2430
 
         drawdown_period = (7, 1) <= start_tuple <= (10, 31)
-        sid = scenario_index.global_id
         if timestep.index == 0:
-            self.should_drawdown[sid] = True
+            self.should_drawdown[:] = True
         elif not drawdown_period:
-            self.should_drawdown[sid] = False
+            self.should_drawdown[:] = False
 
         # Stop this if we've hit the target
-        if prev_storage_mcm < nov1_target:
-            self.should_drawdown[sid] = False
+        self.should_drawdown[prev_storage_mcm < nov1_target] = False
 
         # Check if New Melones filled
-        if drawdown_period and prev_storage_mcm > nov1_target and not self.should_drawdown[sid]:
-            day_before_yesterday = self.datetime + timedelta(days=-2)
-            prev_prev_storage_mcm = self.model.recorders["New Melones Lake/storage"].to_dataframe()\
-                                        .loc[day_before_yesterday].values[sid]
-            if prev_storage_mcm - prev_prev_storage_mcm <= 0:
-                self.should_drawdown[sid] = True
-
-        if drawdown_period and self.should_drawdown[sid]:
+        check_filled = drawdown_period & (prev_storage_mcm > nov1_target) & ~self.should_drawdown
+        if check_filled.any() and prev_prev_storage_mcm is not None:
+            self.should_drawdown[check_filled & (prev_storage_mcm - prev_prev_storage_mcm <= 0)] = True
+
+        if drawdown_period and self.should_drawdown.any():
+            drawdown = self.should_drawdown
             drawdown_release_mcm = (prev_storage_mcm - nov1_target) \
                                    / (datetime(timestep.year, 11, 1) - timestep.datetime).days
-            prev_inflow_mcm = self.model.nodes["STN_01 Inflow"].prev_flow[scenario_index.global_id]
+            prev_inflow_mcm = np.array(self.model.nodes["STN_01 Inflow"].prev_flow)
 
             drawdown_release_mcm += prev_inflow_mcm
 
-            release_mcm = max(release_mcm, drawdown_release_mcm)
+            drawdown_release_mcm = np.maximum(release_mcm, drawdown_release_mcm)
 
             # Let's also limit ramping (for both instream flow and reservoir management reasons)
-            prev_release_mcm = self.model.nodes["New Melones Lake Flood Control"].prev_flow[scenario_index.global_id]
-            if release_mcm > prev_release_mcm:
-                release_mcm = min(release_mcm, prev_release_mcm * 1.1)
-            elif release_mcm < prev_release_mcm:
-                release_mcm = max(release_mcm, prev_release_mcm * 0.9)
+            prev_release_mcm = np.array(self.model.nodes["New Melones Lake Flood Control"].prev_flow)
+            drawdown_release_mcm = np.where(
+                drawdown_release_mcm > prev_release_mcm,
+                np.minimum(drawdown_release_mcm, prev_release_mcm * 1.1),
+                np.maximum(drawdown_release_mcm, prev_release_mcm * 0.9)
+            )
+            release_mcm[drawdown] = drawdown_release_mcm[drawdown]
 
         release_cms = release_mcm / 0.0864
 
         return release_cms
 
-    def value(self, *args, **kwargs):
-        val = self._value(*args, **kwargs)
-        return convert(val, "m^3 s^-1", "m^3 day^-1", scale_in=1, scale_out=1000000.0)
-
+    def values(self, timestep):
+        vals = self._values(timestep)
+        return self.cms_to_mcm.array(vals)
 
     @classmethod
     def load(cls, model, data):
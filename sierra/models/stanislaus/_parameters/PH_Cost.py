@@ -1,27 +1,22 @@
 from sierra.base_parameters import WaterLPParameter
-from calendar import isleap
+import numpy as np
 
 
 class PH_Cost(WaterLPParameter):
     """"""
 
+    vectorized = True
+
     # path = "s3_imports/energy_netDemand.csv"
 
     # baseline_median_daily_energy_demand = 768  # 768 GWh is median daily energy demand for 2009
 
-    def _value(self, timestep, scenario_index):
+    def _values(self, timestep):
 
         # per-mcm value is a function of:
         # 1. electricity price
         # 2. generating potential, a function of generating efficiency, head, etc.
 
-        price_year = int(self.model.parameters['Price Year'].value(timestep, scenario_index))
-
-        if isleap(self.datetime.year) and self.datetime.month == 2 and self.datetime.day == 29:
-            price_date = self.datetime.strftime('{}-02-28'.format(price_year))
-        else:
-            price_date = self.datetime.strftime('{}-%m-%d'.format(price_year))
-
         # price_per_kWh = self.model.tables["Energy Price Values"] \
         #     .at[price_date, str(self.block)]
         # head = self.model.nodes[self.res_name + self.month_suffix].head
@@ -32,19 +27,30 @@ class PH_Cost(WaterLPParameter):
         # pywr_cost = - (abs(price_per_mcm) / 100 + 100) * price_per_mcm / abs(price_per_mcm)
 
         if self.model.mode == 'planning':
-            price_per_kWh = self.model.tables["Energy Price Values"] \
-                .at[price_date, str(self.block)]
-            head = self.model.nodes[self.res_name + self.month_suffix].head
-            eta = 0.9  # generation efficiency
-            gamma = 9807  # specific weight of water = rho*g
-            price_per_mcm = price_per_kWh * gamma * head * eta * 24 / 1e6
-
-            # We can add some conversion function here to go from price to Pywr cost
-            # For now, divide by 100, which results in costs of about -5 to -170
-            # E-flow costs can be set to less than this, or say -1000
-            pywr_cost = - (abs(price_per_mcm) / 100 + 100) * price_per_mcm / abs(price_per_mcm)
-            # if pywr_cost > 0 and self.res_name == 'Collierville PH':
-            #     pywr_cost *= 1000
+
+            # the cost only varies by price year, so calculate it once for each price year
+            price_years = self.get_all('Price Year', timestep).astype(int)
+            pywr_costs = np.empty(self.num_scenarios, np.float64)
+            day = 28 if (self.datetime.month, self.datetime.day) == (2, 29) else self.datetime.day
+            for price_year in np.unique(price_years):
+
+                price_per_kWh = self.table_value("Energy Price Values", str(self.block), year=price_year, day=day)
+                head = self.model.nodes[self.res_name + self.month_suffix].head
+                eta = 0.9  # generation efficiency
+                gamma = 9807  # specific weight of water = rho*g
+                price_per_mcm = price_per_kWh * gamma * head * eta * 24 / 1e6
+
+                # We can add some conversion function here to go from price to Pywr cost
+                # For now, divide by 100, which results in costs of about -5 to -170
+                # E-flow costs can be set to less than this, or say -1000
+                pywr_cost = - (abs(price_per_mcm) / 100 + 100) * price_per_mcm / abs(price_per_mcm)
+                # if pywr_cost > 0 and self.res_name == 'Collierville PH':
+                #     pywr_cost *= 1000
+
+                pywr_costs[price_years == price_year] = pywr_cost
+
+            return pywr_costs
+
         else:
             if 'Murphys' in self.name:
                 pywr_cost = -500
@@ -59,15 +65,16 @@ class PH_Cost(WaterLPParameter):
         # if self.res_name == 'Collierville PH' and self.block == 1 and pywr_cost < 0:
         #     pywr_cost = -600
 
-        return pywr_cost
+        return np.full(self.num_scenarios, pywr_cost, np.float64)
 
-    def value(self, timestep, scenario_index):
+    def values(self, timestep):
         try:
-            return self._value(timestep, scenario_index)
+            return self._values(timestep)
         except Exception as err:
             print('\nERROR for parameter {}'.format(self.name))
             print('File where error occurred: {}'.format(__file__))
             print(err)
+            raise
 
     @classmethod
     def load(cls, model, data):
@@ -75,4 +82,3 @@ class PH_Cost(WaterLPParameter):
 
 
 PH_Cost.register()
-
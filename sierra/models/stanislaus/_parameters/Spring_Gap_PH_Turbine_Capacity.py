@@ -1,7 +1,5 @@
 from sierra.base_parameters import WaterLPParameter
 
-from sierra.utilities.converter import convert
-
 
 class Spring_Gap_PH_Turbine_Capacity(WaterLPParameter):
 
@@ -34,8 +32,7 @@ class Spring_Gap_PH_Turbine_Capacity(WaterLPParameter):
 
     def value(self, timestep, scenario_index):
         try:
-            return convert(self._value(timestep, scenario_index), "m^3 s^-1", "m^3 day^-1", scale_in=1,
-                           scale_out=1000000.0)
+            return self.cms_to_mcm(self._value(timestep, scenario_index))
         except Exception as err:
             print('\nERROR for parameter {}'.format(self.name))
             print('File where error occurred: {}'.format(__file__))
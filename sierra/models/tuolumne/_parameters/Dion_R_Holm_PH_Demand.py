@@ -3,8 +3,6 @@ import numpy as np
 import datetime as dt
 from sierra.base_parameters import WaterLPParameter
 
-from sierra.utilities.converter import convert
-
 
 class Dion_R_Holm_PH_Demand(WaterLPParameter):
     """"""
@@ -38,8 +36,8 @@ class Dion_R_Holm_PH_Demand(WaterLPParameter):
         end = start + dt.timedelta(days=days)
         forecast_dates = pd.date_range(start, end)
 
-        EL_forecasted_inflow_mcm = self.model.parameters["Lake Eleanor Inflow/Runoff"].dataframe[forecast_dates].sum()
-        CH_forecasted_inflow_mcm = self.model.parameters["Cherry Lake Inflow/Runoff"].dataframe[forecast_dates].sum()
+        EL_forecasted_inflow_mcm = self.flow_window_sum("Lake Eleanor Inflow/Runoff", start, end, scenario_index)
+        CH_forecasted_inflow_mcm = self.flow_window_sum("Cherry Lake Inflow/Runoff", start, end, scenario_index)
 
         # forecasted_inflow_mcm = EL_forecasted_inflow_mcm + CH_forecasted_inflow_mcm
         forecasted_inflow_mcm = CH_forecasted_inflow_mcm
@@ -73,8 +71,7 @@ class Dion_R_Holm_PH_Demand(WaterLPParameter):
 
     def value(self, timestep, scenario_index):
         try:
-            return convert(self._value(timestep, scenario_index), "m^3 s^-1", "m^3 day^-1", scale_in=1,
-                           scale_out=1000000.0)
+            return self.cms_to_mcm(self._value(timestep, scenario_index))
         except Exception as err:
             print('ERROR for parameter {}'.format(self.name))
             print('File where error occurred: {}'.format(__file__))
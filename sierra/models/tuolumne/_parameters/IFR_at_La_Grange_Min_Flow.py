@@ -1,8 +1,6 @@
 import numpy as np
 from sierra.base_parameters import MinFlowParameter
 
-from sierra.utilities.converter import convert
-
 
 class IFR_at_La_Grange_Min_Flow(MinFlowParameter):
     """"""
@@ -58,7 +56,7 @@ class IFR_at_La_Grange_Min_Flow(MinFlowParameter):
 
     def value(self, timestep, scenario_index):
         val = self.requirement(timestep, scenario_index, default=self._value)
-        return convert(val, "m^3 s^-1", "m^3 day^-1", scale_in=1, scale_out=1000000.0)
+        return self.cms_to_mcm(val)
 
     @classmethod
     def load(cls, model, data):
@@ -4,12 +4,50 @@ import numpy as np
 from datetime import datetime
 
 
+def forecast_spill(storage, max_storage, net_inflow):
+    """
+    Calculate the total spill from a reservoir over a forecast period.
+
+    Each day, the spill is the storage above max_storage at the start of the day, and the storage at the start of the
+    next day is storage + net inflow - spill, or min(storage, max_storage) + net inflow. The capped storage is then a
+    cumulative sum of net inflows that is reset to max_storage whenever it reaches it, so it is calculated from the
+    cumulative sum and its running maximum rather than one day at a time.
+    :param storage: initial storage
+    :param max_storage: maximum storage
+    :param net_inflow: array of daily net inflows (inflow - releases)
+    :return: total spill
+    """
+    ndays = len(net_inflow)
+    if not ndays:
+        return 0.0
+
+    cum_inflow = np.cumsum(net_inflow)
+
+    # capped storage, min(storage, max_storage), at the start of each day
+    capped_storage = np.empty(ndays)
+    capped_storage[0] = min(storage, max_storage)
+    capped_storage[1:] = cum_inflow[:-1] + np.minimum(
+        capped_storage[0], max_storage - np.maximum.accumulate(cum_inflow[:-1]))
+
+    # storage at the start of each day, before spill
+    daily_storage = np.empty(ndays)
+    daily_storage[0] = storage
+    daily_storage[1:] = capped_storage[:-1] + net_inflow[:-1]
+
+    return float(np.maximum(daily_storage - max_storage, 0.0).sum())
+
+
 class IFR_bl_Hetch_Hetchy_Reservoir_UTREP_Spill(MinFlowParameter):
     MIN_STORAGE_THRESHOLD_MCM = 150 * 1.2335  # Storage threshold below which snowmelt flows will not initiate
     STORAGE_FORECAST_THRESHOLD_MCM = 360 * 1.2335  # Storage forecast above which snowmelt releases should be initiated
     EXCESS_SPILL_THRESHOLD_AF = 10000  # Excess spill value above which the template hydrograph should be changed
     LOW_SPILL_THRESHOLD_MCM = 30 * 1.2335
 
+    state_attributes = MinFlowParameter.state_attributes + [
+        'latest_start_date', 'fcst_spill_mcm', 'last_release_af', 'spill_days', 'excess_af', 'spill_threshold_af',
+        'base_template_hydrograph_cfs', 'adjusted_template_hydrograph_cfs'
+    ]
+
     # Though power tunnel max flow is dynamic, during UTREP releases it is assumed at capacity
     # If the actual capacity changes (not previously discussed as an option), then this can change as an input
 
@@ -23,6 +61,20 @@ class IFR_bl_Hetch_Hetchy_Reservoir_UTREP_Spill(MinFlowParameter):
 
         self.POWER_TUNNEL_MAX_MCM = self.model.nodes["Kirkwood PH"].turbine_capacity
 
+        # Inflow and IFR schedule arrays for spill forecasting
+        hh_inflow_df = self.model.nodes['Hetch Hetchy Reservoir Inflow'].max_flow.dataframe
+        self.hh_inflow_dates = pd.DatetimeIndex(hh_inflow_df.index)
+        self.hh_inflow_months = self.hh_inflow_dates.month.values
+        self.hh_inflow_mcm = np.asarray(hh_inflow_df.values, np.float64).reshape(len(hh_inflow_df), -1)
+
+        # base IFR by month (row) and lookup column, with a factor of safety based on practice
+        schedule_cfs = self.model.tables["IFR bl Hetch Hetchy Reservoir/IFR Schedule"]
+        self.base_ifr_mcm = (np.asarray(schedule_cfs.values, np.float64) + 5) / 35.31 * 0.0864  # convert to mcm
+
+        # spill forecasts of the current timestep, by scenario inputs
+        self.spill_forecasts = {}
+        self.spill_forecasts_datetime = None
+
         num_scenarios = len(self.model.scenarios.combinations)
         self.latest_start_date = [None] * num_scenarios
         self.fcst_spill_mcm = np.zeros(num_scenarios)
@@ -37,19 +89,28 @@ class IFR_bl_Hetch_Hetchy_Reservoir_UTREP_Spill(MinFlowParameter):
                              days=None):
         # Estimate uncontrolled spill assuming snowmelt releases do not occur.
 
-        hh_inflow_df = self.model.nodes['Hetch Hetchy Reservoir Inflow'].max_flow.dataframe
-
         # get end date if fcst_inflow is not supplied
         if fcst_inflow is None and days and end_date is None:
             end_date = timestep.datetime + pd.DateOffset(days=days)
 
-        total_spill = 0.0
-
-        # Create dates for spill estimation period
-        dates = pd.date_range(start=timestep.datetime, end=end_date, freq='D')
-        storage = current_storage
-        max_storage = self.model.nodes["Hetch Hetchy Reservoir"].max_volume
-        wyt = self.model.parameters["IFR bl Hetch Hetchy Reservoir/Water Year Type"].get_value(scenario_index)
+        wyt = int(self.model.parameters["IFR bl Hetch Hetchy Reservoir/Water Year Type"].get_value(scenario_index))
+        column = self.climate_index(scenario_index) if self.hh_inflow_mcm.shape[1] > 1 else 0
+
+        # forecasts are the same for scenarios with the same inflow, water year type and storage, and are only reused
+        # within a timestep
+        if timestep.datetime != self.spill_forecasts_datetime:
+            self.spill_forecasts = {}
+            self.spill_forecasts_datetime = timestep.datetime
+        key = (end_date, column, wyt, round(current_storage, 6))
+        total_spill = self.spill_forecasts.get(key)
+        if total_spill is not None:
+            return total_spill
+
+        # Spill estimation period
+        start_row = self.hh_inflow_dates.get_loc(timestep.datetime)
+        end_row = self.hh_inflow_dates.get_loc(pd.Timestamp(end_date))
+        inflow = self.hh_inflow_mcm[start_row:end_row + 1, column]
+        months = self.hh_inflow_months[start_row:end_row + 1]
 
         # Additional IFR (if power tunnel release >= 920 cfs)
         if wyt <= 2:
@@ -62,28 +123,17 @@ class IFR_bl_Hetch_Hetchy_Reservoir_UTREP_Spill(MinFlowParameter):
         # The spill routine already is slightly conservative, so zero can be assumed.
         evap = 0
 
-        # get schedule
-        schedule_cfs = self.model.tables["IFR bl Hetch Hetchy Reservoir/IFR Schedule"]
+        # get lookup column
+        lookup_col = min([3, 2, 1].index(wyt) * 2 + 1, 4)
+
+        ifr = self.base_ifr_mcm[months - 1, lookup_col] + add_ifr  # units in mcm at this point
+        net_inflow = inflow - self.POWER_TUNNEL_MAX_MCM - evap - ifr
 
         # Calculate total spill as summation of daily spill
+        max_storage = self.model.nodes["Hetch Hetchy Reservoir"].max_volume
+        total_spill = forecast_spill(current_storage, max_storage, net_inflow)
 
-        # get lookup column
-        lookup_col = min([3, 2, 1].index(int(wyt)) * 2 + 1, 4)
-
-        for date in dates:
-            # get lookup row
-            lookup_row = date.month - 1
-
-            # factor of safety based on practice
-            base_ifr_cfs = schedule_cfs.iat[lookup_row, lookup_col] + 5
-            base_ifr = base_ifr_cfs / 35.31 * 0.0864  # convert to mcm
-
-            inflow = hh_inflow_df[date]
-            ifr = base_ifr + add_ifr  # units in mcm at this point
-            storage_temp = storage + inflow - self.POWER_TUNNEL_MAX_MCM - evap - ifr
-            spill = max(storage - max_storage, 0.0)
-            storage = storage_temp - spill
-            total_spill += spill
+        self.spill_forecasts[key] = total_spill
 
         return total_spill
 
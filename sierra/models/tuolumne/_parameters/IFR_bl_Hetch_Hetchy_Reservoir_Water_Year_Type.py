@@ -7,6 +7,8 @@ class IFR_bl_Hetch_Hetchy_Reservoir_Water_Year_Type(MinFlowParameter):
 
     WYT = None
 
+    state_attributes = MinFlowParameter.state_attributes + ['WYT']
+
     def setup(self):
         super().setup()
         # allocate an array to hold the previous storage; will be overwritten each timestep
@@ -40,8 +42,8 @@ class IFR_bl_Hetch_Hetchy_Reservoir_Water_Year_Type(MinFlowParameter):
             oct_1 = '{:04}-10-01'.format(date.year - 1)
 
             if date.month <= 6:
-                precip = self.model.parameters["Hetch Hetchy Reservoir/Precipitation"].dataframe
-                total_precip = precip[oct_1:date].sum() / 25.4  # sum & convert mm to inches
+                precip = self.flow_window_sum("Hetch Hetchy Reservoir/Precipitation", oct_1, date, scenario_index)
+                total_precip = precip / 25.4  # convert mm to inches
                 if total_precip >= criteria[0]:
                     WYT = 3
                 elif total_precip >= criteria[1]:
@@ -51,8 +53,8 @@ class IFR_bl_Hetch_Hetchy_Reservoir_Water_Year_Type(MinFlowParameter):
 
             # July-Aug:
             else:
-                runoff = self.model.parameters["Hetch Hetchy Reservoir Inflow/Runoff"].dataframe
-                cumulative_runoff = runoff[oct_1:date].sum()
+                cumulative_runoff = self.flow_window_sum("Hetch Hetchy Reservoir Inflow/Runoff", oct_1, date,
+                                                         scenario_index)
                 cumulative_runoff *= 810.7 / 1000  # convert mcm to taf
                 if cumulative_runoff >= criteria[0]:
                     WYT = 3
@@ -1,7 +1,6 @@
 import numpy as np
 from sierra.base_parameters import WaterLPParameter
 from datetime import datetime
-from sierra.utilities.converter import convert
 
 
 class Kirkwood_PH_Demand(WaterLPParameter):
@@ -9,6 +8,8 @@ class Kirkwood_PH_Demand(WaterLPParameter):
 
     prev_release_cms = None
 
+    state_attributes = ['prev_release_cms']
+
     def setup(self):
         super().setup()
         num_scenarios = len(self.model.scenarios.combinations)
@@ -29,7 +30,7 @@ class Kirkwood_PH_Demand(WaterLPParameter):
             start = timestep.datetime
             end = datetime(timestep.year, end_month, end_day)
             forecast_days = (end - start).days + 1
-            forecast_HH_inflow = self.model.parameters["Hetch Hetchy Reservoir Inflow/Runoff"].dataframe[start:end].sum()
+            forecast_HH_inflow = self.flow_window_sum("Hetch Hetchy Reservoir Inflow/Runoff", start, end, scenario_index)
             HH = self.model.nodes["Hetch Hetchy Reservoir"]
             current_storage_mcm = HH.volume[scenario_index.global_id]
             HH_space = HH.max_volume - current_storage_mcm
@@ -50,8 +51,7 @@ class Kirkwood_PH_Demand(WaterLPParameter):
 
     def value(self, timestep, scenario_index):
         try:
-            return convert(self._value(timestep, scenario_index), "m^3 s^-1", "m^3 day^-1", scale_in=1,
-                           scale_out=1000000.0)
+            return self.cms_to_mcm(self._value(timestep, scenario_index))
         except Exception as err:
             print('ERROR for parameter {}'.format(self.name))
             print('File where error occurred: {}'.format(__file__))
@@ -1,21 +1,20 @@
 import pandas as pd
 from datetime import timedelta
 from sierra.base_parameters import WaterLPParameter
+from sierra.utilities.flow_index import FlowIndex, get_flow_index
 
 
 class Lake_Eleanor_Forecasted_Inflow(WaterLPParameter):
 
-    def _value(self, timestep, scenario_index):
+    ifr_index = None
 
-        # get forecasted spill (60 days out; assume perfect foresight)
-        start = timestep.datetime
-        end = start + timedelta(days=60)
-        forecast_dates = pd.date_range(start, end)
-        forecasted_inflow_mcm = self.model.parameters["Lake Eleanor Inflow/Runoff"].dataframe[forecast_dates].sum()
+    def setup(self):
+        super().setup()
 
-        # get forecasted IFR
-        forecasted_ifr_mcm = 0
-        for date in forecast_dates:
+        # daily IFR over the inflow period, for forecasting
+        ifr_mcm = []
+        dates = get_flow_index(self.model, "Lake Eleanor Inflow/Runoff").index
+        for date in dates:
             md = (date.month, date.day)
             if (4, 1) <= md <= (5, 14) or (9, 16) <= md <= (10, 31):
                 ifr_cfs = 10
@@ -23,7 +22,18 @@ class Lake_Eleanor_Forecasted_Inflow(WaterLPParameter):
                 ifr_cfs = 20
             else:
                 ifr_cfs = 5
-            forecasted_ifr_mcm += ifr_cfs / 35.315 * 0.0864
+            ifr_mcm.append(ifr_cfs / 35.315 * 0.0864)
+        self.ifr_index = FlowIndex(pd.Series(ifr_mcm, index=dates))
+
+    def _value(self, timestep, scenario_index):
+
+        # get forecasted spill (60 days out; assume perfect foresight)
+        start = timestep.datetime
+        end = start + timedelta(days=60)
+        forecasted_inflow_mcm = self.flow_window_sum("Lake Eleanor Inflow/Runoff", start, end, scenario_index)
+
+        # get forecasted IFR
+        forecasted_ifr_mcm = self.ifr_index.date_window_sum(start, end)[0]
 
         forecasted_inflow_mcm -= forecasted_ifr_mcm
 
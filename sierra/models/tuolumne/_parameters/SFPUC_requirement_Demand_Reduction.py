@@ -5,6 +5,8 @@ import numpy as np
 class SFPUC_requirement_Demand_Reduction(WaterLPParameter):
     """"""
 
+    state_attributes = ['demand_reduction']
+
     def setup(self):
         super().setup()
         num_scenarios = len(self.model.scenarios.combinations)
@@ -5,6 +5,8 @@ from sierra.base_parameters import WaterLPParameter
 class Water_Bank(WaterLPParameter):
     initial_storage = None
 
+    state_attributes = ['initial_storage']
+
     def setup(self):
         super().setup()
         # allocate an array to hold the previous storage; will be overwritten each timestep
@@ -6,7 +6,7 @@ class Bass_Lake_Storage_Value(WaterLPParameter):
 
     def _value(self, timestep, scenario_index):
         kwargs = dict(timestep=timestep, scenario_index=scenario_index)
-        x = self.model.tables['San Joaquin Valley Index'][self.operational_water_year]
+        x = self.climate_table('San Joaquin Valley Index', scenario_index)[self.operational_water_year]
         y = -15.5
         if x <= 2:
             return y * 3.35
@@ -1,28 +1,38 @@
+import numpy as np
 from sierra.base_parameters import WaterLPParameter
 
-from sierra.utilities.converter import convert
-
 
 class Big_Creek_System_IFRs_2000(WaterLPParameter):
     """"""
 
-    def _value(self, timestep, scenario_index):
+    ifr_schedules = None
+
+    def setup(self):
+        super().setup()
 
-        month = self.datetime.month
+        # precompute the daily IFR schedule for this location, indexed by month and day, for each year type
+        self.ifr_schedules = {}
+        for year_type in ['dry', 'normal']:
+            ifr_row = self.model.tables['Big Creek System IFRs 2000 {}'.format(year_type)].loc[self.res_name]
+            schedule = np.full((13, 32), np.nan)
+            for month in range(1, 13):
+                for day in range(1, 32):
+                    col_name = month
+                    if self.mode == 'scheduling' and month in [11, 12, 4, 9]:
+                        col_name = '{}-{}'.format(month, min(day - day % 15 + 1, 16))
+                    schedule[month, day] = ifr_row.get(col_name, np.nan)
+            self.ifr_schedules[year_type] = schedule
 
-        Friant_Apr_Jul_runoff_af = self.model.tables['Seasonal Inflow at Friant'][self.operational_water_year]
+    def _value(self, timestep, scenario_index):
+
+        Friant_Apr_Jul_runoff_af = self.table_value('Seasonal Inflow at Friant', year=self.operational_water_year,
+                                                    scenario_index=scenario_index)
         if Friant_Apr_Jul_runoff_af <= 900000:
-            ifr_table = self.model.tables['Big Creek System IFRs 2000 dry']
+            ifr_schedule = self.ifr_schedules['dry']
         else:
-            ifr_table = self.model.tables['Big Creek System IFRs 2000 normal']
-
-        col_name = month
-        if self.model.mode == 'scheduling':
-            if month in [11, 12, 4, 9]:
-                day = self.datetime.day
-                col_name = '{}-{}'.format(month, min(day - day % 15 + 1, 16))
+            ifr_schedule = self.ifr_schedules['normal']
 
-        ifr_cfs = ifr_table.at[self.res_name, col_name]
+        ifr_cfs = ifr_schedule[self.datetime.month, self.datetime.day]
 
         if "No. Fk. Stevenson Creek above Shaver Lake" in self.res_name:
             ifr_cfs += 1
@@ -34,8 +44,7 @@ class Big_Creek_System_IFRs_2000(WaterLPParameter):
 
     def value(self, timestep, scenario_index):
         try:
-            return convert(self._value(timestep, scenario_index), "m^3 s^-1", "m^3 day^-1", scale_in=1,
-                           scale_out=1000000.0)
+            return self.cms_to_mcm(self._value(timestep, scenario_index))
         except Exception as err:
             print('ERROR for parameter {}'.format(self.name))
             print('File where error occurred: {}'.format(__file__))
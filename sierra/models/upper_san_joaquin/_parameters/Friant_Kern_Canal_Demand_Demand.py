@@ -1,6 +1,5 @@
 from sierra.base_parameters import WaterLPParameter
 
-from sierra.utilities.converter import convert
 
 class Friant_Kern_Canal_Demand_Demand(WaterLPParameter):
     """"""
@@ -25,7 +24,7 @@ class Friant_Kern_Canal_Demand_Demand(WaterLPParameter):
         
     def value(self, timestep, scenario_index):
         try:
-            return convert(self._value(timestep, scenario_index), "m^3 s^-1", "m^3 day^-1", scale_in=1, scale_out=1000000.0)
+            return self.cms_to_mcm(self._value(timestep, scenario_index))
         except Exception as err:
             print('ERROR for parameter {}'.format(self.name))
             print('File where error occurred: {}'.format(__file__))
@@ -1,7 +1,5 @@
 from sierra.base_parameters import MinFlowParameter
 
-from sierra.utilities.converter import convert
-
 
 class IFR_bl_Millerton_Lake_Min_Flow(MinFlowParameter):
     """"""
@@ -27,11 +25,11 @@ class IFR_bl_Millerton_Lake_Min_Flow(MinFlowParameter):
             date_index = sum([1 for md in ifr_schedule_cfs.index if month_day >= md]) - 1
 
         # get IFR from schedule
-        wyt = self.model.tables["SJ restoration flows"].at[restoration_year, 'WYT']
+        wyt = self.climate_table("SJ restoration flows", scenario_index).at[restoration_year, 'WYT']
         wyt_index = wyt - 1
         ifr_cfs = ifr_schedule_cfs.iat[date_index, wyt_index]
         if wyt in [3, 4, 5]:
-            allocation_adjustment = self.model.tables["SJ restoration flows"] \
+            allocation_adjustment = self.climate_table("SJ restoration flows", scenario_index) \
                 .at[restoration_year, 'Allocation adjustment']
             ifr_cfs *= allocation_adjustment
 
@@ -42,7 +40,7 @@ class IFR_bl_Millerton_Lake_Min_Flow(MinFlowParameter):
 
     def value(self, timestep, scenario_index):
         val = self.requirement(timestep, scenario_index, default=self._value)
-        return convert(val, "m^3 s^-1", "m^3 day^-1", scale_in=1, scale_out=1000000.0)
+        return self.cms_to_mcm(val)
 
     @classmethod
     def load(cls, model, data):
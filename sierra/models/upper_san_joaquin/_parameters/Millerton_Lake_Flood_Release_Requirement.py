@@ -1,66 +1,72 @@
 from sierra.base_parameters import WaterLPParameter
 from datetime import datetime, timedelta
 import numpy as np
-from sierra.utilities.converter import convert
 import math
 
 
 class Millerton_Lake_Flood_Release_Requirement(WaterLPParameter):
 
+    vectorized = True
+
     should_drawdown = None
 
+    # Millerton storage as of the previous time step, for checking if the reservoir filled
+    prev_storage_mcm = None
+
+    state_attributes = ['should_drawdown', 'prev_storage_mcm']
+
     def setup(self):
         super().setup()
         num_scenarios = len(self.model.scenarios.combinations)
         self.should_drawdown = np.empty(num_scenarios, np.bool)
+        self.prev_storage_mcm = None
 
-    def _value(self, timestep, scenario_index):
+    def _values(self, timestep):
 
         if self.model.mode == 'planning':
-            return 0
-
-        sid = scenario_index.global_id
+            return np.zeros(self.num_scenarios)
 
         # Note: the following logic follows the U.S. Army Corps of Engineers 1980 Water Control Manual for Friant Dam
 
         month = self.datetime.month
         day = self.datetime.day
-        month_day = '{}-{}'.format(month, day)
 
         # Get flood curve
-        flood_curves = self.model.tables["Millerton Lake flood curve"]
-        rainflood_curve_mcm = flood_curves.at[month_day, 'rainflood']
-        conditional_curve_mcm = flood_curves.at[month_day, 'conditional']
+        rainflood_curve_mcm = self.table_value("Millerton Lake flood curve", 'rainflood')
+        conditional_curve_mcm = self.table_value("Millerton Lake flood curve", 'conditional')
 
         # Get previous storage
         NML = self.model.nodes["Millerton Lake"]
-        millerton_storage_mcm = NML.volume[scenario_index.global_id]
+        millerton_storage_mcm = np.array(NML.volume)
+        prev_millerton_storage_mcm = self.prev_storage_mcm
+        self.prev_storage_mcm = millerton_storage_mcm
 
         # Load base ag demand info
-        WYT = self.get('San Joaquin Valley WYT' + self.month_suffix, timestep, scenario_index)
-        Madera_df = self.model.tables["CVP Madera Canal demand"][WYT]
-        Friant_Kern_df = self.model.tables["CVP Friant-Kern Canal demand"][WYT]
+        WYTs = self.get_all('San Joaquin Valley WYT' + self.month_suffix, timestep)
 
         # Set the default release of zero
-        release_mcm = 0.0
+        release_mcm = np.zeros(self.num_scenarios)
 
         # 1. Conservation space release
-        if millerton_storage_mcm < conditional_curve_mcm:
-            pass
+        # (no release when millerton_storage_mcm < conditional_curve_mcm)
 
         # 2. Rainflood space release
-        max_storage = NML.get_max_volume(scenario_index)
+        max_storage = np.array([NML.get_max_volume(s) for s in self.model.scenarios.combinations])
+        rainflood_curve_mcm = np.full(self.num_scenarios, rainflood_curve_mcm, np.float64)
         above_85_taf_mcm = max_storage - rainflood_curve_mcm - 104.85
-        if above_85_taf_mcm > 0.0 and (month >= 10 or month <= 3):  # 85 TAF
+        if month >= 10 or month <= 3:  # 85 TAF
             MPL = self.model.nodes["Mammoth Pool Reservoir"]
-            mammoth_pool_space_mcm = MPL.max_volume - MPL.volume[sid]
-            rainflood_curve_mcm += min(above_85_taf_mcm, mammoth_pool_space_mcm)
+            mammoth_pool_space_mcm = MPL.max_volume - np.array(MPL.volume)
+            above_85_taf = above_85_taf_mcm > 0.0
+            rainflood_curve_mcm[above_85_taf] += np.minimum(above_85_taf_mcm, mammoth_pool_space_mcm)[above_85_taf]
 
-        if millerton_storage_mcm >= rainflood_curve_mcm:
-            release_mcm = millerton_storage_mcm - rainflood_curve_mcm
+        rainflood = millerton_storage_mcm >= rainflood_curve_mcm
+        release_mcm[rainflood] = millerton_storage_mcm[rainflood] - rainflood_curve_mcm[rainflood]
 
         # 3. Conditional space release
-        elif 2 <= month <= 7:
+        if 2 <= month <= 7 and not rainflood.all():
+            conditional = ~rainflood
+
             # Note: Here, we are calculating forecasts directly as able, rather than using the USACE manual diagram.
 
             # 3.1. Calculate forecasted unimpaired runoff into Millerton Lake, through July 31.
@@ -68,7 +74,7 @@ class Millerton_Lake_Flood_Release_Requirement(WaterLPParameter):
             # TODO: update to use imperfect forecast?
             fnf_start = timestep.datetime
             fnf_end = datetime(timestep.year, 7, 31)
-            forecasted_inflow_mcm = self.model.parameters["Full Natural Flow"].dataframe[fnf_start:fnf_end].sum()
+            forecasted_inflow_mcm = self.flow_window_sum("Full Natural Flow", fnf_start, fnf_end)
 
             # 3.2. Calculate today's and forecasted irrigation demand.
             forecast_days = 14
@@ -88,7 +94,10 @@ class Millerton_Lake_Flood_Release_Requirement(WaterLPParameter):
             # option 2: use Madera canal capacity (i.e., assume we can release at capacity)
             madera_fcst_dem_mcm = self.model.nodes['CVP Madera Canal'].max_flow * forecast_days
 
-            friant_kern_fcst_dem_mcm = Friant_Kern_df[ag_start:ag_end].sum() / 35.315 * 0.0864
+            friant_kern_fcst_dem_mcm = np.empty(self.num_scenarios)
+            for WYT in np.unique(WYTs):
+                Friant_Kern_df = self.model.tables["CVP Friant-Kern Canal demand"][WYT]
+                friant_kern_fcst_dem_mcm[WYTs == WYT] = Friant_Kern_df[ag_start:ag_end].sum() / 35.315 * 0.0864
             forecasted_ag_demand_mcm = madera_fcst_dem_mcm + friant_kern_fcst_dem_mcm
 
             # 3.3. Calculate total space required for flood control
@@ -98,11 +107,10 @@ class Millerton_Lake_Flood_Release_Requirement(WaterLPParameter):
             # 3.4. Calculate upstream space, adjusted
 
             # 3.4.1. Get total previous storage in upstream reservoirs
-            upstream_storage_space_mcm = 0.0
+            upstream_storage_space_mcm = np.zeros(self.num_scenarios)
             for node in self.model.nodes:
-                # TODO: make this more efficient
                 if hasattr(node, 'volume') and node.name != 'Millerton Lake':
-                    upstream_storage_space_mcm += node.volume[scenario_index.global_id]
+                    upstream_storage_space_mcm += node.volume
 
             # 3.4.2. Calculate adjustment to storage space
             # Note: this is approximated from the upper right of the Flood Control Diagram (Fig. A-11)
@@ -124,44 +132,33 @@ class Millerton_Lake_Flood_Release_Requirement(WaterLPParameter):
 
             # 3.7. Finally, compute the supplemental release
             # Note that the goal is to spread the release out over time
-            storage_difference_mcm = max(conditional_space_required_mcm - total_space_available_mcm, 0.0)
-
-            # if storage_difference_mcm > 0.0:
-            #     print('{}: conditional; release: {} taf'.format(timestep.datetime, storage_difference_mcm / 1.2335))
-
-            # if (month, day) <= (5, 5):
-            #
-            #
-            # elif (month, day) <= (6, 5):
-            #
-            #
-            # elif (month, day) <= (6, 30):
-            #
-            #
-            # else:
+            storage_difference_mcm = np.maximum(conditional_space_required_mcm - total_space_available_mcm, 0.0)
 
             supplemental_release_mcm = storage_difference_mcm
 
             # 3.8. Calculate total release
             # Note that this differs from the example in the USACE manual, since we are only calculating instream
             # release here. In the manual, "total release" is instream release + ag. release
-            release_mcm = max(release_mcm, supplemental_release_mcm)
+            release_mcm[conditional] = np.maximum(release_mcm, supplemental_release_mcm)[conditional]
 
         # This is our overall target release, without accounting for max downstream releases
-        release_mcm = float(max(release_mcm, 0.0))
+        release_mcm = np.maximum(release_mcm, 0.0)
 
         # Assume Madera Canal can absorb some flood control capacity
         # Note that we cannot calculate Madera demand from the demand node/parameter, since that node depends on this.
-        if release_mcm > 0.0:
-            madera_canal_cfs = Madera_df[(month, day)]
+        releasing = release_mcm > 0.0
+        if releasing.any():
+            madera_canal_cfs = np.empty(self.num_scenarios)
+            for WYT in np.unique(WYTs):
+                madera_canal_cfs[WYTs == WYT] = self.table_value("CVP Madera Canal demand", WYT)
             madera_canal_mcm = madera_canal_cfs / 35.315 * 0.0864
             madera_canal_max_mcm = self.model.nodes["Madera Canal.1"].max_flow
             adjusted_release_mcm = release_mcm - (madera_canal_max_mcm - madera_canal_mcm)
-            release_mcm = max(adjusted_release_mcm, 0.0)
+            release_mcm[releasing] = np.maximum(adjusted_release_mcm, 0.0)[releasing]
 
         # ...reduce to limit flow to <= 8000 cfs (19.57 mcm)
         little_dry_creek_max_mcm = 19.57
-        release_mcm = min(release_mcm, little_dry_creek_max_mcm)
+        release_mcm = np.minimum(release_mcm, little_dry_creek_max_mcm)
 
         # DRAWDOWN OPERATIONS
 
@@ -171,41 +168,40 @@ class Millerton_Lake_Flood_Release_Requirement(WaterLPParameter):
             nov1_target = 431.725  # 350 TAF
 
             # Stop this if we've hit the target
-            if millerton_storage_mcm < nov1_target:
-                self.should_drawdown[sid] = False
+            self.should_drawdown[millerton_storage_mcm < nov1_target] = False
 
             # Check if New Melones filled
-            if millerton_storage_mcm > nov1_target and not self.should_drawdown[sid]:
-                day_before_yesterday = self.datetime + timedelta(days=-2)
-                millerton_storage_df = self.model.recorders["Millerton Lake/storage"].to_dataframe()
-                prev_millerton_storage_mcm = millerton_storage_df.loc[day_before_yesterday].values[sid]
-                if millerton_storage_mcm <= prev_millerton_storage_mcm:
-                    self.should_drawdown[sid] = True
-
-            if self.should_drawdown[sid]:
+            check_filled = (millerton_storage_mcm > nov1_target) & ~self.should_drawdown
+            if check_filled.any() and prev_millerton_storage_mcm is not None:
+                self.should_drawdown[check_filled & (millerton_storage_mcm <= prev_millerton_storage_mcm)] = True
+
+            if self.should_drawdown.any():
+                drawdown = self.should_drawdown
                 drawdown_release_mcm = millerton_storage_mcm - nov1_target
                 # drawdown_release_mcm = millerton_storage_mcm - nov1_target
-                prev_inflow_mcm = 0.0
+                prev_inflow_mcm = np.zeros(self.num_scenarios)
                 for node in ['Kerckhoff 1 PH', 'Kerckhoff 2 PH', 'IFR bl Kerckhoff Lake', 'Millerton Lake Inflow']:
-                    prev_inflow_mcm += self.model.nodes[node].prev_flow[sid]
+                    prev_inflow_mcm += self.model.nodes[node].prev_flow
 
                 drawdown_release_mcm += prev_inflow_mcm
 
                 drawdown_days = (datetime(timestep.year, 11, 1) - timestep.datetime).days
-                release_mcm = drawdown_release_mcm / drawdown_days
+                drawdown_release_mcm /= drawdown_days
                 # release_mcm = max(release_mcm, drawdown_release_mcm)
 
                 # Let's also limit ramping (for both instream flow and reservoir management reasons)
-                prev_release_mcm = self.model.nodes["Millerton Lake Flood Release"].prev_flow[scenario_index.global_id]
+                prev_release_mcm = np.array(self.model.nodes["Millerton Lake Flood Release"].prev_flow)
                 # if (month, day) == (7, 1):
                 #     release_mcm = min(release_mcm, 3)
-                if release_mcm > prev_release_mcm:
-                    release_mcm = min(release_mcm, prev_release_mcm * 1.2)
-                elif release_mcm < prev_release_mcm:
-                    release_mcm = max(release_mcm, prev_release_mcm * 0.8)
+                drawdown_release_mcm = np.where(
+                    drawdown_release_mcm > prev_release_mcm,
+                    np.minimum(drawdown_release_mcm, prev_release_mcm * 1.2),
+                    np.maximum(drawdown_release_mcm, prev_release_mcm * 0.8)
+                )
+                release_mcm[drawdown] = drawdown_release_mcm[drawdown]
 
         else:
-            self.should_drawdown[sid] = False
+            self.should_drawdown[:] = False
 
         # if self.res_name == 'Millerton Flood Release':
         #     release_mcm -= self.model.nodes['CVP Madera Canal'].max_flow
@@ -213,15 +209,14 @@ class Millerton_Lake_Flood_Release_Requirement(WaterLPParameter):
 
         release_cms = release_mcm / 0.0864
 
-        if millerton_storage_mcm < 250:
-            release_cms *= 0.5
+        release_cms[millerton_storage_mcm < 250] *= 0.5
 
         return release_cms
 
-    def value(self, *args, **kwargs):
+    def values(self, timestep):
         try:
-            val = self._value(*args, **kwargs)
-            return convert(val, "m^3 s^-1", "m^3 day^-1", scale_in=1, scale_out=1000000.0)
+            vals = self._values(timestep)
+            return self.cms_to_mcm.array(vals)
         except Exception as err:
             print('\nERROR for parameter {}'.format(self.name))
             print('File where error occurred: {}'.format(__file__))
@@ -0,0 +1,21 @@
+from pywr.parameters import DataFrameParameter
+
+from sierra.utilities.hydrology_store import load_dataframe
+
+
+class HydrologyDataframe(DataFrameParameter):
+    """
+    A DataFrameParameter that reads its input from the climate's binary hydrology store, if there is one (see
+    sierra.utilities.hydrology_store), rather than parsing the CSV file.
+    """
+
+    @classmethod
+    def load(cls, model, data):
+        scenario = data.pop('scenario', None)
+        if scenario is not None:
+            scenario = model.scenarios[scenario]
+        df = load_dataframe(model, data)
+        return cls(model, df, scenario=scenario, **data)
+
+
+HydrologyDataframe.register()
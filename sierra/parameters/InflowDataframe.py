@@ -1,11 +1,17 @@
-from pywr.parameters import DataFrameParameter
+import pandas as pd
 
+from sierra.parameters.HydrologyDataframe import HydrologyDataframe
+from sierra.utilities.hydrology_store import load_dataframe
 
-class InflowDataframe(DataFrameParameter):
+
+class InflowDataframe(HydrologyDataframe):
     """
     This parameter type extends the base DataFrameParameter by looking for a bias correction factor table
     in the model. If found, and the name of the parameter is in the table, then it will pull the correction factor
     from the table and multiply the original value by the correction factor.
+
+    If climate_urls are given (see sierra.utilities.climates), one input is read per climate, and the values are
+    indexed by the climate scenario.
     """
     bias_correction_factor = False
     bias_correct = False
@@ -27,5 +33,20 @@ class InflowDataframe(DataFrameParameter):
 
         return value
 
+    @classmethod
+    def load(cls, model, data):
+        climate_urls = data.pop('climate_urls', None)
+        if climate_urls is None:
+            return super(InflowDataframe, cls).load(model, data)
+
+        scenario = model.scenarios[data.pop('scenario')]
+        dataframes = []
+        for url in climate_urls:
+            climate_data = dict(data, url=url)
+            dataframes.append(load_dataframe(model, climate_data))
+        df = pd.concat(dataframes, axis=1)
+        df.columns = range(len(climate_urls))
+        return cls(model, df, scenario=scenario, **climate_data)
+
 
 InflowDataframe.register()
@@ -1,15 +1,18 @@
 from sierra.base_parameters import WaterLPParameter
 from dateutil.relativedelta import relativedelta
-from calendar import isleap
-import random
 import numpy as np
+from sierra.utilities.prices import get_energy_price_index
 
 
 class PH_Water_Demand(WaterLPParameter):
     """"""
 
+    vectorized = True
+
     price_threshold = None
-    cms_to_mcm = 0.0864
+    price_index = None
+
+    state_attributes = ['price_threshold']
 
     def __init__(self, model, node, block, **kwargs):
         super().__init__(model, **kwargs)
@@ -19,86 +22,79 @@ class PH_Water_Demand(WaterLPParameter):
     def setup(self):
         super().setup()
         self.price_threshold = np.zeros(self.num_scenarios, np.float)
+        self.price_index = None
 
-    def _value(self, timestep, scenario_index):
-
-        all_energy_prices = self.model.tables['All Energy Price Values']
+    def _values(self, timestep):
 
         powerhouse = self.model.nodes[self.res_name + self.month_suffix]  # powerhouse
         turbine_capacity_mcm = powerhouse.turbine_capacity
-        if type(turbine_capacity_mcm) not in [float, int]:
-            turbine_capacity_mcm = turbine_capacity_mcm.get_value(scenario_index)
+        if type(turbine_capacity_mcm) in [float, int]:
+            turbine_capacity_mcm = np.full(self.num_scenarios, turbine_capacity_mcm, np.float64)
+        else:
+            turbine_capacity_mcm = np.array(
+                [turbine_capacity_mcm.get_value(s) for s in self.model.scenarios.combinations], np.float64)
 
-        price_year = int(self.model.parameters['Price Year'].value(timestep, scenario_index))
+        price_years = self.get_all('Price Year', timestep).astype(int)
+        block = np.empty(self.num_scenarios, np.float64)
 
-        if self.datetime.month == 2 and self.datetime.day == 29:
-            price_date = self.datetime.strftime('{}-02-28'.format(price_year))
-        else:
-            price_date = self.datetime.strftime('{}-%m-%d'.format(price_year))
-
-        # calculate the price threshold if needed
-        if self.model.mode == 'planning':
-            block = self.model.tables["Energy Price Blocks"].at[price_date, str(self.block)]
-            if self.block == 1:
-                spinning_flow_fraction = powerhouse.spinning_flow
-                block = max(spinning_flow_fraction, block)
-
-            # turbine_capacity *= self.days_in_month
-
-        elif self.model.planning:
-
-            # TODO: move as much of this as possible to a single parameter
-
-            sid = scenario_index.global_id
-
-            if timestep.day == 1:
-                end = timestep.datetime + relativedelta(months=+1) - relativedelta(days=+1)
-                if not isleap(price_year) and timestep.month == 2:
-                    price_end = '{}-02-28'.format(price_year)
-                else:
-                    price_end = end.strftime('{}-%m-%d'.format(price_year))
-                energy_prices = all_energy_prices[price_date:price_end].values.flatten()
-                energy_prices[::-1].sort()  # sort in descending order
-                planning_release = self.model.planning.nodes[self.res_name + '/1'].flow[sid]
-
-                # for planning turbine capacity, note that the turbine capacities are the same
-                # in both models (i.e., cms)
-                planning_turbine_capacity = turbine_capacity_mcm * (end - self.datetime).days
-                planning_release_fraction = min(planning_release / planning_turbine_capacity, 1.0)
-                price_index = int(len(energy_prices) * planning_release_fraction) - 1
-
-                if price_index < 0:
-                    self.price_threshold[sid] = 1e6  # no production this month (unlikely)
-                else:
-                    self.price_threshold[sid] = energy_prices[price_index]
-
-            # calculate today's total release
-            energy_prices_today = all_energy_prices.loc[price_date].values
-            if self.block == 1:
-                production_hours = len([1 for p in energy_prices_today if p >= self.price_threshold[sid]])
-            else:
-                production_hours = len([1 for p in energy_prices_today if 0.0 < p < self.price_threshold[sid]])
+        # prices only vary by price year, so scenarios are calculated together for each price year
+        day = 28 if (self.datetime.month, self.datetime.day) == (2, 29) else self.datetime.day
+        for price_year in np.unique(price_years):
+            sids = price_years == price_year
 
-            max_flow_fraction = production_hours / 24
-            # blocks = self.model.tables["Energy Price Blocks"].loc[timestep.datetime]
+            # calculate the price threshold if needed
+            if self.model.mode == 'planning':
+                price_block = self.table_value("Energy Price Blocks", str(self.block), year=price_year, day=day)
+                if self.block == 1:
+                    spinning_flow_fraction = powerhouse.spinning_flow
+                    price_block = max(spinning_flow_fraction, price_block)
+                block[sids] = price_block
 
-            # sum_of_previous_blocks = blocks[:str(self.block - 1)].sum()
-            # allocation_remaining = max_flow_fraction - sum_of_previous_blocks
-            # allocation_to_this_block = min(allocation_remaining, blocks[str(self.block)])
-            # block = max(allocation_to_this_block, 0.0)
-            block = max_flow_fraction
+                # turbine_capacity *= self.days_in_month
 
-        else:
-            block = self.model.tables["Energy Price Blocks"].at[price_date, str(self.block)]
+            elif self.model.planning:
+
+                # TODO: move as much of this as possible to a single parameter
+
+                # the price index is shared by all powerhouses, and is built the first time it's needed
+                # (the planning model is not yet attached to the model during setup)
+                if self.price_index is None:
+                    self.price_index = get_energy_price_index(self.model)
+
+                if timestep.day == 1:
+                    end = timestep.datetime + relativedelta(months=+1) - relativedelta(days=+1)
+                    planning_release = self.model.planning.nodes[self.res_name + '/1'].flow[sids]
+
+                    # for planning turbine capacity, note that the turbine capacities are the same
+                    # in both models (i.e., cms)
+                    planning_turbine_capacity = turbine_capacity_mcm[sids] * (end - self.datetime).days
+                    self.price_threshold[sids] = self.price_index.price_thresholds(
+                        price_year, timestep.month, end.day, planning_release / planning_turbine_capacity)
+
+                # calculate today's total release
+                production_hours = self.price_index.production_hours(
+                    price_year, timestep.month, timestep.day, self.price_threshold[sids], block=self.block)
+
+                max_flow_fraction = production_hours / 24
+                # blocks = self.model.tables["Energy Price Blocks"].loc[timestep.datetime]
+
+                # sum_of_previous_blocks = blocks[:str(self.block - 1)].sum()
+                # allocation_remaining = max_flow_fraction - sum_of_previous_blocks
+                # allocation_to_this_block = min(allocation_remaining, blocks[str(self.block)])
+                # block = max(allocation_to_this_block, 0.0)
+                block[sids] = max_flow_fraction
+
+            else:
+                block[sids] = self.table_value("Energy Price Blocks", str(self.block), year=price_year, day=day)
 
         # TODO: Extend the following to planning mode
         if self.res_name == 'Collierville PH' and self.block == 1:
-            block = max(block, 0.05 + random.random() * 0.05)
+            block = np.maximum(block, 0.05 + np.random.random(self.num_scenarios) * 0.05)
 
         elif self.res_name in ['Sand Bar PH', 'Stanislaus PH']:
             if self.model.mode == 'scheduling' \
                     and (11, 1) <= (self.datetime.month, self.datetime.day) <= (11, 14):
-                turbine_capacity_mcm = 0.0
+                turbine_capacity_mcm *= 0.0
             elif self.model.mode == 'planning' and self.datetime.month == 11:
                 turbine_capacity_mcm *= 0.5
 
@@ -106,9 +102,9 @@ class PH_Water_Demand(WaterLPParameter):
 
         return demand_mcm
 
-    def value(self, *args, **kwargs):
+    def values(self, timestep):
         try:
-            return self._value(*args, **kwargs)
+            return self._values(timestep)
         except Exception as err:
             print('\nERROR for parameter {}'.format(self.name))
             print('File where error occurred: {}'.format(__file__))
@@ -1,7 +1,9 @@
-from pywr.recorders import NumpyArrayNodeRecorder
-from pywr.parameters import load_parameter, load_parameter_values
+from pywr.recorders import NodeRecorder
+from pywr.recorders._recorders import Aggregator
+from pywr.parameters import Parameter, load_parameter, load_parameter_values
 import numpy as np
-import pandas as pd
+
+from sierra.recorders.temporal import aggregation_periods, TemporalAggregation
 
 
 def hydropower_calculation(flow, head, efficiency,
@@ -51,7 +53,7 @@ def hydropower_calculation(flow, head, efficiency,
     return power * energy_unit_conversion
 
 
-class HydropowerEnergyRecorder(NumpyArrayNodeRecorder):
+class HydropowerEnergyRecorder(NodeRecorder):
     """ Calculates the power production using the hydropower equation
 
     This recorder saves an array of the hydrpower production in each timestep. It can be converted to a dataframe
@@ -75,6 +77,10 @@ class HydropowerEnergyRecorder(NumpyArrayNodeRecorder):
         should convert flow to units of :math:`m^3/day`
     energy_unit_conversion : float (default=1e-6)
         A factor used to transform the units of total energy. Defaults to 1e-6 to return :math:`MJ`.
+    aggregation_period : str (default=None)
+        Save energy totals by 'daily', 'monthly' or 'water_year' period, rather than for every timestep.
+    temporal_agg_func : str or dict (default='mean')
+        How the saved energy of each scenario is aggregated over time by `values`.
 
     Notes
     -----
@@ -98,8 +104,10 @@ class HydropowerEnergyRecorder(NumpyArrayNodeRecorder):
 
     def __init__(self, model, node, water_elevation_parameter=None, water_elevation_reservoir=None,
                  tailwater_elevation=0.0, efficiency=1.0, density=1000,
-                 flow_unit_conversion=1.0, energy_unit_conversion=1e-6, **kwargs):
+                 flow_unit_conversion=1.0, energy_unit_conversion=1e-6, aggregation_period=None,
+                 temporal_agg_func='mean', **kwargs):
         super(HydropowerEnergyRecorder, self).__init__(model, node, **kwargs)
+        self._temporal_aggregator = Aggregator(temporal_agg_func)
 
         self._water_elevation_parameter = water_elevation_parameter
         self._water_elevation_reservoir = water_elevation_reservoir
@@ -108,14 +116,50 @@ class HydropowerEnergyRecorder(NumpyArrayNodeRecorder):
         self.density = density
         self.flow_unit_conversion = flow_unit_conversion
         self.energy_unit_conversion = energy_unit_conversion
+        if aggregation_period not in aggregation_periods:
+            raise ValueError('aggregation_period must be one of {}'.format(list(aggregation_periods)))
+        self.aggregation_period = aggregation_period
 
     def setup(self):
-        ncomb = len(self.model.scenarios.combinations)
-        nts = len(self.model.timestepper)
-        self._data = np.zeros((nts, ncomb))
+        # without an aggregation period, energy is saved for each (daily) timestep
+        self.aggregation = TemporalAggregation(self.aggregation_period or 'daily', 'sum')
+        self.aggregation.setup(self.model)
+
+        # resolve how head and turbine capacity are obtained once, rather than every timestep
+        self._get_head = self._values_getter(self._water_elevation_parameter)
+        if self._get_head is None:
+            reservoir = self._water_elevation_reservoir
+            if reservoir is None:
+                raise ValueError('Either head or water_elevation_parameter/_reservoir must be set.')
+            self._get_head = self._values_getter(getattr(reservoir, 'level', None))
+            if self._get_head is None:
+                combinations = self.model.scenarios.combinations
+                self._get_head = lambda: np.array([reservoir.get_level(si) for si in combinations])
+        self._get_turbine_capacity = self._values_getter(self.node.turbine_capacity)
+
+    @staticmethod
+    def _values_getter(value):
+        """
+        Get a function that returns a value for all scenarios, as either a number or an array indexed by global id.
+        :param value: a number or parameter
+        :return: the function, or None if the value is neither
+        """
+        if isinstance(value, (float, int)):
+            return lambda: value
+        elif isinstance(value, Parameter):
+            return lambda: np.asarray(value.get_all_values())
+        return None
 
     def reset(self):
-        self._data[:, :] = 0.0
+        self.aggregation.reset()
+
+    @property
+    def data(self):
+        return self.aggregation.data
+
+    def values(self):
+        """Compute a value for each scenario using `temporal_agg_func`."""
+        return self._temporal_aggregator.aggregate_2d(self.data, axis=0, ignore_nan=self.ignore_nan)
 
     def to_dataframe(self):
         """ Return a `pandas.DataFrame` of the recorder data
@@ -123,10 +167,7 @@ class HydropowerEnergyRecorder(NumpyArrayNodeRecorder):
         as the first level and scenario combination names as the second level. This
         allows for easy combination with multiple recorder's DataFrames
         """
-        index = self.model.timestepper.datetime_index
-        sc_index = self.model.scenarios.multiindex
-
-        return pd.DataFrame(data=np.array(self._data), index=index, columns=sc_index)
+        return self.aggregation.to_dataframe(self.model.scenarios.multiindex)
 
     @property
     def water_elevation_parameter(self):
@@ -140,40 +181,23 @@ class HydropowerEnergyRecorder(NumpyArrayNodeRecorder):
         self._water_elevation_parameter = parameter
 
     def after(self):
-        ts = self.model.timestepper.current
-
-        for scenario_index in self.model.scenarios.combinations:
-
-            if self._water_elevation_parameter is not None:
-                if type(self._water_elevation_parameter) in [float, int]:
-                    head = self._water_elevation_parameter
-                else:
-                    head = self._water_elevation_parameter.get_value(scenario_index)
-            elif self._water_elevation_reservoir is not None:
-                reservoir = self._water_elevation_reservoir
-                head = reservoir.get_level(scenario_index)
-            else:
-                raise ValueError('Either head or water_elevation_parameter/_reservoir must be set.')
+        head = self._get_head()
+        if self.tailwater_elevation is not None:
+            head = head - self.tailwater_elevation
+
+        # -ve head is not valid
+        head = np.maximum(head, 0.0)
+
+        # Get the flow from the current node
+        flow = np.asarray(self.node.flow)
+        if self._get_turbine_capacity is not None:
+            flow = np.minimum(flow, self._get_turbine_capacity())
 
-            if self.tailwater_elevation is not None:
-                head -= self.tailwater_elevation
-
-            # -ve head is not valid
-            head = max(head, 0.0)
-            # Get the flow from the current node
-            flow = self.node.flow[scenario_index.global_id]
-            turbine_capacity = self.node.turbine_capacity
-            if turbine_capacity is not None:
-                if type(turbine_capacity) in [float, int]:
-                    pass
-                else:
-                    turbine_capacity = turbine_capacity.get_value(scenario_index)
-                flow = min(flow, turbine_capacity)
-            energy = hydropower_calculation(flow, head, self.efficiency, density=self.density,
-                                            flow_unit_conversion=self.flow_unit_conversion,
-                                            energy_unit_conversion=self.energy_unit_conversion)
-
-            self._data[ts.index, scenario_index.global_id] = energy
+        energy = hydropower_calculation(flow, head, self.efficiency, density=self.density,
+                                        flow_unit_conversion=self.flow_unit_conversion,
+                                        energy_unit_conversion=self.energy_unit_conversion)
+
+        self.aggregation.add(self.model.timestepper.current, energy)
 
     @classmethod
     def load(cls, model, data):
@@ -201,5 +225,8 @@ class HydropowerEnergyRecorder(NumpyArrayNodeRecorder):
         return cls(model, node, water_elevation_parameter=water_elevation_parameter,
                    water_elevation_reservoir=water_elevation_reservoir, **data)
 
+
+HydropowerEnergyRecorder.register()
+
 #
 # HydropowerRecorder2.register()
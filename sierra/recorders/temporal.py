@@ -0,0 +1,267 @@
+from pywr.recorders import NodeRecorder, StorageRecorder, ParameterRecorder
+import numpy as np
+import pandas as pd
+
+# pandas frequencies of the periods results can be aggregated by
+aggregation_periods = {
+    None: None,
+    'daily': 'D',
+    'monthly': 'M',
+    'water_year': 'A-SEP',
+}
+
+aggregation_functions = ['sum', 'mean', 'min', 'max']
+
+
+class TemporalAggregation(object):
+    """
+    Recorder values aggregated by period (e.g., monthly means or water year minimums) as the model runs, so that only
+    one row per period is kept rather than one per timestep.
+
+    Periods without any timesteps run (e.g., before a checkpoint a run was resumed from) are zero, as with other
+    recorders.
+
+    By default, rows are kept for all periods of the run. Results can instead be streamed (see
+    sierra.utilities.streaming): rows are then kept in a buffer, from which completed periods are flushed.
+    """
+
+    def __init__(self, period='monthly', function='sum'):
+        if aggregation_periods.get(period) is None:
+            raise ValueError('period must be one of {}'.format([p for p in aggregation_periods if p]))
+        if function not in aggregation_functions:
+            raise ValueError('function must be one of {}'.format(aggregation_functions))
+        self.period = period
+        self.function = function
+
+    def setup(self, model):
+        self._ncomb = len(model.scenarios.combinations)
+        index = model.timestepper.datetime_index
+        freq = aggregation_periods[self.period]
+        periods = index.asfreq(freq) if isinstance(index, pd.PeriodIndex) else index.to_period(freq)
+        self._rows, self.index = pd.factorize(periods)
+        self._allocate(len(self.index))
+
+    def _allocate(self, rows, offset=0):
+        # the buffer holds the rows of the periods from offset on
+        self.offset = offset
+        self._data = np.empty((rows, self._ncomb))
+        self._counts = np.empty(rows, dtype=int)
+        self._clear(slice(None))
+
+    def _clear(self, rows):
+        if self.function == 'min':
+            self._data[rows, :] = np.inf
+        elif self.function == 'max':
+            self._data[rows, :] = -np.inf
+        else:
+            self._data[rows, :] = 0.0
+        self._counts[rows] = 0
+
+    def reset(self):
+        self._clear(slice(None))
+
+    def set_buffer(self, rows, first_timestep=0):
+        """
+        Keep a buffer of rows, rather than rows for all periods, to stream results from.
+        :param rows: the number of rows in the buffer, which grows if it is not flushed often enough
+        :param first_timestep: the index of the first timestep to be run
+        :return:
+        """
+        offset = self._rows[first_timestep] if first_timestep < len(self._rows) else len(self.index)
+        self._allocate(max(min(rows, len(self.index) - offset), 1), offset=offset)
+
+    def add(self, timestep, values):
+        row = self._rows[timestep.index] - self.offset
+        if row >= len(self._data):
+            self._grow(row + 1)
+        if self.function == 'min':
+            np.minimum(self._data[row], values, out=self._data[row])
+        elif self.function == 'max':
+            np.maximum(self._data[row], values, out=self._data[row])
+        else:
+            self._data[row] += values
+        self._counts[row] += 1
+
+    def _grow(self, rows):
+        data, counts, offset = self._data, self._counts, self.offset
+        self._allocate(min(max(rows, 2 * len(data)), len(self.index) - offset), offset=offset)
+        self._data[:len(data)] = data
+        self._counts[:len(counts)] = counts
+
+    def _values(self, rows, first=0):
+        counts = self._counts[first:rows].reshape(-1, 1)
+        data = self._data[first:rows] / np.maximum(counts, 1) if self.function == 'mean' \
+            else self._data[first:rows].copy()
+        data[self._counts[first:rows] == 0, :] = 0.0
+        return data
+
+    def _held_rows(self):
+        return min(len(self._data), len(self.index) - self.offset)
+
+    @property
+    def data(self):
+        """The values of the periods held, which are all periods unless results are streamed."""
+        return self._values(self._held_rows())
+
+    @property
+    def data_index(self):
+        return self.index[self.offset:self.offset + self._held_rows()]
+
+    def period_values(self, start, stop):
+        """
+        Get the values of the periods of a range of timesteps (e.g., a water year), rather than of all periods held.
+        :param start: the index of the first timestep
+        :param stop: the index after the last timestep
+        :return: the index and values of the periods that are held
+        """
+        if stop <= start:
+            return self.index[:0], np.zeros((0, self._ncomb))
+        first = max(self._rows[start] - self.offset, 0)
+        last = max(min(self._rows[stop - 1] + 1 - self.offset, self._held_rows()), first)
+        return self.index[self.offset + first:self.offset + last], self._values(last, first)
+
+    def flush(self, timestep_index):
+        """
+        Remove the values of the periods that are complete (e.g., at the end of a water year) from the buffer.
+        :param timestep_index: the index of the last timestep run
+        :return: the index and values of the periods removed
+        """
+        if timestep_index + 1 < len(self._rows):
+            end = self._rows[timestep_index + 1]
+        else:
+            end = len(self.index)
+        rows = end - self.offset
+        if rows <= 0:
+            return self.index[:0], np.zeros((0, self._ncomb))
+
+        values = np.zeros((rows, self._ncomb))
+        held = min(rows, len(self._data))
+        values[:held] = self._values(held)
+        index = self.index[self.offset:end]
+
+        # the remaining rows move to the start of the buffer
+        remaining = len(self._data) - held
+        self._data[:remaining] = self._data[held:]
+        self._counts[:remaining] = self._counts[held:]
+        self._clear(slice(remaining, None))
+        self.offset = end
+
+        return index, values
+
+    def to_dataframe(self, columns):
+        return pd.DataFrame(data=self.data, index=self.data_index, columns=columns)
+
+
+class TemporalRecorderMixin(object):
+    """
+    Methods shared by the temporal recorders, which record a value per period rather than per timestep. Subclasses get
+    the values to record with current_values.
+    """
+
+    def setup(self):
+        self.aggregation.setup(self.model)
+
+    def reset(self):
+        self.aggregation.reset()
+
+    def after(self):
+        self.aggregation.add(self.model.timestepper.current, self.current_values())
+
+    @property
+    def data(self):
+        return self.aggregation.data
+
+    def to_dataframe(self):
+        return self.aggregation.to_dataframe(self.model.scenarios.multiindex)
+
+
+class TemporalNodeRecorder(TemporalRecorderMixin, NodeRecorder):
+    """
+    Records the flow of a node, aggregated by period (see TemporalAggregation).
+
+    Parameters
+    ----------
+    period : str (default='monthly')
+        'daily', 'monthly' or 'water_year'.
+    function : str (default='sum')
+        'sum', 'mean', 'min' or 'max' of the values in each period.
+    factor : float (default=1.0)
+        A factor to scale the flow by.
+    """
+
+    def __init__(self, model, node, period='monthly', function='sum', factor=1.0, **kwargs):
+        super(TemporalNodeRecorder, self).__init__(model, node, **kwargs)
+        self.aggregation = TemporalAggregation(period, function)
+        self.factor = factor
+
+    def current_values(self):
+        return np.asarray(self.node.flow) * self.factor
+
+
+TemporalNodeRecorder.register()
+
+
+class TemporalStorageRecorder(TemporalRecorderMixin, StorageRecorder):
+    """
+    Records the volume (or proportional volume) of a storage node, aggregated by period.
+
+    Parameters
+    ----------
+    period : str (default='monthly')
+    function : str (default='mean')
+    proportional : bool (default=False)
+        Record the proportional [0, 1] rather than absolute volume.
+    """
+
+    def __init__(self, model, node, period='monthly', function='mean', proportional=False, **kwargs):
+        super(TemporalStorageRecorder, self).__init__(model, node, **kwargs)
+        self.aggregation = TemporalAggregation(period, function)
+        self.proportional = proportional
+
+    def current_values(self):
+        return self.node.current_pc if self.proportional else self.node.volume
+
+
+TemporalStorageRecorder.register()
+
+
+class TemporalLevelRecorder(TemporalRecorderMixin, StorageRecorder):
+    """
+    Records the level of a storage node, aggregated by period.
+
+    Parameters
+    ----------
+    period : str (default='monthly')
+    function : str (default='mean')
+    """
+
+    def __init__(self, model, node, period='monthly', function='mean', **kwargs):
+        super(TemporalLevelRecorder, self).__init__(model, node, **kwargs)
+        self.aggregation = TemporalAggregation(period, function)
+
+    def current_values(self):
+        return np.array([self.node.get_level(si) for si in self.model.scenarios.combinations])
+
+
+TemporalLevelRecorder.register()
+
+
+class TemporalParameterRecorder(TemporalRecorderMixin, ParameterRecorder):
+    """
+    Records the value of a parameter, aggregated by period.
+
+    Parameters
+    ----------
+    period : str (default='monthly')
+    function : str (default='sum')
+    """
+
+    def __init__(self, model, param, period='monthly', function='sum', **kwargs):
+        super(TemporalParameterRecorder, self).__init__(model, param, **kwargs)
+        self.aggregation = TemporalAggregation(period, function)
+
+    def current_values(self):
+        return np.asarray(self.parameter.get_all_values())
+
+
+TemporalParameterRecorder.register()
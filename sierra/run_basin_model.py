@@ -1,26 +1,43 @@
 import os
-import sys
 import json
-from pywr.core import Model
-from importlib import import_module
 from tqdm import tqdm
 from datetime import datetime
 from dateutil.relativedelta import relativedelta
 from sierra.common.tests import get_planning_dataframe
 import pandas as pd
 import traceback
-from sierra.utilities import simplify_network, prepare_planning_model, save_model_results, create_schematic
+from sierra.utilities import simplify_network, prepare_planning_model, roll_planning_model, save_model_results, \
+    create_schematic, prepare_tables
+from sierra.utilities.results import recorder_results, recorder_types, save_results
+from sierra.utilities.cache import model_cache_key, cached_model_paths, save_to_cache, touch_cached_models, \
+    prune_cache
+from sierra.utilities.climates import climate_dates, add_climate_scenario, load_climate_tables
+from sierra.utilities.profiler import ModelProfiler
+from sierra.utilities.shared_tables import load_model, share_tables
+from sierra.utilities.model_pool import get_pooled_models, pool_models
+from sierra.utilities.output_profiles import get_output_profile
+from sierra.utilities.documents import prepare_model_document
+from sierra.utilities.streaming import ResultsStream
+from sierra.utilities.chunks import water_year_chunks, trim_chunk_results, stitch_chunk_results, \
+    boundary_discrepancies
+from sierra.utilities.checkpoints import checkpoint_dir, clear_checkpoints, save_checkpoint, load_checkpoint, \
+    resume_model
 from loguru import logger
 from graphviz import ExecutableNotFound
 
 SECONDS_IN_DAY = 3600 * 24
 
 
-def run_model(*args, **kwargs):
-    climate = args[0]
-    basin = args[1]
-    run_name = kwargs['run_name']
-
+def add_model_logger(climate, basin, run_name):
+    """
+    Log a model run to its own file, replacing any log from a previous run.
+    :param climate: the climate (or list of climates)
+    :param basin:
+    :param run_name:
+    :return: the logger handler id, or None if the log file could not be replaced
+    """
+    if isinstance(climate, list):
+        climate = '{}_x{}'.format(climate[0], len(climate))
     logger_name = '{}-{}-{}.log'.format(run_name, basin, climate.replace('/', '_'))
     logs_dir = os.path.join('.', 'logs')
     if not os.path.exists(logs_dir):
@@ -29,11 +46,18 @@ def run_model(*args, **kwargs):
     if os.path.exists(logger_path):
         try:
             os.remove(logger_path)
-            logger.add(logger_path)
         except:
             logger.warning('Failed to remove log file {}'.format(logger_path))
-    else:
-        logger.add(logger_path)
+            return None
+    return logger.add(logger_path)
+
+
+def run_model(*args, **kwargs):
+    climate = args[0]
+    basin = args[1]
+    run_name = kwargs['run_name']
+
+    add_model_logger(climate, basin, run_name)
 
     try:
         _run_model(*args, **kwargs)
@@ -42,6 +66,117 @@ def run_model(*args, **kwargs):
         logger.error("Failed")
 
 
+def _run_model_chunk(climate, basin, chunk, **kwargs):
+    results = _run_model(climate, basin, return_results=True, **kwargs)
+
+    # keep the day before the chunk starts, to compare with the end of the previous chunk
+    results['results'] = trim_chunk_results(results['results'], chunk['start'] - pd.DateOffset(days=1), chunk['end'])
+    return results
+
+
+def run_model_chunks(climate, basin, num_chunks, spinup_years=2, num_cores=None, **kwargs):
+    """
+    Run a model in parallel chunks of water years, and stitch the results together.
+
+    Each chunk is run from a spin-up period before it (see sierra.utilities.chunks.water_year_chunks), so the state at
+    the start of each chunk approximates, but is not the same as, the state in a single run of the whole period. The
+    differences in storage at each boundary are logged and saved with the results (chunk_boundaries.csv).
+    :param climate: the climate (or list of climates)
+    :param basin:
+    :param num_chunks: the number of chunks
+    :param spinup_years: the number of water years to run before each chunk
+    :param num_cores: the number of processes (defaults to the number of chunks)
+    :param kwargs: other arguments to _run_model
+    :return:
+    """
+    import multiprocessing as mp
+
+    climates = climate if isinstance(climate, list) else [climate]
+    run_name = kwargs.get('run_name', 'default')
+    logger.info("Running \"{}\" scenario for {} basin, {} in {} time chunks".format(
+        run_name, basin.upper(), climates[0].upper(), num_chunks))
+
+    for option in ['profile', 'checkpoint', 'resume']:
+        if kwargs.pop(option, None):
+            logger.warning('The {} option is not used when running time chunks'.format(option))
+
+    start = kwargs.pop('start', None)
+    end = kwargs.pop('end', None)
+    if start is None or end is None:
+        start, end = climate_dates(climates[0])
+    start = pd.Timestamp(start)
+    end = pd.Timestamp(end)
+
+    # the planning model runs past the end of the daily model, so chunk runs are extended accordingly
+    include_planning = kwargs.get('include_planning') and basin not in ['merced', 'tuolumne']
+    planning_months = kwargs.get('planning_months', 12)
+
+    chunks = water_year_chunks(start, end, num_chunks, spinup_years=spinup_years)
+    if include_planning:
+        chunks[-1]['end'] -= relativedelta(months=planning_months)
+
+    # all chunks read the same tables, including the climate's
+    shared_tables = share_tables([basin], kwargs.get('data_path'), climate=climates[0] if len(climates) == 1 else None,
+                                 include_planning=include_planning)
+
+    pool = mp.Pool(processes=min(num_cores or len(chunks), len(chunks)))
+    jobs = []
+    for i, chunk in enumerate(chunks):
+        run_end = chunk['end']
+        if include_planning:
+            run_end = min(run_end + relativedelta(months=planning_months), end)
+        chunk_kwargs = dict(kwargs, start=chunk['run_start'].strftime('%Y-%m-%d'),
+                            end=run_end.strftime('%Y-%m-%d'), chunk=i, shared_tables=shared_tables.manifest)
+        jobs.append(pool.apply_async(_run_model_chunk, (climate, basin, chunk), chunk_kwargs))
+    pool.close()
+
+    try:
+        chunk_outputs = [job.get() for job in jobs]
+    finally:
+        pool.join()
+        shared_tables.close()
+
+    chunk_results = [output['results'] for output in chunk_outputs]
+    discrepancies = boundary_discrepancies(chunks, chunk_results)
+    for _, row in discrepancies.sort_values('max_abs_difference', ascending=False).head(10).iterrows():
+        logger.info('Chunk boundary {}: {} differs by {:.3f} ({:.2%})'.format(
+            row['boundary'], row['recorder'], row['max_abs_difference'], row['max_rel_difference']))
+
+    results = stitch_chunk_results([trim_chunk_results(r, chunk['start']) for chunk, r in zip(chunks, chunk_results)])
+    types = chunk_outputs[0]['types']
+    scenario_names = chunk_outputs[0]['scenario_names']
+
+    here = os.path.dirname(os.path.realpath(__file__))
+    os.chdir(here)
+    base_results_path, run_folder = get_results_folders(run_name, debug=kwargs.get('debug', False),
+                                                        file_suffix=kwargs.get('file_suffix'))
+    for climate in climates:
+        results_path = os.path.join(base_results_path, run_folder, basin, climate)
+        save_results(results.items(), types, scenario_names, results_path, kwargs.get('file_suffix'),
+                     results_format=kwargs.get('results_format', 'csv'), float32=kwargs.get('float32', False),
+                     climate=climate if len(climates) > 1 else None)
+        discrepancies.to_csv(os.path.join(results_path, 'chunk_boundaries.csv'), index=False)
+
+
+def get_results_folders(run_name, debug=False, file_suffix=None):
+    """
+    Get the base results folder (relative to this folder, when debugging) and the run's results folder name.
+    :param run_name:
+    :param debug:
+    :param file_suffix:
+    :return: the base results folder and the run folder
+    """
+    if debug:
+        base_results_path = '../results'
+    else:
+        base_results_path = os.environ.get('SIERRA_RESULTS_PATH', '../results')
+
+    suffix = ' - {}'.format(file_suffix) if file_suffix else ''
+    run_folder = run_name + suffix
+
+    return base_results_path, run_folder
+
+
 def _run_model(climate,
                basin,
                start=None, end=None,
@@ -55,22 +190,40 @@ def _run_model(climate,
                scenarios=None,
                show_progress=False,
                data_path=None,
-               file_suffix=None
+               file_suffix=None,
+               rolling_planning=False,
+               use_cache=True,
+               results_format='csv',
+               float32=False,
+               profile=None,
+               checkpoint=False,
+               resume=False,
+               return_results=False,
+               chunk=None,
+               shared_tables=None,
+               reuse_model=False,
+               output_profile='full',
+               stream_results=False
                ):
-    logger.info("Running \"{}\" scenario for {} basin, {} climate".format(run_name, basin.upper(), climate.upper()))
+    # climates can be run together as a scenario
+    climates = climate if isinstance(climate, list) else [climate]
+    climate = climates[0]
+    if len(climates) > 1:
+        logger.info("Running \"{}\" scenario for {} basin, {} climates starting with {}".format(
+            run_name, basin.upper(), len(climates), climate.upper()))
+    else:
+        logger.info("Running \"{}\" scenario for {} basin, {} climate".format(run_name, basin.upper(), climate.upper()))
 
     climate_set, climate_scenario = climate.split('/')
 
+    # optional profiling of model components; models are only instrumented if profiling
+    profiler = ModelProfiler() if profile else None
+
     if debug:
-        from sierra.utilities import check_nan
+        # files shared by climates are only validated once, and unchanged files are not read again
+        from sierra.utilities.validation import validate_inputs
         basin_path = os.path.join(data_path, basin.replace('_', ' ').title() + ' River')
-        total_nan = check_nan(basin_path, climate)
-
-        try:
-            assert (total_nan == 0)
-            logger.info('No NaNs found in data files')
-        except AssertionError:
-            logger.warning('{} NaNs found in data files.'.format(total_nan))
+        validate_inputs(basin_path, climates)
 
     # if debug:
     #     from sierra import create_schematic
@@ -82,23 +235,9 @@ def _run_model(climate,
     # Set up dates
 
     if start is None or end is None:
-        # TODO: get start and end years from outside, not hard coded
-        if climate_scenario == 'Livneh':
-            start_year = 1950
-            end_year = 2012
-        elif climate_set == 'gcms':
-            start_year = 2030
-            end_year = 2060
-        elif climate_set == 'sequences':
-            # name format is N01_S01, where N01 refers to the number of drought years
-            # the total number of years is 1 + N + 2 (1 year at the end as a buffer)
-            N = int(climate_scenario.split('Y')[1].split('_')[0])
-            start_year = 2000
-            end_year = start_year + N
-        else:
-            raise Exception("Climate scenario unknown")
-        start = '{}-10-01'.format(start_year)
-        end = '{}-09-30'.format(end_year)
+        start, end = climate_dates(climate)
+        if any(climate_dates(c) != (start, end) for c in climates):
+            raise Exception('Climates run together must have the same dates.')
 
     # ========================
     # Set up model environment
@@ -115,189 +254,193 @@ def _run_model(climate,
     bucket = 'openagua-networks'
     base_filename = 'pywr_model.json'
     model_filename_base = 'pywr_model_{}'.format(climate_scenario)
+    if len(climates) > 1:
+        model_filename_base += '_x{}'.format(len(climates))
+    if chunk is not None:
+        # time chunks of the same run are prepared at the same time, so they need their own model files
+        model_filename_base += '_chunk{}'.format(chunk)
     model_filename = model_filename_base + '.json'
 
     base_path = os.path.join(root_dir, base_filename)
     model_path = os.path.join(temp_dir, model_filename)
 
-    # first order of business: update file paths in json file
-    with open(base_path) as f:
-        base_model = json.load(f)
-
-    # update model with scenarios, if any
-    def update_model(scenario_path):
-        if os.path.exists(scenario_path):
-            with open(scenario_path) as f:
-                scenario_model = json.load(f)
-            for key, scenario_items in scenario_model.items():
-                if key in base_model:
-                    if type(scenario_items) == dict:
-                        base_model[key].update(scenario_items)
-                    else:
-                        base_model[key].extend(scenario_items)
-                elif key in ['scenarios', 'nodes']:
-                    items = {item['name']: item for item in base_model.get(key, [])}
-                    new_items = {item['name']: item for item in scenario_items}
-                    items.update(new_items)
-                    base_model[key] = list(items.values())
-        else:
-            raise Exception('Scenario path {} does not exist.'.format(scenario_path))
-
-
+    # scenario definitions to apply to the base model
+    scenario_paths = []
     if scenarios is not None:
         for s in scenarios:
-            # update from scenarios folder
             scenario_path = os.path.join(data_path, 'metadata', 'scenario_definitions', '{}.json'.format(s))
-            update_model(scenario_path)
-
-    new_model_parts = {}
-    for model_part in ['tables', 'parameters']:
-        if model_part not in base_model:
-            continue
-        new_model_parts[model_part] = {}
-        for pname, param in base_model[model_part].items():
-            if 'observed' in pname.lower():
-                continue
-            url = param.get('url')
-            if url:
-                if data_path:
-                    url = url.replace('../data', data_path)
-                url = url.replace('historical/Livneh', climate)
-                param['url'] = url
-            new_model_parts[model_part][pname] = param
-
-    base_model.update(new_model_parts)
-    base_model['timestepper']['start'] = start
-    base_model['timestepper']['end'] = end
-    with open(model_path, 'w') as f:
-        json.dump(base_model, f, indent=4)
-
-    # =========================================
-    # Load and register global model parameters
-    # =========================================
-
-    # sys.path.insert(0, os.getcwd())
-    policy_folder = 'parameters'
-    for filename in os.listdir(policy_folder):
-        if '__init__' in filename:
-            continue
-        policy_name = os.path.splitext(filename)[0]
-        policy_module = 'sierra.parameters.{policy_name}'.format(policy_name=policy_name)
-        import_module(policy_module, policy_folder)
-
-    # =========================================
-    # Load and register custom model parameters
-    # =========================================
-
-    sys.path.insert(0, os.getcwd())
-    policy_folder = os.path.join('models', basin, '_parameters')
-    for filename in os.listdir(policy_folder):
-        if '__init__' in filename:
-            continue
-        policy_name = os.path.splitext(filename)[0]
-        policy_module = 'models.{basin}._parameters.{policy_name}'.format(basin=basin, policy_name=policy_name)
-        import_module(policy_module, policy_folder)
-
-    # import domains
-    import_module('.domains', 'domains')
-    if debug:
-        logger.info("Domains imported")
-
-    # import custom policies
-    try:
-        import_module('{}.policies'.format(basin))
-    except:
-        pass
-
-    # =========================================
-    # Load and register custom model recorders
-    # =========================================
-
-    from recorders.hydropower import HydropowerEnergyRecorder
-    HydropowerEnergyRecorder.register()
-
-    # prepare the model files
-    if simplify or include_planning:
-        with open(model_path, 'r') as f:
-            model_json = json.load(f)
-
-    if simplify:
-        # simplify model
-        simplified_filename = model_filename_base + '_simplified.json'
-        simplified_model_path = os.path.join(temp_dir, simplified_filename)
-
-        model_json = simplify_network(model_json, basin=basin, climate=climate, delete_gauges=True,
-                                      delete_observed=True)
-        with open(simplified_model_path, 'w') as f:
-            f.write(json.dumps(model_json, indent=4))
-
-        if debug:
-            try:
-                create_schematic(basin, 'simplified')
-            except FileNotFoundError as err:
-                logger.warning('Could not create schematic from Livneh model.')
-            except ExecutableNotFound:
-                logger.warning('Could not create daily schematic from Livneh model.')
-
-        model_path = simplified_model_path
+            if not os.path.exists(scenario_path):
+                raise Exception('Scenario path {} does not exist.'.format(scenario_path))
+            scenario_paths.append(scenario_path)
+
+    # check for a cached, compiled version of the model
+    cache_key = model_cache_key(
+        base_path, scenario_paths,
+        basin=basin, climates=climates, start=start, end=end, data_path=data_path, simplify=simplify,
+        include_planning=include_planning, planning_months=planning_months,
+        output_profile=get_output_profile(output_profile), stream_results=stream_results
+    )
+    cached_model_path, cached_planning_model_path = cached_model_paths(temp_dir, cache_key)
+    cache_hit = use_cache and os.path.exists(cached_model_path) \
+                and (not include_planning or os.path.exists(cached_planning_model_path))
+    if cache_hit:
+        logger.info('Using cached model {}'.format(cache_key[:12]))
+        touch_cached_models(temp_dir, cache_key)
+
+    # models loaded by this process for another climate are reused, with this climate's inputs
+    pool_key = None
+    pooled = None
+    if reuse_model and len(climates) == 1 and not (profile or checkpoint or resume):
+        pool_key = model_cache_key(
+            base_path, scenario_paths,
+            basin=basin, data_path=data_path, simplify=simplify, include_planning=include_planning,
+            planning_months=planning_months, output_profile=get_output_profile(output_profile),
+            stream_results=stream_results
+        )
+        pooled = get_pooled_models(pool_key, climate, start, end)
 
     # Area for testing monthly model
     save_results = debug
     planning_model = None
     df_planning = None
 
-    if include_planning:
+    if pooled is not None:
+        model = pooled.models[0]
+        if include_planning:
+            planning_model = pooled.models[1]
 
-        logger.info('Creating planning model (this may take a minute or two)')
-
-        # create filenames, etc.
-        monthly_filename = model_filename_base + '_monthly.json'
-        planning_model_path = os.path.join(temp_dir, monthly_filename)
-
-        prepare_planning_model(model_json, basin, climate, planning_model_path, steps=planning_months, debug=debug,
-                               remove_rim_dams=True)
-
-        if debug:
+    else:
+        if not cache_hit:
+            # first order of business: update file paths in json file
+            with open(base_path) as f:
+                base_model = json.load(f)
+
+            prepare_model_document(base_model, basin, climates, start, end, scenario_paths=scenario_paths,
+                                   data_path=data_path, output_profile=output_profile, stream_results=stream_results)
+            with open(model_path, 'w') as f:
+                json.dump(base_model, f, indent=4)
+
+        # prepare the model files
+        if not cache_hit and (simplify or include_planning):
+            with open(model_path, 'r') as f:
+                model_json = json.load(f)
+
+        if cache_hit:
+            model_path = cached_model_path
+
+        elif simplify:
+            # simplify model
+            simplified_filename = model_filename_base + '_simplified.json'
+            simplified_model_path = os.path.join(temp_dir, simplified_filename)
+
+            model_json = simplify_network(model_json, basin=basin, climate=climate, delete_gauges=True,
+                                          delete_observed=True)
+            if len(climates) > 1:
+                add_climate_scenario(model_json, climates)
+            with open(simplified_model_path, 'w') as f:
+                f.write(json.dumps(model_json, indent=4))
+
+            if debug:
+                try:
+                    create_schematic(basin, 'simplified')
+                except FileNotFoundError as err:
+                    logger.warning('Could not create schematic from Livneh model.')
+                except ExecutableNotFound:
+                    logger.warning('Could not create daily schematic from Livneh model.')
+
+            model_path = simplified_model_path
+
+        if include_planning:
+
+            logger.info('Creating planning model')
+
+            planning_model_json = None
+            if cache_hit:
+                planning_model_path = cached_planning_model_path
+
+            else:
+                # create filenames, etc.
+                monthly_filename = model_filename_base + '_monthly.json'
+                planning_model_path = os.path.join(temp_dir, monthly_filename)
+
+                # the planning model file is only needed for the cache and for debugging;
+                # otherwise, the model is loaded directly from memory
+                save_planning_model = use_cache or debug
+                planning_model_json = prepare_planning_model(
+                    model_json, basin, climate, planning_model_path if save_planning_model else None,
+                    steps=planning_months, debug=debug, remove_rim_dams=True,
+                    climates=climates if len(climates) > 1 else None
+                )
+
+                if debug:
+                    try:
+                        create_schematic(basin, 'monthly')
+                    except ExecutableNotFound:
+                        logger.warning('Graphviz executable not found. Monthly schematic not created.')
+
+                if use_cache:
+                    save_to_cache(planning_model_path, cached_planning_model_path)
+
+            # create pywr model
             try:
-                create_schematic(basin, 'monthly')
-            except ExecutableNotFound:
-                logger.warning('Graphviz executable not found. Monthly schematic not created.')
-
-        # create pywr model
+                if planning_model_json is not None:
+                    planning_model = load_model(planning_model_json, path=temp_dir, shared_tables=shared_tables,
+                                                basin=basin)
+                else:
+                    planning_model = load_model(planning_model_path, path=planning_model_path,
+                                                shared_tables=shared_tables, basin=basin)
+            except Exception as err:
+                logger.error("Planning model failed to load")
+                # logger.error(err)
+                raise
+
+            # set model mode to planning
+            planning_model.mode = 'planning'
+            planning_model.blocks = {}
+            if len(climates) > 1:
+                if planning_model_json is None:
+                    with open(planning_model_path) as f:
+                        planning_model_json = json.load(f)
+                load_climate_tables(planning_model, planning_model_json, climates)
+            prepare_tables(planning_model)
+
+            # set time steps
+            # start = planning_model.timestepper.start
+            end = planning_model.timestepper.end
+            end -= relativedelta(months=planning_months)
+
+            planning_model.setup()
+
+            if profiler:
+                profiler.instrument(planning_model, 'planning')
+
+            # if debug == 'm':
+            #     test_planning_model(planning_model, months=planning_months, save_results=save_results)
+            #     return
+
+        if use_cache and not cache_hit:
+            save_to_cache(model_path, cached_model_path)
+            prune_cache(temp_dir)
+
+        # ==================
+        # Create daily model
+        # ==================
+        logger.info('Loading daily model')
         try:
-            planning_model = Model.load(planning_model_path, path=planning_model_path)
+            model = load_model(model_path, path=model_path, shared_tables=shared_tables, basin=basin)
         except Exception as err:
-            logger.error("Planning model failed to load")
-            # logger.error(err)
+            logger.error(err)
             raise
 
-        # set model mode to planning
-        planning_model.mode = 'planning'
-        planning_model.blocks = {}
+        model.blocks = {}
+        if len(climates) > 1:
+            with open(model_path) as f:
+                load_climate_tables(model, json.load(f), climates)
+        prepare_tables(model)
+        model.setup()
 
-        # set time steps
-        # start = planning_model.timestepper.start
-        end = planning_model.timestepper.end
-        end -= relativedelta(months=planning_months)
-
-        planning_model.setup()
-
-        # if debug == 'm':
-        #     test_planning_model(planning_model, months=planning_months, save_results=save_results)
-        #     return
-
-    # ==================
-    # Create daily model
-    # ==================
-    logger.info('Loading daily model')
-    try:
-        model = Model.load(model_path, path=model_path)
-    except Exception as err:
-        logger.error(err)
-        raise
-
-    model.blocks = {}
-    model.setup()
+        if profiler:
+            profiler.instrument(model, 'daily')
 
     # run model
     # note that tqdm + step adds a little bit of overhead.
@@ -313,15 +456,50 @@ def _run_model(climate,
     step = -1
     now = datetime.now()
     monthly_seconds = 0
+    monthly_steps = 0
     model.mode = 'scheduling'
     model.planning = None
     if include_planning:
         model.planning = planning_model
         model.planning.scheduling = model
 
+    # checkpoints are saved at the end of each water year, so that a failed run can be resumed
+    datetime_index = model.timestepper.datetime_index
+    checkpoints_path = None
+    checkpoint_date = None
+    if checkpoint or resume:
+        checkpoints_path = checkpoint_dir(temp_dir, cache_key, rolling_planning=rolling_planning)
+        state = None
+        if resume:
+            state, resumed_results = load_checkpoint(checkpoints_path)
+            if state is None:
+                logger.warning('No checkpoint found. Starting from the beginning.')
+        if state is not None:
+            if model.dirty or model.timestepper.dirty:
+                model.setup()
+            resume_date = resume_model(model, state, resumed_results)
+            checkpoint_date = state['date']
+            logger.info('Resuming from checkpoint at {}'.format(checkpoint_date.date()))
+            step += (datetime_index.to_timestamp() < resume_date).sum()
+            datetime_index = datetime_index[datetime_index.to_timestamp() >= resume_date]
+        else:
+            clear_checkpoints(checkpoints_path)
+
+    # results are streamed to disk at the end of each water year, rather than kept in memory for the whole run; the
+    # stream file is kept if the run fails
+    base_results_path, run_folder = get_results_folders(run_name, debug=debug, file_suffix=file_suffix)
+    stream = None
+    if stream_results:
+        stream_name = climate.replace('/', '_') + ('_x{}'.format(len(climates)) if len(climates) > 1 else '')
+        if chunk is not None:
+            stream_name += '_chunk{}'.format(chunk)
+        stream = ResultsStream(os.path.join(base_results_path, run_folder, basin, 'streams', stream_name + '.h5'))
+        stream.open(model, first_timestep=step + 1)
+    model.results_stream = stream
+
     disable_progress_bar = not debug and not show_progress
     n_timesteps = len(model.timestepper.datetime_index)
-    for date in tqdm(model.timestepper.datetime_index, ncols=60, disable=disable_progress_bar):
+    for date in tqdm(datetime_index, ncols=60, disable=disable_progress_bar):
         step += 1
         if disable_progress_bar and date.month == 9 and date.day == 30:
             logger.info('{}% complete (finsished year {})'.format(round(step / n_timesteps * 100), date.year))
@@ -329,13 +507,22 @@ def _run_model(climate,
 
             # Step 1: run planning model
             if include_planning and date.day == 1:
+                planning_now = datetime.now()
 
                 # update planning model
-                model.planning.reset(start=date.to_timestamp())
+                if rolling_planning:
+                    roll_planning_model(model.planning, date.to_timestamp())
+                else:
+                    model.planning.reset(start=date.to_timestamp())
+                if profiler:
+                    profiler.record('planning', 'model', 'update', (datetime.now() - planning_now).total_seconds())
 
                 # run planning model (intial conditions are set within the model step)
                 model.planning.step()
 
+                monthly_seconds += (datetime.now() - planning_now).total_seconds()
+                monthly_steps += 1
+
                 if debug and save_results:
                     df_month = get_planning_dataframe(model.planning)
                     if df_planning is None:
@@ -345,25 +532,68 @@ def _run_model(climate,
 
             # Step 2: run daily model
             model.step()
+
+            if checkpoints_path and date.month == 9 and date.day == 30:
+                save_checkpoint(checkpoints_path, model, date.to_timestamp(), prev_date=checkpoint_date)
+                checkpoint_date = date.to_timestamp()
+
+            if stream and date.month == 9 and date.day == 30:
+                stream.flush()
         except Exception as err:
             traceback.print_exc()
             logger.error('Failed at step {}'.format(date))
+            if stream:
+                stream.close()
+                logger.info('Results up to the last water year are saved in {}'.format(stream.path))
             raise
 
-    if debug:
-        total_seconds = (datetime.now() - now).total_seconds()
-        logger.debug('Total run: {} seconds'.format(total_seconds))
+    total_seconds = (datetime.now() - now).total_seconds()
+    logger.info('Total run: {} seconds'.format(total_seconds))
+
+    if pool_key:
+        if pooled is None:
+            documents = [model_path]
+            if include_planning:
+                documents.append(planning_model_json if planning_model_json is not None else planning_model_path)
+            pool_models(pool_key, climate, [model] + ([planning_model] if include_planning else []), documents)
+        else:
+            pool_models(pool_key, climate, pooled, None)
+
+    if include_planning:
         monthly_pct = monthly_seconds / total_seconds * 100
-        logger.debug('Monthly overhead: {} seconds ({:02}% of total)'.format(monthly_seconds, monthly_pct))
+        logger.info('Monthly overhead: {} seconds ({:.1f}% of total) over {} planning steps ({:.3f} seconds/step)'.format(
+            monthly_seconds, monthly_pct, monthly_steps, monthly_seconds / max(monthly_steps, 1)))
 
     # save results to CSV
     # results_path = os.path.join('./results', run_name, basin, climate)
-    if debug:
-        base_results_path = '../results'
-    else:
-        base_results_path = os.environ.get('SIERRA_RESULTS_PATH', '../results')
 
-    suffix = ' - {}'.format(file_suffix) if file_suffix else ''
-    run_folder = run_name + suffix
-    results_path = os.path.join(base_results_path, run_folder, basin, climate)
-    save_model_results(model, results_path, file_suffix, debug=debug)
+    if profiler:
+        profile_name = climate.replace('/', '_') + ('_x{}'.format(len(climates)) if len(climates) > 1 else '')
+        profile_path = os.path.join(base_results_path, run_folder, basin, 'profiles', profile_name)
+        profile_path = profiler.save(profile_path, profile_format=profile, total_seconds=total_seconds)
+        logger.info('Profile saved to {}'.format(profile_path))
+        for i, row in profiler.report(total_seconds=total_seconds).head(10).iterrows():
+            logger.info('{:.1f}% {} {} {} ({} calls)'.format(row['self_pct'], row['model'], row['kind'], row['name'],
+                                                            row['calls']))
+
+    if return_results:
+        # results are saved by the caller (e.g., after stitching together runs of time chunks)
+        results = {
+            'results': dict(recorder_results(model)),
+            'types': recorder_types(model),
+            'scenario_names': [s.name for s in model.scenarios.scenarios]
+        }
+        if stream:
+            stream.close(remove=True)
+        return results
+
+    for climate in climates:
+        results_path = os.path.join(base_results_path, run_folder, basin, climate)
+        save_model_results(model, results_path, file_suffix, results_format=results_format, float32=float32,
+                           climate=climate if len(climates) > 1 else None)
+
+    if stream:
+        stream.close(remove=True)
+
+    if checkpoints_path:
+        clear_checkpoints(checkpoints_path)
@@ -0,0 +1,165 @@
+import os
+import socket
+from time import perf_counter
+
+import pandas as pd
+from tqdm import tqdm
+from loguru import logger
+
+from sierra.run_basin_model import _run_model, add_model_logger, get_results_folders
+from sierra.utilities.shared_tables import share_tables
+from sierra.utilities.job_costs import JobCostEstimator, job_features, load_runtime_history, save_runtimes, \
+    RUNTIME_HISTORY_FILENAME
+
+# scheduler address of an existing dask cluster (e.g., on an HPC system); a local cluster is started otherwise
+SCHEDULER_ENV = 'SIERRA_DASK_SCHEDULER'
+SUMMARY_FILENAME = 'batch_summary.csv'
+
+
+def run_model_task(climate, basin, **kwargs):
+    """
+    Run one model as a dask task. Results are saved by the worker, as with run_model, but errors are raised rather than
+    logged, so that dask can retry the task.
+    :param climate: the climate (or list of climates)
+    :param basin:
+    :param kwargs: arguments to _run_model
+    :return: a summary of the run
+    """
+    handler_id = add_model_logger(climate, basin, kwargs.get('run_name', 'default'))
+    t0 = perf_counter()
+    try:
+        _run_model(climate, basin, **kwargs)
+    except Exception as err:
+        logger.exception(err)
+        logger.error("Failed")
+        raise
+    finally:
+        # workers run many models, so each model's log is closed when it is done
+        if handler_id is not None:
+            logger.remove(handler_id)
+
+    return {
+        'climate': climate if isinstance(climate, str) else '{}_x{}'.format(climate[0], len(climate)),
+        'basin': basin,
+        'seconds': perf_counter() - t0,
+        'worker': '{}:{}'.format(socket.gethostname(), os.getpid())
+    }
+
+
+def get_client(scheduler=None, num_workers=None, memory_limit=None):
+    """
+    Connect to a dask cluster, starting a local cluster if no scheduler is given or set in the environment.
+    :param scheduler: the scheduler address
+    :param num_workers: the number of local workers (one process, with one thread, per model)
+    :param memory_limit: the memory limit of each local worker (e.g., '4GB')
+    :return: the client
+    """
+    from dask.distributed import Client, LocalCluster
+
+    scheduler = scheduler or os.environ.get(SCHEDULER_ENV)
+    if scheduler:
+        if num_workers or memory_limit:
+            logger.warning('Workers and memory limits are set by the cluster at {}'.format(scheduler))
+        return Client(scheduler)
+
+    # models change the working directory and are not thread safe, so each worker is a single-threaded process
+    cluster = LocalCluster(n_workers=num_workers, threads_per_worker=1, processes=True,
+                           memory_limit=memory_limit or 'auto')
+    return Client(cluster)
+
+
+def run_batch(model_args, scheduler=None, num_workers=None, memory_limit=None, retries=1, progress_bar=True,
+              share_inputs=True, **kwargs):
+    """
+    Run a batch of models on a dask cluster, with one task per (climate, basin). Failed tasks are retried, and a summary
+    of all runs (with the run time of each) is logged and saved to the run's results folder.
+
+    Tasks are prioritized longest first, by their estimated runtime (see sierra.utilities.job_costs), so that long
+    runs are not left until the end of the batch; dask's work stealing moves queued tasks to idle workers. Runtimes are
+    added to a history (in the base results folder) that later estimates are based on.
+
+    On a local cluster, climate-independent tables (e.g., energy prices) are loaded once, into shared memory, rather than
+    by each worker (see sierra.utilities.shared_tables).
+    :param model_args: a list of (climate, basin)
+    :param scheduler: the scheduler address of an existing cluster (see get_client)
+    :param num_workers: the number of local workers
+    :param memory_limit: the memory limit of each local worker
+    :param retries: the number of times to retry a failed task
+    :param progress_bar: show the progress of the batch (rather than of each model, as with show_progress)
+    :param share_inputs: share climate-independent tables between local workers
+    :param kwargs: arguments to _run_model
+    :return: the summary, as a DataFrame
+    """
+    from dask.distributed import as_completed
+
+    here = os.path.dirname(os.path.realpath(__file__))
+    base_results_path, run_folder = get_results_folders(kwargs.get('run_name', 'default'),
+                                                        debug=kwargs.get('debug', False),
+                                                        file_suffix=kwargs.get('file_suffix'))
+    history_path = os.path.join(here, base_results_path, RUNTIME_HISTORY_FILENAME)
+
+    # estimate the cost of each job, to run the longest first
+    estimator = JobCostEstimator(load_runtime_history(history_path))
+    jobs = []
+    for climate, basin in model_args:
+        features = job_features(climate, basin, start=kwargs.get('start'), end=kwargs.get('end'),
+                                include_planning=kwargs.get('include_planning', False))
+        jobs.append((climate, basin, features, estimator.estimate(features)))
+    jobs.sort(key=lambda job: job[3], reverse=True)
+
+    # shared memory is only shared by workers on this machine, which must be started after it is created
+    shared_tables = None
+    if share_inputs and not (scheduler or os.environ.get(SCHEDULER_ENV)):
+        basins = sorted(set(basin for climate, basin in model_args))
+        shared_tables = share_tables(basins, kwargs.get('data_path'),
+                                     include_planning=kwargs.get('include_planning', False))
+        kwargs = dict(kwargs, shared_tables=shared_tables.manifest)
+
+    client = get_client(scheduler=scheduler, num_workers=num_workers, memory_limit=memory_limit)
+    logger.info('Running {} models (dashboard: {}), estimated at {:.0f} seconds in total'.format(
+        len(jobs), client.dashboard_link, sum(job[3] for job in jobs)))
+
+    futures = {}
+    for i, job in enumerate(jobs):
+        climate, basin = job[:2]
+        future = client.submit(run_model_task, climate, basin, retries=retries, pure=False, priority=len(jobs) - i,
+                               **kwargs)
+        futures[future] = job
+
+    rows = []
+    runtimes = []
+    t0 = perf_counter()
+    try:
+        for future in tqdm(as_completed(futures), total=len(futures), ncols=60, disable=not progress_bar):
+            climate, basin, features, estimated_seconds = futures[future]
+            try:
+                row = future.result()
+                row['status'] = 'done'
+                runtimes.append(dict(features, run_name=kwargs.get('run_name', 'default'), seconds=row['seconds']))
+                logger.info('Finished {} {} in {:.1f} seconds'.format(basin, row['climate'], row['seconds']))
+            except Exception as err:
+                row = {'climate': str(climate), 'basin': basin, 'seconds': None, 'worker': None, 'status': 'failed',
+                       'error': repr(err)}
+                logger.error('Failed {} {} after {} retries: {}'.format(basin, climate, retries, err))
+            row['estimated_seconds'] = estimated_seconds
+            rows.append(row)
+    finally:
+        client.close()
+        if client.cluster is not None:
+            client.cluster.close()
+        if shared_tables is not None:
+            shared_tables.close()
+        save_runtimes(history_path, runtimes)
+
+    summary = pd.DataFrame(rows, columns=['climate', 'basin', 'status', 'seconds', 'estimated_seconds', 'worker',
+                                         'error'])
+    failed = (summary['status'] == 'failed').sum()
+    logger.info('Ran {} models in {:.1f} seconds ({} failed, {:.1f} seconds of model runs)'.format(
+        len(summary), perf_counter() - t0, failed, summary['seconds'].sum()))
+
+    summary_dir = os.path.join(here, base_results_path, run_folder)
+    if not os.path.exists(summary_dir):
+        os.makedirs(summary_dir)
+    summary.to_csv(os.path.join(summary_dir, SUMMARY_FILENAME), index=False)
+
+    return summary
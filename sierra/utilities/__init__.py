@@ -1,7 +1,8 @@
 from .network import simplify_network
-from .planning import prepare_planning_model
+from .planning import prepare_planning_model, roll_planning_model
 from .schematics import create_schematic
-from .results import save_model_results
+from .results import save_model_results, load_model_results
+from .tables import prepare_tables
 from .tests import check_nan
 
 from .constants import basin_lookup
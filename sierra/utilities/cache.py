@@ -0,0 +1,119 @@
+import os
+import re
+import json
+import time
+import hashlib
+
+here = os.path.dirname(os.path.realpath(__file__))
+
+# modules that transform the base model; changes to these invalidate cached models
+transform_modules = ['documents.py', 'climates.py', 'output_profiles.py', 'network.py', 'planning.py']
+
+# cached models are removed once there are more than this many, or if they have not been used for this many days
+MAX_CACHED_MODELS = 50
+MAX_CACHE_AGE_DAYS = 30
+
+cached_model_pattern = re.compile(r'^pywr_model_([0-9a-f]{64})(_monthly)?\.json$')
+
+
+def model_cache_key(base_path, scenario_paths=None, **inputs):
+    """
+    Create a content-addressed key for a compiled (simplified and/or monthly) model.
+    The key is a hash of the base model file, the scenario definition files, the model transform code and any other
+    inputs (climate, dates, planning months, data path, etc.) that affect the compiled model.
+    :param base_path: path to the base pywr_model.json
+    :param scenario_paths: paths to the scenario definition files applied to the base model, in order
+    :param inputs: other inputs, which must be JSON-serializable
+    :return: the cache key
+    """
+    sha = hashlib.sha256()
+
+    for path in [base_path] + list(scenario_paths or []):
+        with open(path, 'rb') as f:
+            sha.update(f.read())
+
+    for filename in transform_modules:
+        with open(os.path.join(here, filename), 'rb') as f:
+            sha.update(f.read())
+
+    inputs = dict(inputs, SIERRA_DATA_PATH=os.environ.get('SIERRA_DATA_PATH'))
+    sha.update(json.dumps(inputs, sort_keys=True, default=str).encode())
+
+    return sha.hexdigest()
+
+
+def cached_model_paths(cache_dir, cache_key):
+    """
+    Get the paths of the cached daily and monthly model documents for a cache key.
+    Note that cached models should be in the same folder as the model files they replace, so that relative urls are
+    resolved the same way.
+    :param cache_dir:
+    :param cache_key:
+    :return: paths to the daily and monthly model files
+    """
+    model_path = os.path.join(cache_dir, 'pywr_model_{}.json'.format(cache_key))
+    planning_model_path = os.path.join(cache_dir, 'pywr_model_{}_monthly.json'.format(cache_key))
+    return model_path, planning_model_path
+
+
+def save_to_cache(source_path, cache_path):
+    """
+    Copy a compiled model document to the cache. The copy is written to a temporary file first, so that concurrent runs
+    never read a partially written model.
+    :param source_path:
+    :param cache_path:
+    :return:
+    """
+    temp_path = '{}.{}.tmp'.format(cache_path, os.getpid())
+    with open(source_path, 'rb') as src, open(temp_path, 'wb') as dst:
+        dst.write(src.read())
+    os.replace(temp_path, cache_path)
+
+
+def touch_cached_models(cache_dir, cache_key):
+    """
+    Mark the cached models of a cache key as used, so that they are kept when the cache is pruned.
+    :param cache_dir:
+    :param cache_key:
+    :return:
+    """
+    for path in cached_model_paths(cache_dir, cache_key):
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+
+
+def prune_cache(cache_dir, max_models=MAX_CACHED_MODELS, max_age_days=MAX_CACHE_AGE_DAYS):
+    """
+    Remove the least recently used cached models, keeping at most max_models cache keys, none of them older than
+    max_age_days.
+    :param cache_dir:
+    :param max_models:
+    :param max_age_days:
+    :return: the cache keys removed
+    """
+    last_used = {}
+    for filename in os.listdir(cache_dir):
+        match = cached_model_pattern.match(filename)
+        if match is None:
+            continue
+        try:
+            mtime = os.path.getmtime(os.path.join(cache_dir, filename))
+        except OSError:
+            continue
+        key = match.group(1)
+        last_used[key] = max(last_used.get(key, 0), mtime)
+
+    cutoff = time.time() - max_age_days * 24 * 3600
+    keys = sorted(last_used, key=last_used.get, reverse=True)
+    removed = [key for i, key in enumerate(keys) if i >= max_models or last_used[key] < cutoff]
+    for key in removed:
+        for path in cached_model_paths(cache_dir, key):
+            try:
+                os.remove(path)
+            except OSError:
+                # e.g., already removed by another run
+                pass
+
+    return removed
@@ -0,0 +1,206 @@
+import os
+import glob
+import shutil
+import pickle
+import hashlib
+
+import numpy as np
+import pandas as pd
+from pywr._core import AbstractNode, AbstractStorage
+
+STATE_FILENAME = 'state.pkl'
+
+
+def checkpoint_dir(temp_dir, cache_key, **options):
+    """
+    Get the checkpoint folder for a model run.
+    :param temp_dir: the model's temp folder
+    :param cache_key: the model's cache key (see sierra.utilities.cache)
+    :param options: other run options that affect results (e.g., rolling_planning)
+    :return: the folder
+    """
+    sha = hashlib.sha256(cache_key.encode())
+    sha.update(repr(sorted(options.items())).encode())
+    return os.path.join(temp_dir, 'checkpoints', sha.hexdigest()[:16])
+
+
+def clear_checkpoints(path):
+    if os.path.exists(path):
+        shutil.rmtree(path)
+
+
+def _dump(obj, path):
+    temp_path = '{}.{}.tmp'.format(path, os.getpid())
+    with open(temp_path, 'wb') as f:
+        pickle.dump(obj, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(temp_path, path)
+
+
+def _timestamps(index):
+    return index.to_timestamp() if isinstance(index, pd.PeriodIndex) else pd.DatetimeIndex(index)
+
+
+def get_model_state(model):
+    """
+    Get the state of a model: node flows and storage volumes, parameter values and the state of stateful parameters
+    (see WaterLPParameter.get_state).
+    :param model: the Pywr model
+    :return: a dict
+    """
+    nodes = {}
+    for node in model.graph.nodes():
+        node_state = {'prev_flow': node.prev_flow}
+        if isinstance(node, AbstractStorage):
+            node_state['volume'] = np.array(node.volume)
+            node_state['current_pc'] = np.array(node.current_pc)
+        nodes[node.name] = node_state
+
+    parameters = {}
+    for parameter in model.parameters:
+        parameter_state = {'values': np.array(parameter.get_all_values())}
+        if hasattr(parameter, 'get_all_indices'):
+            parameter_state['indices'] = np.array(parameter.get_all_indices())
+        if hasattr(parameter, 'get_state'):
+            parameter_state['state'] = parameter.get_state()
+        parameters[parameter.name] = parameter_state
+
+    return {'nodes': nodes, 'parameters': parameters}
+
+
+def set_model_state(model, state):
+    """
+    Set the state of a model, as returned by get_model_state. The model should already be reset.
+    :param model: the Pywr model
+    :param state:
+    :return:
+    """
+    nodes = {node.name: node for node in model.graph.nodes()}
+    for name, node_state in state['nodes'].items():
+        node = nodes[name]
+
+        # flows can only be set by committing them, which also sets the previous flow after the time step
+        AbstractNode.before(node, None)
+        node.commit_all(np.asarray(node_state['prev_flow'], np.float64))
+        AbstractNode.after(node, None)
+
+        # volumes are arrays that can be written to directly
+        if 'volume' in node_state:
+            np.asarray(node.volume)[:] = node_state['volume']
+            np.asarray(node.current_pc)[:] = node_state['current_pc']
+
+    for name, parameter_state in state['parameters'].items():
+        parameter = model.parameters[name]
+        np.asarray(parameter.get_all_values())[:] = parameter_state['values']
+        if 'indices' in parameter_state:
+            np.asarray(parameter.get_all_indices())[:] = parameter_state['indices']
+        if 'state' in parameter_state:
+            parameter.set_state(parameter_state['state'])
+
+
+def _recorder_results(model, recorder, start, stop):
+    """
+    Get the results of a recorder for a range of timesteps, without building a DataFrame of the whole run.
+    :param model: the Pywr model
+    :param recorder: a daily (NumpyArray*) recorder, or a recorder with a TemporalAggregation
+    :param start: the index of the first timestep
+    :param stop: the index after the last timestep
+    :return: a DataFrame, as a slice of the recorder's to_dataframe
+    """
+    aggregation = getattr(recorder, 'aggregation', None)
+    if aggregation is not None:
+        index, values = aggregation.period_values(start, stop)
+    else:
+        index = model.timestepper.datetime_index[start:stop]
+        values = np.asarray(recorder.data)[start:stop]
+    return pd.DataFrame(data=values, index=index, columns=model.scenarios.multiindex)
+
+
+def save_checkpoint(path, model, date, prev_date=None):
+    """
+    Save a checkpoint of a model run, after the model is stepped to (and including) a date.
+
+    The state of the daily model (and the planning model, if any) replaces any previous state. Since recorder arrays
+    cover the whole run, only the recorder results since the previous checkpoint are saved, to a separate file for each
+    checkpoint. These are sliced from the recorders' arrays, so the cost of a checkpoint does not grow with the length
+    of the run.
+    :param path: the checkpoint folder
+    :param model: the daily model
+    :param date: the date of the last time step run
+    :param prev_date: the date of the previous checkpoint, if any
+    :return:
+    """
+    if not os.path.exists(path):
+        os.makedirs(path)
+
+    date = pd.Timestamp(date)
+
+    # only the timesteps since the previous checkpoint are read from recorders
+    timestep_dates = _timestamps(model.timestepper.datetime_index)
+    start = timestep_dates.searchsorted(pd.Timestamp(prev_date), side='right') if prev_date is not None else 0
+    stop = timestep_dates.searchsorted(date, side='right')
+
+    results = {}
+    for recorder in model.recorders:
+        if not hasattr(recorder, 'to_dataframe') or not hasattr(recorder, 'data'):
+            continue
+        df = _recorder_results(model, recorder, start, stop)
+        dates = _timestamps(df.index)
+        rows = dates <= date
+        if prev_date is not None:
+            rows &= dates > pd.Timestamp(prev_date)
+        results[recorder.name] = df[rows]
+    _dump(results, os.path.join(path, 'results_{}.pkl'.format(date.strftime('%Y-%m-%d'))))
+
+    state = {
+        'date': date,
+        'daily': get_model_state(model),
+        'planning': get_model_state(model.planning) if model.planning else None
+    }
+    _dump(state, os.path.join(path, STATE_FILENAME))
+
+
+def load_checkpoint(path):
+    """
+    Load the latest checkpoint of a model run.
+    :param path: the checkpoint folder
+    :return: the checkpoint state and the recorder results to date, or None if there is no checkpoint
+    """
+    state_path = os.path.join(path, STATE_FILENAME)
+    if not os.path.exists(state_path):
+        return None, None
+
+    with open(state_path, 'rb') as f:
+        state = pickle.load(f)
+
+    results = {}
+    for results_path in sorted(glob.glob(os.path.join(path, 'results_*.pkl'))):
+        date = pd.Timestamp(os.path.basename(results_path)[8:18])
+        if date > state['date']:
+            continue
+        with open(results_path, 'rb') as f:
+            for name, df in pickle.load(f).items():
+                results.setdefault(name, []).append(df)
+    results = {name: pd.concat(dfs) for name, dfs in results.items()}
+
+    return state, results
+
+
+def resume_model(model, state, results):
+    """
+    Restore a model run from a checkpoint. The daily model is reset to start the day after the checkpoint, and
+    recorder results to date are kept as model.resumed_results, to be combined with the results of the rest of the
+    run when saved (see sierra.utilities.results).
+
+    Parameters that read recorder results during the run only see results since the checkpoint.
+    :param model: the daily model, which should be set up
+    :param state:
+    :param results:
+    :return: the date to resume from
+    """
+    start = state['date'] + pd.DateOffset(days=1)
+    model.reset(start=start)
+    set_model_state(model, state['daily'])
+    if model.planning and state['planning']:
+        set_model_state(model.planning, state['planning'])
+    model.resumed_results = results
+    return start
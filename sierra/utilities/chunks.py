@@ -0,0 +1,100 @@
+import numpy as np
+import pandas as pd
+
+
+def water_year_chunks(start, end, num_chunks, spinup_years=2):
+    """
+    Split a run into chunks of whole water years, to be run in parallel.
+
+    Each chunk is run from spinup_years before its first water year (or from the start of the run), so that storage
+    and other model state are approximately what they would be in a single run of the whole period. Results from the
+    spin-up years are discarded when chunks are stitched together (see stitch_chunk_results).
+    :param start: the run start date (the first day of a water year, e.g. 1950-10-01)
+    :param end: the run end date (the last day of a water year, e.g. 2012-09-30)
+    :param num_chunks: the number of chunks (reduced, if there are fewer water years)
+    :param spinup_years: the number of water years to run before each chunk
+    :return: a list of dicts with the chunk's 'start' and 'end' dates and the 'run_start' date, as Timestamps
+    """
+    start = pd.Timestamp(start)
+    end = pd.Timestamp(end)
+    first_wy = start.year + 1 if start.month >= 10 else start.year
+    last_wy = end.year + 1 if end.month >= 10 else end.year
+    water_years = np.arange(first_wy, last_wy + 1)
+    num_chunks = max(min(num_chunks, len(water_years)), 1)
+
+    chunks = []
+    for years in np.array_split(water_years, num_chunks):
+        chunk_start = max(pd.Timestamp(int(years[0]) - 1, 10, 1), start)
+        chunk_end = min(pd.Timestamp(int(years[-1]), 9, 30), end)
+        run_start = max(pd.Timestamp(int(years[0]) - 1 - spinup_years, 10, 1), start)
+        chunks.append({'start': chunk_start, 'end': chunk_end, 'run_start': run_start})
+
+    return chunks
+
+
+def _timestamps(index):
+    return index.to_timestamp() if isinstance(index, pd.PeriodIndex) else pd.DatetimeIndex(index)
+
+
+def trim_chunk_results(results, start, end=None):
+    """
+    Drop spin-up (and any trailing) rows from a chunk's recorder results.
+    :param results: a dict of recorder DataFrames
+    :param start: the first date to keep
+    :param end: the last date to keep
+    :return: a dict of recorder DataFrames, with Timestamp indexes
+    """
+    trimmed = {}
+    for name, df in results.items():
+        df = df.copy()
+        df.index = _timestamps(df.index)
+        rows = df.index >= pd.Timestamp(start)
+        if end is not None:
+            rows &= df.index <= pd.Timestamp(end)
+        trimmed[name] = df[rows]
+    return trimmed
+
+
+def stitch_chunk_results(chunk_results):
+    """
+    Stitch together the (trimmed) recorder results of consecutive chunks.
+    :param chunk_results: a list of dicts of recorder DataFrames, in chunk order
+    :return: a dict of recorder DataFrames, in the recorder order of the first chunk
+    """
+    return {name: pd.concat([results[name] for results in chunk_results]) for name in chunk_results[0]}
+
+
+def boundary_discrepancies(chunks, chunk_results, attr='storage'):
+    """
+    Compare results of consecutive chunks on the last day before each chunk boundary, where both chunks have results:
+    the earlier chunk's results are from the run up to the boundary, and the later chunk's are from its spin-up. Large
+    differences (e.g., in storage) mean that the spin-up is too short for the later chunk's initial state to converge.
+
+    The later chunk's results must include the day before its start (see trim_chunk_results).
+    :param chunks: the chunks (see water_year_chunks)
+    :param chunk_results: a list of dicts of recorder DataFrames, in chunk order
+    :param attr: the recorder attribute to compare
+    :return: a DataFrame of the largest absolute difference per recorder and boundary
+    """
+    rows = []
+    for i in range(1, len(chunks)):
+        date = chunks[i]['start'] - pd.DateOffset(days=1)
+        prev_results = chunk_results[i - 1]
+        results = chunk_results[i]
+        for name, df in results.items():
+            if not name.endswith('/' + attr) or name not in prev_results:
+                continue
+            prev_df = prev_results[name]
+            if date not in df.index or date not in prev_df.index:
+                continue
+            prev_values = prev_df.loc[date].values
+            values = df.loc[date].values
+            difference = np.abs(values - prev_values).max()
+            rows.append({
+                'boundary': chunks[i]['start'].strftime('%Y-%m-%d'),
+                'recorder': name,
+                'max_abs_difference': difference,
+                'max_rel_difference': difference / max(np.abs(prev_values).max(), 1e-6)
+            })
+
+    return pd.DataFrame(rows, columns=['boundary', 'recorder', 'max_abs_difference', 'max_rel_difference'])
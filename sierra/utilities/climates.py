@@ -0,0 +1,86 @@
+from sierra.utilities.hydrology_store import load_dataframe
+
+CLIMATE_SCENARIO = 'climate'
+
+# parameter types that can read one input per climate
+climate_parameter_types = ['dataframe', 'hydrologydataframe', 'inflowdataframe']
+
+
+def climate_dates(climate):
+    """
+    Get the default start and end dates for a climate.
+    :param climate: the climate, as <climate set>/<climate scenario> (e.g., historical/Livneh)
+    :return: the start and end dates, as YYYY-MM-DD strings
+    """
+    climate_set, climate_scenario = climate.split('/')
+
+    # TODO: get start and end years from outside, not hard coded
+    if climate_scenario == 'Livneh':
+        start_year = 1950
+        end_year = 2012
+    elif climate_set == 'gcms':
+        start_year = 2030
+        end_year = 2060
+    elif climate_set == 'sequences':
+        # name format is N01_S01, where N01 refers to the number of drought years
+        # the total number of years is 1 + N + 2 (1 year at the end as a buffer)
+        N = int(climate_scenario.split('Y')[1].split('_')[0])
+        start_year = 2000
+        end_year = start_year + N
+    else:
+        raise Exception("Climate scenario unknown")
+
+    return '{}-10-01'.format(start_year), '{}-09-30'.format(end_year)
+
+
+def add_climate_scenario(m, climates):
+    """
+    Add climates to a model document as a scenario, so that one model runs all climates together.
+
+    Urls in the model document should already point to the first climate. Climate-dependent dataframe parameters are
+    converted to InflowDataframe parameters that read one input per climate. This can be applied more than once (e.g.,
+    after the planning model is created), in which case the climate urls are updated from the current urls.
+    :param m: the model document
+    :param climates: the climates, as <climate set>/<climate scenario>
+    :return: the model document
+    """
+    scenarios = m.setdefault('scenarios', [])
+    if CLIMATE_SCENARIO not in [s['name'] for s in scenarios]:
+        scenarios.append({'name': CLIMATE_SCENARIO, 'size': len(climates), 'ensemble_names': climates})
+
+    for param in m.get('parameters', {}).values():
+        url = param.get('url')
+        if not url or climates[0] not in url:
+            continue
+        if param.get('type', '').lower() not in climate_parameter_types:
+            raise Exception('Parameter type {} cannot be run with climate scenarios'.format(param.get('type')))
+        param['type'] = 'InflowDataframe'
+        param['climate_urls'] = [url.replace(climates[0], climate) for climate in climates]
+        param['scenario'] = CLIMATE_SCENARIO
+
+    return m
+
+
+def load_climate_tables(model, m, climates):
+    """
+    Load the climate-dependent tables of a model for each climate.
+
+    Pywr loads tables for the first climate only, so the tables for the other climates are loaded here. Parameters
+    get the table for a scenario's climate with WaterLPParameter.climate_table.
+    :param model: the Pywr model, which should have a climate scenario
+    :param m: the model document
+    :param climates: the climates, as <climate set>/<climate scenario>
+    :return:
+    """
+    model.climates = climates
+    model.climate_scenario = [s.name for s in model.scenarios.scenarios].index(CLIMATE_SCENARIO)
+    model.climate_tables = {}
+    for name, table in m.get('tables', {}).items():
+        url = table.get('url')
+        if not url or climates[0] not in url:
+            continue
+        tables = [model.tables[name]]
+        for climate in climates[1:]:
+            tables.append(load_dataframe(model, dict(table, url=url.replace(climates[0], climate))))
+        model.climate_tables[name] = tables
+
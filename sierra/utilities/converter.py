@@ -1,2344 +1,102 @@
-units = {
-    "%": {
-        "cf": 0.0,
-        "dim": "dimensionless",
-        "lf": 0.01
-    },
-    "'": {
-        "cf": 0.0,
-        "dim": "Angle",
-        "lf": 0.0166666666
-    },
-    "''": {
-        "cf": 0.0,
-        "dim": "Angle",
-        "lf": 0.00027777777778
-    },
-    "-": {
-        "cf": 0.0,
-        "dim": "dimensionless",
-        "lf": 1.0
-    },
-    "AU": {
-        "cf": 0.0,
-        "dim": "Length",
-        "lf": 149598550000.0
-    },
-    "BTU": {
-        "cf": 0.0,
-        "dim": "Energy",
-        "lf": 1055.056
-    },
-    "BTU h^-1": {
-        "cf": 0.0,
-        "dim": "Power",
-        "lf": 0.29301067
-    },
-    "BTU min^-1": {
-        "cf": 0.0,
-        "dim": "Power",
-        "lf": 17.56863
-    },
-    "BTU s^-1": {
-        "cf": 0.0,
-        "dim": "Power",
-        "lf": 1055.056
-    },
-    "BTU(IT)": {
-        "cf": 0.0,
-        "dim": "Energy",
-        "lf": 1055.056
-    },
-    "BTU/hour": {
-        "cf": 0.0,
-        "dim": "Power",
-        "lf": 0.29301067
-    },
-    "BTU/minutes": {
-        "cf": 0.0,
-        "dim": "Power",
-        "lf": 17.56863
-    },
-    "BTU/seconds": {
-        "cf": 0.0,
-        "dim": "Power",
-        "lf": 1055.056
-    },
-    "Celsius": {
-        "cf": 273.15,
-        "dim": "Temperature",
-        "lf": 1.0
-    },
-    "Delisle": {
-        "cf": 373.15,
-        "dim": "Temperature",
-        "lf": -0.6666666666666666
-    },
-    "Fahrenheit": {
-        "cf": 255.37222222222223,
-        "dim": "Temperature",
-        "lf": 0.5555555555555556
-    },
-    "GBP": {
-        "cf": 0.0,
-        "dim": "Monetary value",
-        "lf": 0.66
-    },
-    "GBP J^-1": {
-        "cf": 0.0,
-        "dim": "Energy price",
-        "lf": 0.66
-    },
-    "GBP Ml^-1": {
-        "cf": 6.6e-05,
-        "dim": "Unit price (volume)",
-        "lf": 0.0
-    },
-    "GBP day^-1": {
-        "cf": 0.0,
-        "dim": "Specific cost (time)",
-        "lf": 7.639e-06
-    },
-    "GBP h^-1": {
-        "cf": 0.0,
-        "dim": "Specific cost (time)",
-        "lf": 0.000183333
-    },
-    "GBP kJ^-1": {
-        "cf": 0.0,
-        "dim": "Energy price",
-        "lf": 0.0066
-    },
-    "GBP kWh^-1": {
-        "cf": 0.0,
-        "dim": "Energy price",
-        "lf": 1.8333333282e-07
-    },
-    "GBP kg^-1": {
-        "cf": 0.66,
-        "dim": "Unit price (mass)",
-        "lf": 0.66
-    },
-    "GBP m^-3": {
-        "cf": 0.66,
-        "dim": "Unit price (volume)",
-        "lf": 0.0
-    },
-    "GBP min^-1": {
-        "cf": 0.0,
-        "dim": "Specific cost (time)",
-        "lf": 0.011
-    },
-    "GBP mon^-1": {
-        "cf": 0.0,
-        "dim": "Specific cost (time)",
-        "lf": 2.50975e-07
-    },
-    "GBP s^-1": {
-        "cf": 0.0,
-        "dim": "Specific cost (time)",
-        "lf": 0.66
-    },
-    "GBP t^-1": {
-        "cf": 0.66,
-        "dim": "Unit price (mass)",
-        "lf": 0.00066
-    },
-    "GBP yr^-1": {
-        "cf": 0.0,
-        "dim": "Specific cost (time)",
-        "lf": 2.091458464e-08
-    },
-    "GJ": {
-        "cf": 0.0,
-        "dim": "Energy",
-        "lf": 1000000000.0
-    },
-    "GW": {
-        "cf": 0.0,
-        "dim": "Power",
-        "lf": 1000000000.0
-    },
-    "GWh": {
-        "cf": 0.0,
-        "dim": "Energy",
-        "lf": 3600000000000.0
-    },
-    "Gigawatt-hour": {
-        "cf": 0.0,
-        "dim": "Energy",
-        "lf": 3600000000000.0
-    },
-    "J": {
-        "cf": 0.0,
-        "dim": "Energy",
-        "lf": 1.0
-    },
-    "J m^-1": {
-        "cf": 0.0,
-        "dim": "Force",
-        "lf": 1.0
-    },
-    "K": {
-        "cf": 0.0,
-        "dim": "Temperature",
-        "lf": 1.0
-    },
-    "Kelvin": {
-        "cf": 0.0,
-        "dim": "Temperature",
-        "lf": 1.0
-    },
-    "MJ": {
-        "cf": 0.0,
-        "dim": "Energy",
-        "lf": 1000000.0
-    },
-    "MW": {
-        "cf": 0.0,
-        "dim": "Power",
-        "lf": 1000000.0
-    },
-    "MWh": {
-        "cf": 0.0,
-        "dim": "Energy",
-        "lf": 3600000000.0
-    },
-    "Megawatt-hour": {
-        "cf": 0.0,
-        "dim": "Energy",
-        "lf": 3600000000.0
-    },
-    "Ml": {
-        "cf": 0.0,
-        "dim": "Volume",
-        "lf": 1000.0
-    },
-    "Ml day^-1": {
-        "cf": 0.0,
-        "dim": "Volumetric flow rate",
-        "lf": 0.0115740741
-    },
-    "Ml h^-1": {
-        "cf": 0.0,
-        "dim": "Volumetric flow rate",
-        "lf": 0.277777778
-    },
-    "Ml min^-1": {
-        "cf": 0.0,
-        "dim": "Volumetric flow rate",
-        "lf": 1.66666667
-    },
-    "Ml mon^-1": {
-        "cf": 0.0,
-        "dim": "Volumetric flow rate",
-        "lf": 0.000380265176
-    },
-    "Ml s^-1": {
-        "cf": 0.0,
-        "dim": "Volumetric flow rate",
-        "lf": 1000.0
-    },
-    "N": {
-        "cf": 0.0,
-        "dim": "Force",
-        "lf": 1.0
-    },
-    "No unit": {
-        "cf": 0.0,
-        "dim": "dimensionless",
-        "lf": 1.0
-    },
-    "Pa": {
-        "cf": 0.0,
-        "dim": "Pressure",
-        "lf": 1.0
-    },
-    "Percent": {
-        "cf": 0.0,
-        "dim": "dimensionless",
-        "lf": 0.01
-    },
-    "Pound Sterling": {
-        "cf": 0.0,
-        "dim": "Monetary value",
-        "lf": 0.66
-    },
-    "Pound Sterling per cubic metre": {
-        "cf": 0.66,
-        "dim": "Unit price (volume)",
-        "lf": 0.0
-    },
-    "Pound Sterling per day": {
-        "cf": 0.0,
-        "dim": "Specific cost (time)",
-        "lf": 7.639e-06
-    },
-    "Pound Sterling per hour": {
-        "cf": 0.0,
-        "dim": "Specific cost (time)",
-        "lf": 0.000183333
-    },
-    "Pound Sterling per joule": {
-        "cf": 0.0,
-        "dim": "Energy price",
-        "lf": 0.66
-    },
-    "Pound Sterling per kilojoule": {
-        "cf": 0.0,
-        "dim": "Energy price",
-        "lf": 0.0066
-    },
-    "Pound Sterling per kilowatt-hour": {
-        "cf": 0.0,
-        "dim": "Energy price",
-        "lf": 1.8333333282e-07
-    },
-    "Pound Sterling per megalitre": {
-        "cf": 6.6e-05,
-        "dim": "Unit price (volume)",
-        "lf": 0.0
-    },
-    "Pound Sterling per minute": {
-        "cf": 0.0,
-        "dim": "Specific cost (time)",
-        "lf": 0.011
-    },
-    "Pound Sterling per month": {
-        "cf": 0.0,
-        "dim": "Specific cost (time)",
-        "lf": 2.50975e-07
-    },
-    "Pound Sterling per second": {
-        "cf": 0.0,
-        "dim": "Specific cost (time)",
-        "lf": 0.66
-    },
-    "Pound Sterling per year": {
-        "cf": 0.0,
-        "dim": "Specific cost (time)",
-        "lf": 2.091458464e-08
-    },
-    "Pounds Sterling per kilogram": {
-        "cf": 0.66,
-        "dim": "Unit price (mass)",
-        "lf": 0.66
-    },
-    "Pounds Sterling per tonne": {
-        "cf": 0.66,
-        "dim": "Unit price (mass)",
-        "lf": 0.00066
-    },
-    "Rankine": {
-        "cf": 0.0,
-        "dim": "Temperature",
-        "lf": 0.5555555555555556
-    },
-    "Réaumur": {
-        "cf": 273.15,
-        "dim": "Temperature",
-        "lf": 1.25
-    },
-    "Rømer": {
-        "cf": 258.8642857142857,
-        "dim": "Temperature",
-        "lf": 1.9047619047619047
-    },
-    "US Dollar": {
-        "cf": 0.0,
-        "dim": "Monetary value",
-        "lf": 1.0
-    },
-    "US Dollar per acre-foot": {
-        "cf": 0.0,
-        "dim": "Unit price (volume)",
-        "lf": 0.000810713194
-    },
-    "US Dollar per cubic metre": {
-        "cf": 0.0,
-        "dim": "Unit price (volume)",
-        "lf": 1.0
-    },
-    "US Dollar per day": {
-        "cf": 0.0,
-        "dim": "Specific cost (time)",
-        "lf": 1.15740741e-05
-    },
-    "US Dollar per hour": {
-        "cf": 0.0,
-        "dim": "Specific cost (time)",
-        "lf": 0.000277777778
-    },
-    "US Dollar per kilogram": {
-        "cf": 0.0,
-        "dim": "Unit price (mass)",
-        "lf": 1.0
-    },
-    "US Dollar per megalitre": {
-        "cf": 0.0,
-        "dim": "Unit price (volume)",
-        "lf": 0.0001
-    },
-    "US Dollar per minute": {
-        "cf": 0.0,
-        "dim": "Specific cost (time)",
-        "lf": 0.0166666667
-    },
-    "US Dollar per month": {
-        "cf": 0.0,
-        "dim": "Specific cost (time)",
-        "lf": 3.80265176e-07
-    },
-    "US Dollar per second": {
-        "cf": 0.0,
-        "dim": "Specific cost (time)",
-        "lf": 1.0
-    },
-    "US Dollar per tonne": {
-        "cf": 0.0,
-        "dim": "Unit price (mass)",
-        "lf": 0.001
-    },
-    "US Dollar per year": {
-        "cf": 0.0,
-        "dim": "Specific cost (time)",
-        "lf": 3.16887646e-08
-    },
-    "US Dollars per joule": {
-        "cf": 0.0,
-        "dim": "Energy price",
-        "lf": 1.0
-    },
-    "US Dollars per kilojoule": {
-        "cf": 0.0,
-        "dim": "Energy price",
-        "lf": 0.001
-    },
-    "US Dollars per kilowatt-hour": {
-        "cf": 0.0,
-        "dim": "Energy price",
-        "lf": 2.77777777e-07
-    },
-    "USD": {
-        "cf": 0.0,
-        "dim": "Monetary value",
-        "lf": 1.0
-    },
-    "USD J^-1": {
-        "cf": 0.0,
-        "dim": "Energy price",
-        "lf": 1.0
-    },
-    "USD Ml^-1": {
-        "cf": 0.0,
-        "dim": "Unit price (volume)",
-        "lf": 0.0001
-    },
-    "USD ac-ft^-1": {
-        "cf": 0.0,
-        "dim": "Unit price (volume)",
-        "lf": 0.000810713194
-    },
-    "USD day^-1": {
-        "cf": 0.0,
-        "dim": "Specific cost (time)",
-        "lf": 1.15740741e-05
-    },
-    "USD h^-1": {
-        "cf": 0.0,
-        "dim": "Specific cost (time)",
-        "lf": 0.000277777778
-    },
-    "USD kJ^-1": {
-        "cf": 0.0,
-        "dim": "Energy price",
-        "lf": 0.001
-    },
-    "USD kWh^-1": {
-        "cf": 0.0,
-        "dim": "Energy price",
-        "lf": 2.77777777e-07
-    },
-    "USD kg^-1": {
-        "cf": 0.0,
-        "dim": "Unit price (mass)",
-        "lf": 1.0
-    },
-    "USD m^-3": {
-        "cf": 0.0,
-        "dim": "Unit price (volume)",
-        "lf": 1.0
-    },
-    "USD min^-1": {
-        "cf": 0.0,
-        "dim": "Specific cost (time)",
-        "lf": 0.0166666667
-    },
-    "USD mon^-1": {
-        "cf": 0.0,
-        "dim": "Specific cost (time)",
-        "lf": 3.80265176e-07
-    },
-    "USD s^-1": {
-        "cf": 0.0,
-        "dim": "Specific cost (time)",
-        "lf": 1.0
-    },
-    "USD t^-1": {
-        "cf": 0.0,
-        "dim": "Unit price (mass)",
-        "lf": 0.001
-    },
-    "USD yr^-1": {
-        "cf": 0.0,
-        "dim": "Specific cost (time)",
-        "lf": 3.16887646e-08
-    },
-    "VA": {
-        "cf": 0.0,
-        "dim": "Power",
-        "lf": 1.0
-    },
-    "W": {
-        "cf": 0.0,
-        "dim": "Power",
-        "lf": 1.0
-    },
-    "Wh": {
-        "cf": 0.0,
-        "dim": "Energy",
-        "lf": 3600.0
-    },
-    "a": {
-        "cf": 0.0,
-        "dim": "Area",
-        "lf": 100.0
-    },
-    "ac": {
-        "cf": 0.0,
-        "dim": "Area",
-        "lf": 4046.8564224
-    },
-    "ac (US)": {
-        "cf": 0.0,
-        "dim": "Area",
-        "lf": 4046.87261
-    },
-    "ac-ft": {
-        "cf": 0.0,
-        "dim": "Volume",
-        "lf": 1233.48184
-    },
-    "ac-ft day^-1": {
-        "cf": 0.0,
-        "dim": "Volumetric flow rate",
-        "lf": 0.0142764102
-    },
-    "ac-ft h^-1": {
-        "cf": 0.0,
-        "dim": "Volumetric flow rate",
-        "lf": 0.342633844
-    },
-    "ac-ft min^-1": {
-        "cf": 0.0,
-        "dim": "Volumetric flow rate",
-        "lf": 20.5580306
-    },
-    "ac-ft mon^-1": {
-        "cf": 0.0,
-        "dim": "Volumetric flow rate",
-        "lf": 0.000469050188
-    },
-    "ac-ft s^-1": {
-        "cf": 0.0,
-        "dim": "Volumetric flow rate",
-        "lf": 1233.48184
-    },
-    "ac-in": {
-        "cf": 0.0,
-        "dim": "Volume",
-        "lf": 0.102790153
-    },
-    "ac-in day^-1": {
-        "cf": 0.0,
-        "dim": "Volumetric flow rate",
-        "lf": 0.00118970085
-    },
-    "ac-in h^-1": {
-        "cf": 0.0,
-        "dim": "Volumetric flow rate",
-        "lf": 0.0285528203
-    },
-    "ac-in min^-1": {
-        "cf": 0.0,
-        "dim": "Volumetric flow rate",
-        "lf": 1.71316922
-    },
-    "ac-in mon^-1": {
-        "cf": 0.0,
-        "dim": "Volumetric flow rate",
-        "lf": 3.90875157e-05
-    },
-    "ac-in s^-1": {
-        "cf": 0.0,
-        "dim": "Volumetric flow rate",
-        "lf": 102.790153
-    },
-    "acre": {
-        "cf": 0.0,
-        "dim": "Area",
-        "lf": 4046.8564224
-    },
-    "acre(US)": {
-        "cf": 0.0,
-        "dim": "Area",
-        "lf": 4046.87261
-    },
-    "acre-foot": {
-        "cf": 0.0,
-        "dim": "Volume",
-        "lf": 1233.48184
-    },
-    "acre-foot per day": {
-        "cf": 0.0,
-        "dim": "Volumetric flow rate",
-        "lf": 0.0142764102
-    },
-    "acre-foot per hour": {
-        "cf": 0.0,
-        "dim": "Volumetric flow rate",
-        "lf": 0.342633844
-    },
-    "acre-foot per minute": {
-        "cf": 0.0,
-        "dim": "Volumetric flow rate",
-        "lf": 20.5580306
-    },
-    "acre-foot per month": {
-        "cf": 0.0,
-        "dim": "Volumetric flow rate",
-        "lf": 0.000469050188
-    },
-    "acre-foot per second": {
-        "cf": 0.0,
-        "dim": "Volumetric flow rate",
-        "lf": 1233.48184
-    },
-    "acre-inch": {
-        "cf": 0.0,
-        "dim": "Volume",
-        "lf": 0.102790153
-    },
-    "acre-inch per day": {
-        "cf": 0.0,
-        "dim": "Volumetric flow rate",
-        "lf": 0.00118970085
-    },
-    "acre-inch per hour": {
-        "cf": 0.0,
-        "dim": "Volumetric flow rate",
-        "lf": 0.0285528203
-    },
-    "acre-inch per minute": {
-        "cf": 0.0,
-        "dim": "Volumetric flow rate",
-        "lf": 1.71316922
-    },
-    "acre-inch per month": {
-        "cf": 0.0,
-        "dim": "Volumetric flow rate",
-        "lf": 3.90875157e-05
-    },
-    "acre-inch per second": {
-        "cf": 0.0,
-        "dim": "Volumetric flow rate",
-        "lf": 102.790153
-    },
-    "angström": {
-        "cf": 0.0,
-        "dim": "Length",
-        "lf": 1e-10
-    },
-    "are": {
-        "cf": 0.0,
-        "dim": "Area",
-        "lf": 100.0
-    },
-    "astronomical unit": {
-        "cf": 0.0,
-        "dim": "Length",
-        "lf": 149598550000.0
-    },
-    "at": {
-        "cf": 0.0,
-        "dim": "Pressure",
-        "lf": 98066.5
-    },
-    "atm": {
-        "cf": 0.0,
-        "dim": "Pressure",
-        "lf": 101325.0
-    },
-    "atmosphere": {
-        "cf": 0.0,
-        "dim": "Pressure",
-        "lf": 101325.0
-    },
-    "bar": {
-        "cf": 0.0,
-        "dim": "Pressure",
-        "lf": 100000.0
-    },
-    "barrel(oil)": {
-        "cf": 0.0,
-        "dim": "Volume",
-        "lf": 0.158987295
-    },
-    "barrel(oil) per day": {
-        "cf": 0.0,
-        "dim": "Volumetric flow rate",
-        "lf": 0.158987295
-    },
-    "bbl": {
-        "cf": 0.0,
-        "dim": "Volume",
-        "lf": 0.158987295
-    },
-    "bbl day^-1": {
-        "cf": 0.0,
-        "dim": "Volumetric flow rate",
-        "lf": 0.158987295
-    },
-    "c": {
-        "cf": 0.0,
-        "dim": "Speed",
-        "lf": 299792458.0
-    },
-    "cal": {
-        "cf": 0.0,
-        "dim": "Energy",
-        "lf": 4.1868
-    },
-    "cal s^-1": {
-        "cf": 0.0,
-        "dim": "Power",
-        "lf": 4.183076
-    },
-    "calorie(IT)": {
-        "cf": 0.0,
-        "dim": "Energy",
-        "lf": 4.1868
-    },
-    "calorie/seconds": {
-        "cf": 0.0,
-        "dim": "Power",
-        "lf": 4.183076
-    },
-    "carat": {
-        "cf": 0.0,
-        "dim": "Mass",
-        "lf": 0.0002
-    },
-    "centilitre": {
-        "cf": 0.0,
-        "dim": "Volume",
-        "lf": 1e-05
-    },
-    "centimetre": {
-        "cf": 0.0,
-        "dim": "Length",
-        "lf": 0.01
-    },
-    "cl": {
-        "cf": 0.0,
-        "dim": "Volume",
-        "lf": 1e-05
-    },
-    "cm": {
-        "cf": 0.0,
-        "dim": "Length",
-        "lf": 0.01
-    },
-    "cm^3": {
-        "cf": 0.0,
-        "dim": "Volume",
-        "lf": 1e-06
-    },
-    "cubic centimetre": {
-        "cf": 0.0,
-        "dim": "Volume",
-        "lf": 1e-06
-    },
-    "cubic decimetre": {
-        "cf": 0.0,
-        "dim": "Volume",
-        "lf": 0.001
-    },
-    "cubic foot": {
-        "cf": 0.0,
-        "dim": "Volume",
-        "lf": 0.028316846592
-    },
-    "cubic foot per day": {
-        "cf": 0.0,
-        "dim": "Volumetric flow rate",
-        "lf": 3.2774128e-07
-    },
-    "cubic foot per hour": {
-        "cf": 0.0,
-        "dim": "Volumetric flow rate",
-        "lf": 7.86579072e-06
-    },
-    "cubic foot per minute": {
-        "cf": 0.0,
-        "dim": "Volumetric flow rate",
-        "lf": 0.000471947443
-    },
-    "cubic foot per month": {
-        "cf": 0.0,
-        "dim": "Volumetric flow rate",
-        "lf": 1.07679106e-08
-    },
-    "cubic foot per second": {
-        "cf": 0.0,
-        "dim": "Volumetric flow rate",
-        "lf": 0.0283168466
-    },
-    "cfs": {
-        "cf": 0.0,
-        "dim": "Volumetric flow rate",
-        "lf": 0.0283168466
-    },
-    "cubic hectometre": {
-        "cf": 0.0,
-        "dim": "Volume",
-        "lf": 1000000.0
-    },
-    "cubic hectometres per day": {
-        "cf": 0.0,
-        "dim": "Volumetric flow rate",
-        "lf": 11.5740741
-    },
-    "cubic hectometres per hour": {
-        "cf": 0.0,
-        "dim": "Volumetric flow rate",
-        "lf": 277.777778
-    },
-    "cubic hectometres per minute": {
-        "cf": 0.0,
-        "dim": "Volumetric flow rate",
-        "lf": 16666.6667
-    },
-    "cubic hectometres per month": {
-        "cf": 0.0,
-        "dim": "Volumetric flow rate",
-        "lf": 0.380265176
-    },
-    "cubic hectometres per second": {
-        "cf": 0.0,
-        "dim": "Volumetric flow rate",
-        "lf": 1000000.0
-    },
-    "cubic inch": {
-        "cf": 0.0,
-        "dim": "Volume",
-        "lf": 1.6387064e-05
-    },
-    "cubic metre": {
-        "cf": 0.0,
-        "dim": "Volume",
-        "lf": 1.0
-    },
-    "cubic metres per day": {
-        "cf": 0.0,
-        "dim": "Volumetric flow rate",
-        "lf": 1.15740741e-05
-    },
-    "cubic metres per hour": {
-        "cf": 0.0,
-        "dim": "Volumetric flow rate",
-        "lf": 0.000277777778
-    },
-    "cubic metres per minute": {
-        "cf": 0.0,
-        "dim": "Volumetric flow rate",
-        "lf": 0.0166666667
-    },
-    "cubic metres per month": {
-        "cf": 0.0,
-        "dim": "Volumetric flow rate",
-        "lf": 3.80265176e-07
-    },
-    "cubic metres per second": {
-        "cf": 0.0,
-        "dim": "Volumetric flow rate",
-        "lf": 1.0
-    },
-    "cms": {
-        "cf": 0.0,
-        "dim": "Volumetric flow rate",
-        "lf": 1.0
-    },
-    "cubic millimetre": {
-        "cf": 0.0,
-        "dim": "Volume",
-        "lf": 1e-09
-    },
-    "cubic yard": {
-        "cf": 0.0,
-        "dim": "Volume",
-        "lf": 0.764554857984
-    },
-    "date": {
-        "cf": 0.0,
-        "dim": "dimensionless",
-        "lf": 1.0
-    },
-    "day": {
-        "cf": 0.0,
-        "dim": "Time",
-        "lf": 86400.0
-    },
-    "decilitre": {
-        "cf": 0.0,
-        "dim": "Volume",
-        "lf": 0.0001
-    },
-    "decimetre": {
-        "cf": 0.0,
-        "dim": "Length",
-        "lf": 0.1
-    },
-    "degree": {
-        "cf": 0.0,
-        "dim": "Angle",
-        "lf": 1.0
-    },
-    "dl": {
-        "cf": 0.0,
-        "dim": "Volume",
-        "lf": 0.0001
-    },
-    "dm": {
-        "cf": 0.0,
-        "dim": "Length",
-        "lf": 0.1
-    },
-    "dm^3": {
-        "cf": 0.0,
-        "dim": "Volume",
-        "lf": 0.001
-    },
-    "dyn": {
-        "cf": 0.0,
-        "dim": "Force",
-        "lf": 1e-05
-    },
-    "dyne": {
-        "cf": 0.0,
-        "dim": "Force",
-        "lf": 1e-05
-    },
-    "eV": {
-        "cf": 0.0,
-        "dim": "Energy",
-        "lf": 1.60217733e-19
-    },
-    "electronvolt": {
-        "cf": 0.0,
-        "dim": "Energy",
-        "lf": 1.60217733e-19
-    },
-    "erg": {
-        "cf": 0.0,
-        "dim": "Energy",
-        "lf": 1e-07
-    },
-    "femtometre": {
-        "cf": 0.0,
-        "dim": "Length",
-        "lf": 1e-15
-    },
-    "fl oz": {
-        "cf": 0.0,
-        "dim": "Volume",
-        "lf": 2.9574e-05
-    },
-    "fluid ounce(US)": {
-        "cf": 0.0,
-        "dim": "Volume",
-        "lf": 2.9574e-05
-    },
-    "fm": {
-        "cf": 0.0,
-        "dim": "Length",
-        "lf": 1e-15
-    },
-    "foot": {
-        "cf": 0.0,
-        "dim": "Length",
-        "lf": 0.3048
-    },
-    "foot/hour": {
-        "cf": 0.0,
-        "dim": "Speed",
-        "lf": 8.4666666666e-05
-    },
-    "foot/minute": {
-        "cf": 0.0,
-        "dim": "Speed",
-        "lf": 0.00508
-    },
-    "foot/second": {
-        "cf": 0.0,
-        "dim": "Speed",
-        "lf": 0.3048
-    },
-    "fph": {
-        "cf": 0.0,
-        "dim": "Speed",
-        "lf": 8.4666666666e-05
-    },
-    "fpm": {
-        "cf": 0.0,
-        "dim": "Speed",
-        "lf": 0.00508
-    },
-    "fps": {
-        "cf": 0.0,
-        "dim": "Speed",
-        "lf": 0.3048
-    },
-    "ft": {
-        "cf": 0.0,
-        "dim": "Length",
-        "lf": 0.3048
-    },
-    "ft^2": {
-        "cf": 0.0,
-        "dim": "Area",
-        "lf": 0.09290304
-    },
-    "ft^3": {
-        "cf": 0.0,
-        "dim": "Volume",
-        "lf": 0.028316846592
-    },
-    "ft^3 day^-1": {
-        "cf": 0.0,
-        "dim": "Volumetric flow rate",
-        "lf": 3.2774128e-07
-    },
-    "ft^3 h^-1": {
-        "cf": 0.0,
-        "dim": "Volumetric flow rate",
-        "lf": 7.86579072e-06
-    },
-    "ft^3 min^-1": {
-        "cf": 0.0,
-        "dim": "Volumetric flow rate",
-        "lf": 0.000471947443
-    },
-    "ft^3 mon^-1": {
-        "cf": 0.0,
-        "dim": "Volumetric flow rate",
-        "lf": 1.07679106e-08
-    },
-    "ft^3 s^-1": {
-        "cf": 0.0,
-        "dim": "Volumetric flow rate",
-        "lf": 0.0283168466
-    },
-    "g": {
-        "cf": 0.0,
-        "dim": "Mass",
-        "lf": 0.001
-    },
-    "g s^-1": {
-        "cf": 0.0,
-        "dim": "Mass flow rate",
-        "lf": 0.001
-    },
-    "gal": {
-        "cf": 0.0,
-        "dim": "Volume",
-        "lf": 0.003785411784
-    },
-    "gal day^-1": {
-        "cf": 0.0,
-        "dim": "Volumetric flow rate",
-        "lf": 4.38126364e-08
-    },
-    "gal h^-1": {
-        "cf": 0.0,
-        "dim": "Volumetric flow rate",
-        "lf": 1.05150327e-06
-    },
-    "gal min^-1": {
-        "cf": 0.0,
-        "dim": "Volumetric flow rate",
-        "lf": 6.30901964e-05
-    },
-    "gal mon^-1": {
-        "cf": 0.0,
-        "dim": "Volumetric flow rate",
-        "lf": 1.43946028e-09
-    },
-    "gal s^-1": {
-        "cf": 0.0,
-        "dim": "Volumetric flow rate",
-        "lf": 0.00378541178
-    },
-    "gallon, liquid(US)": {
-        "cf": 0.0,
-        "dim": "Volume",
-        "lf": 0.003785411784
-    },
-    "gallons per day": {
-        "cf": 0.0,
-        "dim": "Volumetric flow rate",
-        "lf": 4.38126364e-08
-    },
-    "gallons per hour": {
-        "cf": 0.0,
-        "dim": "Volumetric flow rate",
-        "lf": 1.05150327e-06
-    },
-    "gallons per minute": {
-        "cf": 0.0,
-        "dim": "Volumetric flow rate",
-        "lf": 6.30901964e-05
-    },
-    "gallons per month": {
-        "cf": 0.0,
-        "dim": "Volumetric flow rate",
-        "lf": 1.43946028e-09
-    },
-    "gallons per second": {
-        "cf": 0.0,
-        "dim": "Volumetric flow rate",
-        "lf": 0.00378541178
-    },
-    "gf": {
-        "cf": 0.0,
-        "dim": "Force",
-        "lf": 0.00980665
-    },
-    "gigajoule": {
-        "cf": 0.0,
-        "dim": "Energy",
-        "lf": 1000000000.0
-    },
-    "gigawatt": {
-        "cf": 0.0,
-        "dim": "Power",
-        "lf": 1000000000.0
-    },
-    "grad or gon": {
-        "cf": 0.0,
-        "dim": "Angle",
-        "lf": 0.9
-    },
-    "gram": {
-        "cf": 0.0,
-        "dim": "Mass",
-        "lf": 0.001
-    },
-    "gram-force": {
-        "cf": 0.0,
-        "dim": "Force",
-        "lf": 0.00980665
-    },
-    "grams per second": {
-        "cf": 0.0,
-        "dim": "Mass flow rate",
-        "lf": 0.001
-    },
-    "grd": {
-        "cf": 0.0,
-        "dim": "Angle",
-        "lf": 0.9
-    },
-    "h": {
-        "cf": 0.0,
-        "dim": "Time",
-        "lf": 3600.0
-    },
-    "hPa": {
-        "cf": 0.0,
-        "dim": "Pressure",
-        "lf": 100.0
-    },
-    "ha": {
-        "cf": 0.0,
-        "dim": "Area",
-        "lf": 10000.0
-    },
-    "hectare": {
-        "cf": 0.0,
-        "dim": "Area",
-        "lf": 10000.0
-    },
-    "hectometre": {
-        "cf": 0.0,
-        "dim": "Length",
-        "lf": 100.0
-    },
-    "hectopascal": {
-        "cf": 0.0,
-        "dim": "Pressure",
-        "lf": 100.0
-    },
-    "hm": {
-        "cf": 0.0,
-        "dim": "Length",
-        "lf": 100.0
-    },
-    "hm^3": {
-        "cf": 0.0,
-        "dim": "Volume",
-        "lf": 1000000.0
-    },
-    "hm^3 day^-1": {
-        "cf": 0.0,
-        "dim": "Volumetric flow rate",
-        "lf": 11.5740741
-    },
-    "hm^3 h^-1": {
-        "cf": 0.0,
-        "dim": "Volumetric flow rate",
-        "lf": 277.777778
-    },
-    "hm^3 min^-1": {
-        "cf": 0.0,
-        "dim": "Volumetric flow rate",
-        "lf": 16666.6667
-    },
-    "hm^3 mon^-1": {
-        "cf": 0.0,
-        "dim": "Volumetric flow rate",
-        "lf": 0.380265176
-    },
-    "hm^3 s^-1": {
-        "cf": 0.0,
-        "dim": "Volumetric flow rate",
-        "lf": 1000000.0
-    },
-    "horsepower": {
-        "cf": 0.0,
-        "dim": "Power",
-        "lf": 745.6998715822702
-    },
-    "horsepower-hours": {
-        "cf": 0.0,
-        "dim": "Energy",
-        "lf": 2684520.0
-    },
-    "hour": {
-        "cf": 0.0,
-        "dim": "Time",
-        "lf": 3600.0
-    },
-    "hp": {
-        "cf": 0.0,
-        "dim": "Power",
-        "lf": 745.6998715822702
-    },
-    "hph": {
-        "cf": 0.0,
-        "dim": "Energy",
-        "lf": 2684520.0
-    },
-    "iches of water": {
-        "cf": 0.0,
-        "dim": "Pressure",
-        "lf": 249.08891
-    },
-    "in": {
-        "cf": 0.0,
-        "dim": "Length",
-        "lf": 0.0254
-    },
-    "inH2O": {
-        "cf": 0.0,
-        "dim": "Pressure",
-        "lf": 249.08891
-    },
-    "inHg": {
-        "cf": 0.0,
-        "dim": "Pressure",
-        "lf": 3386.388
-    },
-    "in^2": {
-        "cf": 0.0,
-        "dim": "Area",
-        "lf": 0.00064516
-    },
-    "in^3": {
-        "cf": 0.0,
-        "dim": "Volume",
-        "lf": 1.6387064e-05
-    },
-    "inch": {
-        "cf": 0.0,
-        "dim": "Length",
-        "lf": 0.0254
-    },
-    "inch/minute": {
-        "cf": 0.0,
-        "dim": "Speed",
-        "lf": 0.00042333333333
-    },
-    "inch/second": {
-        "cf": 0.0,
-        "dim": "Speed",
-        "lf": 0.0254
-    },
-    "inches of mercury": {
-        "cf": 0.0,
-        "dim": "Pressure",
-        "lf": 3386.388
-    },
-    "ipm": {
-        "cf": 0.0,
-        "dim": "Speed",
-        "lf": 0.00042333333333
-    },
-    "ips": {
-        "cf": 0.0,
-        "dim": "Speed",
-        "lf": 0.0254
-    },
-    "joule": {
-        "cf": 0.0,
-        "dim": "Energy",
-        "lf": 1.0
-    },
-    "joule/metre": {
-        "cf": 0.0,
-        "dim": "Force",
-        "lf": 1.0
-    },
-    "kJ": {
-        "cf": 0.0,
-        "dim": "Energy",
-        "lf": 1000.0
-    },
-    "kPa": {
-        "cf": 0.0,
-        "dim": "Pressure",
-        "lf": 1000.0
-    },
-    "kW": {
-        "cf": 0.0,
-        "dim": "Power",
-        "lf": 1000.0
-    },
-    "kWh": {
-        "cf": 0.0,
-        "dim": "Energy",
-        "lf": 3600000.0
-    },
-    "kcal": {
-        "cf": 0.0,
-        "dim": "Energy",
-        "lf": 4184.0
-    },
-    "kg": {
-        "cf": 0.0,
-        "dim": "Mass",
-        "lf": 1.0
-    },
-    "kg Ml^-1": {
-        "cf": 0.0,
-        "dim": "Density",
-        "lf": 0.0001
-    },
-    "kg day^-1": {
-        "cf": 0.0,
-        "dim": "Mass flow rate",
-        "lf": 1.15740741e-05
-    },
-    "kg h^-1": {
-        "cf": 0.0,
-        "dim": "Mass flow rate",
-        "lf": 0.000277777778
-    },
-    "kg m s^-2": {
-        "cf": 0.0,
-        "dim": "Force",
-        "lf": 1.0
-    },
-    "kg m^-3": {
-        "cf": 0.0,
-        "dim": "Density",
-        "lf": 1.0
-    },
-    "kg min^-1": {
-        "cf": 0.0,
-        "dim": "Mass flow rate",
-        "lf": 0.0166666667
-    },
-    "kg mon^-1": {
-        "cf": 0.0,
-        "dim": "Mass flow rate",
-        "lf": 3.80265176e-07
-    },
-    "kg s^-1": {
-        "cf": 0.0,
-        "dim": "Mass flow rate",
-        "lf": 1.0
-    },
-    "kg yr^-1": {
-        "cf": 0.0,
-        "dim": "Mass flow rate",
-        "lf": 3.16887646e-08
-    },
-    "kgf": {
-        "cf": 0.0,
-        "dim": "Force",
-        "lf": 9.80665
-    },
-    "kg·m/s^2": {
-        "cf": 0.0,
-        "dim": "Force",
-        "lf": 1.0
-    },
-    "kilocalorie": {
-        "cf": 0.0,
-        "dim": "Energy",
-        "lf": 4184.0
-    },
-    "kilogram": {
-        "cf": 0.0,
-        "dim": "Mass",
-        "lf": 1.0
-    },
-    "kilogram-force": {
-        "cf": 0.0,
-        "dim": "Force",
-        "lf": 9.80665
-    },
-    "kilograms per cubic-metre": {
-        "cf": 0.0,
-        "dim": "Density",
-        "lf": 1.0
-    },
-    "kilograms per day": {
-        "cf": 0.0,
-        "dim": "Mass flow rate",
-        "lf": 1.15740741e-05
-    },
-    "kilograms per hour": {
-        "cf": 0.0,
-        "dim": "Mass flow rate",
-        "lf": 0.000277777778
-    },
-    "kilograms per megalitre": {
-        "cf": 0.0,
-        "dim": "Density",
-        "lf": 0.0001
-    },
-    "kilograms per minute": {
-        "cf": 0.0,
-        "dim": "Mass flow rate",
-        "lf": 0.0166666667
-    },
-    "kilograms per month": {
-        "cf": 0.0,
-        "dim": "Mass flow rate",
-        "lf": 3.80265176e-07
-    },
-    "kilograms per second": {
-        "cf": 0.0,
-        "dim": "Mass flow rate",
-        "lf": 1.0
-    },
-    "kilograms per year": {
-        "cf": 0.0,
-        "dim": "Mass flow rate",
-        "lf": 3.16887646e-08
-    },
-    "kilojoule": {
-        "cf": 0.0,
-        "dim": "Energy",
-        "lf": 1000.0
-    },
-    "kilometre": {
-        "cf": 0.0,
-        "dim": "Length",
-        "lf": 1000.0
-    },
-    "kilometre/hour": {
-        "cf": 0.0,
-        "dim": "Speed",
-        "lf": 0.27777777777778
-    },
-    "kilopascal": {
-        "cf": 0.0,
-        "dim": "Pressure",
-        "lf": 1000.0
-    },
-    "kilopond": {
-        "cf": 0.0,
-        "dim": "Force",
-        "lf": 9.80665
-    },
-    "kilopound-force": {
-        "cf": 0.0,
-        "dim": "Force",
-        "lf": 4448.2216152548
-    },
-    "kilowatt": {
-        "cf": 0.0,
-        "dim": "Power",
-        "lf": 1000.0
-    },
-    "kilowatt-hour": {
-        "cf": 0.0,
-        "dim": "Energy",
-        "lf": 3600000.0
-    },
-    "kipf": {
-        "cf": 0.0,
-        "dim": "Force",
-        "lf": 4448.2216152548
-    },
-    "km": {
-        "cf": 0.0,
-        "dim": "Length",
-        "lf": 1000.0
-    },
-    "km h^-1": {
-        "cf": 0.0,
-        "dim": "Speed",
-        "lf": 0.27777777777778
-    },
-    "km^2": {
-        "cf": 0.0,
-        "dim": "Area",
-        "lf": 1000000.0
-    },
-    "kn": {
-        "cf": 0.0,
-        "dim": "Speed",
-        "lf": 0.514444
-    },
-    "kn(a)": {
-        "cf": 0.0,
-        "dim": "Speed",
-        "lf": 0.514773
-    },
-    "knot": {
-        "cf": 0.0,
-        "dim": "Speed",
-        "lf": 0.514444
-    },
-    "knot(admiralty)": {
-        "cf": 0.0,
-        "dim": "Speed",
-        "lf": 0.514773
-    },
-    "kp": {
-        "cf": 0.0,
-        "dim": "Force",
-        "lf": 9.80665
-    },
-    "l": {
-        "cf": 0.0,
-        "dim": "Volume",
-        "lf": 0.001
-    },
-    "l day^-1": {
-        "cf": 0.0,
-        "dim": "Volumetric flow rate",
-        "lf": 1.15740741e-08
-    },
-    "l h^-1": {
-        "cf": 0.0,
-        "dim": "Volumetric flow rate",
-        "lf": 2.77777778e-07
-    },
-    "l min^-1": {
-        "cf": 0.0,
-        "dim": "Volumetric flow rate",
-        "lf": 1.66666667e-05
-    },
-    "l mon^-1": {
-        "cf": 0.0,
-        "dim": "Volumetric flow rate",
-        "lf": 3.80265176e-10
-    },
-    "l s^-1": {
-        "cf": 0.0,
-        "dim": "Volumetric flow rate",
-        "lf": 0.001
-    },
-    "lb ft s^-2": {
-        "cf": 0.0,
-        "dim": "Force",
-        "lf": 0.138254954376
-    },
-    "lbf": {
-        "cf": 0.0,
-        "dim": "Force",
-        "lf": 4.448222
-    },
-    "lbf/in^2": {
-        "cf": 0.0,
-        "dim": "Pressure",
-        "lf": 6894.76
-    },
-    "lbm": {
-        "cf": 0.0,
-        "dim": "Mass",
-        "lf": 0.45359237
-    },
-    "lb·ft/s^2": {
-        "cf": 0.0,
-        "dim": "Force",
-        "lf": 0.138254954376
-    },
-    "light-year": {
-        "cf": 0.0,
-        "dim": "Length",
-        "lf": 9460528405000000.0
-    },
-    "litre": {
-        "cf": 0.0,
-        "dim": "Volume",
-        "lf": 0.001
-    },
-    "litre per day": {
-        "cf": 0.0,
-        "dim": "Volumetric flow rate",
-        "lf": 1.15740741e-08
-    },
-    "litre per hour": {
-        "cf": 0.0,
-        "dim": "Volumetric flow rate",
-        "lf": 2.77777778e-07
-    },
-    "litre per minute": {
-        "cf": 0.0,
-        "dim": "Volumetric flow rate",
-        "lf": 1.66666667e-05
-    },
-    "litre per month": {
-        "cf": 0.0,
-        "dim": "Volumetric flow rate",
-        "lf": 3.80265176e-10
-    },
-    "litre per second": {
-        "cf": 0.0,
-        "dim": "Volumetric flow rate",
-        "lf": 0.001
-    },
-    "ly": {
-        "cf": 0.0,
-        "dim": "Length",
-        "lf": 9460528405000000.0
-    },
-    "m": {
-        "cf": 0.0,
-        "dim": "Length",
-        "lf": 1.0
-    },
-    "m s^-1": {
-        "cf": 0.0,
-        "dim": "Speed",
-        "lf": 1.0
-    },
-    "mH2O": {
-        "cf": 0.0,
-        "dim": "Pressure",
-        "lf": 9806.65
-    },
-    "m^2": {
-        "cf": 0.0,
-        "dim": "Area",
-        "lf": 1.0
-    },
-    "m^3": {
-        "cf": 0.0,
-        "dim": "Volume",
-        "lf": 1.0
-    },
-    "m^3 day^-1": {
-        "cf": 0.0,
-        "dim": "Volumetric flow rate",
-        "lf": 1.15740741e-05
-    },
-    "m^3 h^-1": {
-        "cf": 0.0,
-        "dim": "Volumetric flow rate",
-        "lf": 0.000277777778
-    },
-    "m^3 min^-1": {
-        "cf": 0.0,
-        "dim": "Volumetric flow rate",
-        "lf": 0.0166666667
-    },
-    "m^3 mon^-1": {
-        "cf": 0.0,
-        "dim": "Volumetric flow rate",
-        "lf": 3.80265176e-07
-    },
-    "m^3 s^-1": {
-        "cf": 0.0,
-        "dim": "Volumetric flow rate",
-        "lf": 1.0
-    },
-    "mbar": {
-        "cf": 0.0,
-        "dim": "Pressure",
-        "lf": 100.0
-    },
-    "megajoule": {
-        "cf": 0.0,
-        "dim": "Energy",
-        "lf": 1000000.0
-    },
-    "megalitre": {
-        "cf": 0.0,
-        "dim": "Volume",
-        "lf": 1000.0
-    },
-    "megalitre per day": {
-        "cf": 0.0,
-        "dim": "Volumetric flow rate",
-        "lf": 0.0115740741
-    },
-    "megalitre per hour": {
-        "cf": 0.0,
-        "dim": "Volumetric flow rate",
-        "lf": 0.277777778
-    },
-    "megalitre per minute": {
-        "cf": 0.0,
-        "dim": "Volumetric flow rate",
-        "lf": 1.66666667
-    },
-    "megalitre per month": {
-        "cf": 0.0,
-        "dim": "Volumetric flow rate",
-        "lf": 0.000380265176
-    },
-    "megalitre per second": {
-        "cf": 0.0,
-        "dim": "Volumetric flow rate",
-        "lf": 1000.0
-    },
-    "megawatt": {
-        "cf": 0.0,
-        "dim": "Power",
-        "lf": 1000000.0
-    },
-    "metre": {
-        "cf": 0.0,
-        "dim": "Length",
-        "lf": 1.0
-    },
-    "metre of water": {
-        "cf": 0.0,
-        "dim": "Pressure",
-        "lf": 9806.65
-    },
-    "metre/second": {
-        "cf": 0.0,
-        "dim": "Speed",
-        "lf": 1.0
-    },
-    "mg": {
-        "cf": 0.0,
-        "dim": "Mass",
-        "lf": 1e-06
-    },
-    "mi": {
-        "cf": 0.0,
-        "dim": "Length",
-        "lf": 1609.344
-    },
-    "mi^2": {
-        "cf": 0.0,
-        "dim": "Area",
-        "lf": 2589988.110336
-    },
-    "microbar": {
-        "cf": 0.0,
-        "dim": "Pressure",
-        "lf": 0.1
-    },
-    "microgram": {
-        "cf": 0.0,
-        "dim": "Mass",
-        "lf": 1e-09
-    },
-    "micrometre": {
-        "cf": 0.0,
-        "dim": "Length",
-        "lf": 1e-06
-    },
-    "microsecond": {
-        "cf": 0.0,
-        "dim": "Time",
-        "lf": 1e-06
-    },
-    "mile": {
-        "cf": 0.0,
-        "dim": "Length",
-        "lf": 1609.344
-    },
-    "mile(nautical)": {
-        "cf": 0.0,
-        "dim": "Length",
-        "lf": 1852.0
-    },
-    "mile/hour": {
-        "cf": 0.0,
-        "dim": "Speed",
-        "lf": 0.44704
-    },
-    "mile/minute": {
-        "cf": 0.0,
-        "dim": "Speed",
-        "lf": 26.8224
-    },
-    "mile/second": {
-        "cf": 0.0,
-        "dim": "Speed",
-        "lf": 1609.344
-    },
-    "milibar": {
-        "cf": 0.0,
-        "dim": "Pressure",
-        "lf": 100.0
-    },
-    "milligram": {
-        "cf": 0.0,
-        "dim": "Mass",
-        "lf": 1e-06
-    },
-    "millilitre": {
-        "cf": 0.0,
-        "dim": "Volume",
-        "lf": 1e-06
-    },
-    "millimetre": {
-        "cf": 0.0,
-        "dim": "Length",
-        "lf": 0.001
-    },
-    "millimetre of mercury": {
-        "cf": 0.0,
-        "dim": "Pressure",
-        "lf": 133.322
-    },
-    "millimetre of water": {
-        "cf": 0.0,
-        "dim": "Pressure",
-        "lf": 9.80665
-    },
-    "millisecond": {
-        "cf": 0.0,
-        "dim": "Time",
-        "lf": 0.001
-    },
-    "min": {
-        "cf": 0.0,
-        "dim": "Time",
-        "lf": 60.0
-    },
-    "minute": {
-        "cf": 0.0,
-        "dim": "Time",
-        "lf": 60.0
-    },
-    "minutes": {
-        "cf": 0.0,
-        "dim": "Angle",
-        "lf": 0.0166666666
-    },
-    "ml": {
-        "cf": 0.0,
-        "dim": "Volume",
-        "lf": 1e-06
-    },
-    "mm": {
-        "cf": 0.0,
-        "dim": "Length",
-        "lf": 0.001
-    },
-    "mmH2O": {
-        "cf": 0.0,
-        "dim": "Pressure",
-        "lf": 9.80665
-    },
-    "mmHg": {
-        "cf": 0.0,
-        "dim": "Pressure",
-        "lf": 133.322
-    },
-    "mm^3": {
-        "cf": 0.0,
-        "dim": "Volume",
-        "lf": 1e-09
-    },
-    "mon": {
-        "cf": 0.0,
-        "dim": "Time",
-        "lf": 2629743.8328
-    },
-    "month": {
-        "cf": 0.0,
-        "dim": "Time",
-        "lf": 2629743.8328
-    },
-    "mph": {
-        "cf": 0.0,
-        "dim": "Speed",
-        "lf": 0.44704
-    },
-    "mpm": {
-        "cf": 0.0,
-        "dim": "Speed",
-        "lf": 26.8224
-    },
-    "mps": {
-        "cf": 0.0,
-        "dim": "Speed",
-        "lf": 1609.344
-    },
-    "ms": {
-        "cf": 0.0,
-        "dim": "Time",
-        "lf": 0.001
-    },
-    "nanometre": {
-        "cf": 0.0,
-        "dim": "Length",
-        "lf": 1e-09
-    },
-    "nanosecond": {
-        "cf": 0.0,
-        "dim": "Time",
-        "lf": 1e-09
-    },
-    "newton": {
-        "cf": 0.0,
-        "dim": "Force",
-        "lf": 1.0
-    },
-    "nm": {
-        "cf": 0.0,
-        "dim": "Length",
-        "lf": 1e-09
-    },
-    "nmi": {
-        "cf": 0.0,
-        "dim": "Length",
-        "lf": 1852.0
-    },
-    "ns": {
-        "cf": 0.0,
-        "dim": "Time",
-        "lf": 1e-09
-    },
-    "ounce": {
-        "cf": 0.0,
-        "dim": "Mass",
-        "lf": 0.02835
-    },
-    "ounce-force": {
-        "cf": 0.0,
-        "dim": "Force",
-        "lf": 0.27801385095342
-    },
-    "oz": {
-        "cf": 0.0,
-        "dim": "Mass",
-        "lf": 0.02835
-    },
-    "ozf": {
-        "cf": 0.0,
-        "dim": "Force",
-        "lf": 0.27801385095342
-    },
-    "p": {
-        "cf": 0.0,
-        "dim": "Force",
-        "lf": 0.00980665
-    },
-    "parsec": {
-        "cf": 0.0,
-        "dim": "Length",
-        "lf": 3.0856776e+16
-    },
-    "parts per billion": {
-        "cf": 0.0,
-        "dim": "Density",
-        "lf": 1e-06
-    },
-    "pascal": {
-        "cf": 0.0,
-        "dim": "Pressure",
-        "lf": 1.0
-    },
-    "pc": {
-        "cf": 0.0,
-        "dim": "Length",
-        "lf": 3.0856776e+16
-    },
-    "pdl": {
-        "cf": 0.0,
-        "dim": "Force",
-        "lf": 0.138254954376
-    },
-    "picometre": {
-        "cf": 0.0,
-        "dim": "Length",
-        "lf": 1e-12
-    },
-    "picosecond": {
-        "cf": 0.0,
-        "dim": "Time",
-        "lf": 1e-12
-    },
-    "pint, liquid(US)": {
-        "cf": 0.0,
-        "dim": "Volume",
-        "lf": 0.000473176475
-    },
-    "pm": {
-        "cf": 0.0,
-        "dim": "Length",
-        "lf": 1e-12
-    },
-    "pond": {
-        "cf": 0.0,
-        "dim": "Force",
-        "lf": 0.00980665
-    },
-    "pound": {
-        "cf": 0.0,
-        "dim": "Mass",
-        "lf": 0.45359237
-    },
-    "pound-force": {
-        "cf": 0.0,
-        "dim": "Force",
-        "lf": 4.448222
-    },
-    "poundal": {
-        "cf": 0.0,
-        "dim": "Force",
-        "lf": 0.138254954376
-    },
-    "ppb": {
-        "cf": 0.0,
-        "dim": "Density",
-        "lf": 1e-06
-    },
-    "ps": {
-        "cf": 0.0,
-        "dim": "Time",
-        "lf": 1e-12
-    },
-    "psi": {
-        "cf": 0.0,
-        "dim": "Pressure",
-        "lf": 6894.76
-    },
-    "pt": {
-        "cf": 0.0,
-        "dim": "Volume",
-        "lf": 0.000473176475
-    },
-    "rad": {
-        "cf": 0.0,
-        "dim": "Angle",
-        "lf": 57.29577951
-    },
-    "radian": {
-        "cf": 0.0,
-        "dim": "Angle",
-        "lf": 57.29577951
-    },
-    "s": {
-        "cf": 0.0,
-        "dim": "Time",
-        "lf": 1.0
-    },
-    "second": {
-        "cf": 0.0,
-        "dim": "Time",
-        "lf": 1.0
-    },
-    "seconds": {
-        "cf": 0.0,
-        "dim": "Angle",
-        "lf": 0.00027777777778
-    },
-    "speed of light in vacuum": {
-        "cf": 0.0,
-        "dim": "Speed",
-        "lf": 299792458.0
-    },
-    "square foot": {
-        "cf": 0.0,
-        "dim": "Area",
-        "lf": 0.09290304
-    },
-    "square inch": {
-        "cf": 0.0,
-        "dim": "Area",
-        "lf": 0.00064516
-    },
-    "square kilometre": {
-        "cf": 0.0,
-        "dim": "Area",
-        "lf": 1000000.0
-    },
-    "square metre": {
-        "cf": 0.0,
-        "dim": "Area",
-        "lf": 1.0
-    },
-    "square mile": {
-        "cf": 0.0,
-        "dim": "Area",
-        "lf": 2589988.110336
-    },
-    "square yard": {
-        "cf": 0.0,
-        "dim": "Area",
-        "lf": 0.83612736
-    },
-    "t": {
-        "cf": 0.0,
-        "dim": "Mass",
-        "lf": 1000.0
-    },
-    "t day^-1": {
-        "cf": 0.0,
-        "dim": "Mass flow rate",
-        "lf": 0.0115740741
-    },
-    "t h^-1": {
-        "cf": 0.0,
-        "dim": "Mass flow rate",
-        "lf": 0.277777777778
-    },
-    "t min^-1": {
-        "cf": 0.0,
-        "dim": "Mass flow rate",
-        "lf": 16.66666666667
-    },
-    "t mon^-1": {
-        "cf": 0.0,
-        "dim": "Mass flow rate",
-        "lf": 0.000380265176
-    },
-    "t s^-1": {
-        "cf": 0.0,
-        "dim": "Mass flow rate",
-        "lf": 1000.0
-    },
-    "t yr^-1": {
-        "cf": 0.0,
-        "dim": "Mass flow rate",
-        "lf": 3.16887646e-05
-    },
-    "technical atmosphere": {
-        "cf": 0.0,
-        "dim": "Pressure",
-        "lf": 98066.5
-    },
-    "tf": {
-        "cf": 0.0,
-        "dim": "Force",
-        "lf": 9806.65
-    },
-    "tonne": {
-        "cf": 0.0,
-        "dim": "Mass",
-        "lf": 1000.0
-    },
-    "tonne-force(metric)": {
-        "cf": 0.0,
-        "dim": "Force",
-        "lf": 9806.65
-    },
-    "tonnes per day": {
-        "cf": 0.0,
-        "dim": "Mass flow rate",
-        "lf": 0.0115740741
-    },
-    "tonnes per hour": {
-        "cf": 0.0,
-        "dim": "Mass flow rate",
-        "lf": 0.277777777778
-    },
-    "tonnes per minute": {
-        "cf": 0.0,
-        "dim": "Mass flow rate",
-        "lf": 16.66666666667
-    },
-    "tonnes per month": {
-        "cf": 0.0,
-        "dim": "Mass flow rate",
-        "lf": 0.000380265176
-    },
-    "tonnes per second": {
-        "cf": 0.0,
-        "dim": "Mass flow rate",
-        "lf": 1000.0
-    },
-    "tonnes per year": {
-        "cf": 0.0,
-        "dim": "Mass flow rate",
-        "lf": 3.16887646e-05
-    },
-    "torr": {
-        "cf": 0.0,
-        "dim": "Pressure",
-        "lf": 133.322
-    },
-    "volt-ampere": {
-        "cf": 0.0,
-        "dim": "Power",
-        "lf": 1.0
-    },
-    "watt": {
-        "cf": 0.0,
-        "dim": "Power",
-        "lf": 1.0
-    },
-    "watt-hour": {
-        "cf": 0.0,
-        "dim": "Energy",
-        "lf": 3600.0
-    },
-    "yard": {
-        "cf": 0.0,
-        "dim": "Length",
-        "lf": 0.9144
-    },
-    "yd": {
-        "cf": 0.0,
-        "dim": "Length",
-        "lf": 0.9144
-    },
-    "yd^2": {
-        "cf": 0.0,
-        "dim": "Area",
-        "lf": 0.83612736
-    },
-    "yd^3": {
-        "cf": 0.0,
-        "dim": "Volume",
-        "lf": 0.764554857984
-    },
-    "year": {
-        "cf": 0.0,
-        "dim": "Time",
-        "lf": 31556925.9936
-    },
-    "yr": {
-        "cf": 0.0,
-        "dim": "Time",
-        "lf": 31556925.9936
-    },
-    "°": {
-        "cf": 0.0,
-        "dim": "Angle",
-        "lf": 1.0
-    },
-    "°C": {
-        "cf": 273.15,
-        "dim": "Temperature",
-        "lf": 1.0
-    },
-    "°De": {
-        "cf": 373.15,
-        "dim": "Temperature",
-        "lf": -0.6666666666666666
-    },
-    "°F": {
-        "cf": 255.37222222222223,
-        "dim": "Temperature",
-        "lf": 0.5555555555555556
-    },
-    "°Ra": {
-        "cf": 0.0,
-        "dim": "Temperature",
-        "lf": 0.5555555555555556
-    },
-    "°Ré": {
-        "cf": 273.15,
-        "dim": "Temperature",
-        "lf": 1.25
-    },
-    "°Rø": {
-        "cf": 258.8642857142857,
-        "dim": "Temperature",
-        "lf": 1.9047619047619047
-    },
-    "µbar": {
-        "cf": 0.0,
-        "dim": "Pressure",
-        "lf": 0.1
-    },
-    "µg": {
-        "cf": 0.0,
-        "dim": "Mass",
-        "lf": 1e-09
-    },
-    "µm": {
-        "cf": 0.0,
-        "dim": "Length",
-        "lf": 1e-06
-    },
-    "Å": {
-        "cf": 0.0,
-        "dim": "Length",
-        "lf": 1e-10
-    },
-    "μs": {
-        "cf": 0.0,
-        "dim": "Time",
-        "lf": 1e-06
-    }
-}
+import os
+import json
+from functools import lru_cache
 
+import numpy as np
 
-def convert(value, unit_in, unit_out, scale_in=1, scale_out=1):
+# units are stored as {unit: [dimension, linear factor, constant factor]}
+UNITS_PATH = os.path.join(os.path.dirname(__file__), 'units.json')
+
+_units = None
+
+
+def get_units():
     """
-    Convert value of dimension from unit_in to unit_in
-    :param value: input value
+    Get the unit table, loading it the first time it is requested.
+    :return: a dict of units, each with a dimension ('dim'), a linear factor ('lf') and a constant factor ('cf')
+    """
+    global _units
+    if _units is None:
+        with open(UNITS_PATH, encoding='utf-8') as f:
+            _units = {unit: {'dim': dim, 'lf': lf, 'cf': cf} for unit, (dim, lf, cf) in json.load(f).items()}
+    return _units
+
+
+def __getattr__(name):
+    # the unit table used to be defined here as `units`
+    if name == 'units':
+        return get_units()
+    raise AttributeError('module {} has no attribute {}'.format(__name__, name))
+
+
+@lru_cache(maxsize=None)
+def conversion_factor(unit_in, unit_out, scale_in=1, scale_out=1):
+    """
+    Get the factor to convert a value of dimension from unit_in to unit_out
     :param unit_in: input unit
     :param unit_out: output unit
     :param scale_in: input scale
     :param scale_out: output scale
-    :return: value
+    :return: factor
+    """
+    units = get_units()
+    for unit in [unit_in, unit_out]:
+        if unit not in units:
+            raise Exception('Conversion error: {} is not a valid unit'.format(unit))
+
+    u1 = units[unit_in]
+    u2 = units[unit_out]
+
+    if u1['dim'] != u2['dim']:
+        raise Exception("Input dimension {} is different than output dimension {}.".format(u1['dim'], u2['dim']))
+
+    return scale_in * u1['lf'] / u2['lf'] / scale_out
+
+
+class Converter(object):
+    """
+    A unit conversion with its factor resolved once, for use in parameter values.
+    Calling the converter converts a value (or an array); array converts an array, optionally in place.
     """
 
-    try:
-        u1 = units[unit_in]
-        u2 = units[unit_out]
+    def __init__(self, unit_in, unit_out, scale_in=1, scale_out=1):
+        self.factor = conversion_factor(unit_in, unit_out, scale_in, scale_out)
 
-        if u1['dim'] != u2['dim']:
-            raise Exception("Input dimension {} is different than output dimension {}.".format(u1['dim'], u2['dim']))
+    def __call__(self, value):
+        return value * self.factor
 
-        return value * scale_in * u1['lf'] / u2['lf'] / scale_out
+    def array(self, values, out=None):
+        """
+        Convert an array of values
+        :param values: input values
+        :param out: array to write to (e.g., values, to convert in place)
+        :return: array
+        """
+        return np.multiply(values, self.factor, out=out)
 
-    except:
-        err_unit = None
-        if unit_in not in units:
-            err_unit = unit_in
-        elif unit_out not in units:
-            err_unit = unit_out
-        if err_unit:
-            raise Exception('Conversion error: {} is not a valid unit'.format(err_unit))
-        else:
-            raise
+
+@lru_cache(maxsize=None)
+def get_converter(unit_in, unit_out, scale_in=1, scale_out=1):
+    """
+    Get a (shared) converter from unit_in to unit_out. Converters should be bound once (e.g., in a parameter's setup),
+    rather than looked up in value.
+    :param unit_in: input unit
+    :param unit_out: output unit
+    :param scale_in: input scale
+    :param scale_out: output scale
+    :return: Converter
+    """
+    return Converter(unit_in, unit_out, scale_in, scale_out)
+
+
+def convert(value, unit_in, unit_out, scale_in=1, scale_out=1):
+    """
+    Convert value of dimension from unit_in to unit_in
+    :param value: input value
+    :param unit_in: input unit
+    :param unit_out: output unit
+    :param scale_in: input scale
+    :param scale_out: output scale
+    :return: value
+    """
+    return value * conversion_factor(unit_in, unit_out, scale_in, scale_out)
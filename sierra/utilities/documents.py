@@ -0,0 +1,86 @@
+import os
+import json
+
+from sierra.utilities.climates import add_climate_scenario
+from sierra.utilities.output_profiles import apply_output_profile, stream_recorders
+
+
+def apply_scenario(m, scenario_path):
+    """
+    Update a model document with a scenario definition: tables, parameters and recorders are updated by name, other
+    lists are extended, and scenarios and nodes are replaced by name.
+    :param m: the model document, which is updated
+    :param scenario_path: the scenario definition file
+    :return: the model document
+    """
+    if not os.path.exists(scenario_path):
+        raise Exception('Scenario path {} does not exist.'.format(scenario_path))
+
+    with open(scenario_path) as f:
+        scenario_model = json.load(f)
+    for key, scenario_items in scenario_model.items():
+        if key in m:
+            if type(scenario_items) == dict:
+                m[key].update(scenario_items)
+            else:
+                m[key].extend(scenario_items)
+        elif key in ['scenarios', 'nodes']:
+            items = {item['name']: item for item in m.get(key, [])}
+            new_items = {item['name']: item for item in scenario_items}
+            items.update(new_items)
+            m[key] = list(items.values())
+
+    return m
+
+
+def prepare_model_document(m, basin, climates, start, end, scenario_paths=None, data_path=None,
+                           output_profile='full', stream_results=False):
+    """
+    Prepare a basin's base model document for a run: apply scenario definitions, point inputs to the data path and
+    climate, and set the dates and the recorders to save. Compiled models are cached by a hash of this module (see
+    sierra.utilities.cache), so changes here invalidate them.
+    :param m: the base model document, which is updated
+    :param basin:
+    :param climates: the climates run together (the first climate's inputs are used for all of them)
+    :param start:
+    :param end:
+    :param scenario_paths: scenario definition files to apply, in order
+    :param data_path:
+    :param output_profile: see sierra.utilities.output_profiles
+    :param stream_results: see sierra.utilities.streaming
+    :return: the model document
+    """
+    climate = climates[0]
+
+    for scenario_path in scenario_paths or []:
+        apply_scenario(m, scenario_path)
+
+    new_model_parts = {}
+    for model_part in ['tables', 'parameters']:
+        if model_part not in m:
+            continue
+        new_model_parts[model_part] = {}
+        for pname, param in m[model_part].items():
+            if 'observed' in pname.lower():
+                continue
+            url = param.get('url')
+            if url:
+                if data_path:
+                    url = url.replace('../data', data_path)
+                url = url.replace('historical/Livneh', climate)
+                param['url'] = url
+                if param.get('type', '').lower() == 'dataframe':
+                    # read from the hydrology store, if there is one
+                    param['type'] = 'HydrologyDataframe'
+            new_model_parts[model_part][pname] = param
+
+    m.update(new_model_parts)
+    m['timestepper']['start'] = start
+    m['timestepper']['end'] = end
+    apply_output_profile(m, output_profile, basin)
+    if stream_results:
+        stream_recorders(m, basin)
+    if len(climates) > 1:
+        add_climate_scenario(m, climates)
+
+    return m
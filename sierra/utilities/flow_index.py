@@ -0,0 +1,94 @@
+import numpy as np
+import pandas as pd
+
+
+class FlowIndex(object):
+    """
+    Cumulative sums of a daily flow series (e.g., runoff or full natural flow), for constant time sums over windows.
+
+    The sum of flows from row `start` to row `end` (inclusive) is the difference of two cumulative sums, rather than a
+    sum over a slice of the series. As with series.sum(), missing values are skipped. Columns of the series (e.g., one per climate) are mapped to scenarios, so that sums
+    are returned for all scenarios at once.
+    """
+
+    def __init__(self, series, scenario_columns=None):
+        """
+        :param series: a pandas Series or DataFrame with a sorted date index
+        :param scenario_columns: the column for each scenario global id (defaults to the first column)
+        """
+        values = np.asarray(series.values, np.float64)
+        if values.ndim == 1:
+            values = values.reshape(-1, 1)
+
+        self.index = pd.DatetimeIndex(series.index)
+        self.size = len(self.index)
+        self.cumsum = np.zeros((self.size + 1, values.shape[1]))
+        # missing values are skipped, as with series.sum(), rather than carried into every later sum
+        np.nancumsum(values, axis=0, out=self.cumsum[1:])
+        self.scenario_columns = np.zeros(1, int) if scenario_columns is None else np.asarray(scenario_columns, int)
+
+    def offset(self, date, side='left'):
+        """
+        Get the row of a date.
+        :param date:
+        :param side: 'left' for the first row on or after the date, or 'right' for the last row on or before the date
+        :return: the row
+        """
+        row = self.index.searchsorted(pd.Timestamp(date), side=side)
+        return row if side == 'left' else row - 1
+
+    def window_sum(self, start, end):
+        """
+        Sum the flows from row start to row end, inclusive. Rows outside the series are ignored.
+        :param start:
+        :param end:
+        :return: an array of sums, indexed by scenario global id
+        """
+        start = max(start, 0)
+        end = min(end, self.size - 1)
+        if end < start:
+            return np.zeros(len(self.scenario_columns))
+        return (self.cumsum[end + 1] - self.cumsum[start])[self.scenario_columns]
+
+    def date_window_sum(self, start, end):
+        """
+        Sum the flows from the start date to the end date, inclusive, as with series[start:end].sum().
+        :param start:
+        :param end:
+        :return: an array of sums, indexed by scenario global id
+        """
+        return self.window_sum(self.offset(start), self.offset(end, side='right'))
+
+
+def get_flow_index(model, name):
+    """
+    Get the flow index of a dataframe parameter or a model table, building it the first time it is requested.
+    The index is shared by all parameters in the model.
+    :param model: a Pywr model
+    :param name: the parameter or table name
+    :return: the FlowIndex
+    """
+    flow_indexes = getattr(model, 'flow_indexes', None)
+    if flow_indexes is None:
+        flow_indexes = model.flow_indexes = {}
+
+    flow_index = flow_indexes.get(name)
+    if flow_index is None:
+        if name in model.parameters:
+            series = model.parameters[name].dataframe
+        else:
+            series = model.tables[name]
+
+        # inputs with more than one column are indexed by the climate scenario (see sierra.utilities.climates)
+        scenario_columns = None
+        if isinstance(series, pd.DataFrame) and len(series.columns) > 1:
+            climate_scenario = getattr(model, 'climate_scenario', None)
+            if climate_scenario is None:
+                raise Exception('Flow input {} must have one column, or one per climate'.format(name))
+            scenario_columns = [s.indices[climate_scenario] for s in model.scenarios.combinations]
+        elif len(model.scenarios.combinations) > 1:
+            scenario_columns = [0] * len(model.scenarios.combinations)
+
+        flow_index = flow_indexes[name] = FlowIndex(series, scenario_columns)
+
+    return flow_index
@@ -0,0 +1,236 @@
+import os
+import re
+import json
+
+import numpy as np
+import pandas as pd
+from pywr.dataframe_tools import load_dataframe as pywr_load_dataframe
+from loguru import logger
+
+# the store is a folder in each climate's hydrology folder (e.g., <basin>/hydrology/historical/Livneh/store)
+STORE_DIRNAME = 'store'
+MANIFEST_FILENAME = 'manifest.json'
+
+# climate hydrology subfolders with daily or monthly time series that parameters read
+STORE_FOLDERS = ['runoff', 'runoff_aggregated', 'runoff_monthly_forecasts', 'preprocessed', 'precipitation']
+
+# options of dataframe parameters that can be served from the store; others are read from the CSV file
+STORE_OPTIONS = {'index_col': [0], 'parse_dates': [True, [0]], 'header': [0], 'squeeze': [True, False]}
+
+climate_path_pattern = re.compile(r'^(.*[\\/]hydrology[\\/][^\\/]+[\\/][^\\/]+)[\\/](.+)$')
+
+# stores opened by this process, by climate path
+_stores = {}
+
+
+def _file_stamp(path):
+    # nanoseconds, so that a file rewritten within a second (with the same size) is not taken to be unchanged
+    stat = os.stat(path)
+    return [stat.st_size, stat.st_mtime_ns]
+
+
+def _is_store_option(option, value):
+    """
+    Check whether a read option can be served from the store. Values are compared by type as well, since False == 0.
+    :param option:
+    :param value:
+    :return:
+    """
+    return option in STORE_OPTIONS and any(
+        value is v or (type(value) is type(v) and value == v) for v in STORE_OPTIONS[option])
+
+
+def _read_csv(path):
+    """
+    Read a hydrology CSV file for the store.
+    :param path:
+    :return: a DataFrame with a DatetimeIndex and a frequency, or None if the file cannot be stored
+    """
+    df = pd.read_csv(path, index_col=0, header=0, parse_dates=True)
+    if not isinstance(df.index, pd.DatetimeIndex) or len(df.index) < 3 or not len(df.columns):
+        return None
+    if not all(pd.api.types.is_numeric_dtype(dtype) for dtype in df.dtypes):
+        return None
+    if not all(isinstance(c, str) for c in df.columns) or len(set(df.columns)) != len(df.columns):
+        return None
+    if pd.infer_freq(df.index) is None:
+        return None
+    return df
+
+
+def build_store(climate_path, folders=None):
+    """
+    Build the binary store of a climate's hydrology: the CSV files in each folder are combined into one array per
+    distinct date index, saved as a NumPy file that is memory-mapped when read. The manifest records, for each CSV
+    file, its array, its columns and the file's size and modification time (so that files changed since the store was
+    built are read from CSV instead).
+    :param climate_path: the climate's hydrology folder
+    :param folders: the folders to store (defaults to STORE_FOLDERS)
+    :return: the manifest
+    """
+    store_path = os.path.join(climate_path, STORE_DIRNAME)
+    if not os.path.exists(store_path):
+        os.makedirs(store_path)
+
+    groups = []
+    files = {}
+    for folder in folders or STORE_FOLDERS:
+        folder_path = os.path.join(climate_path, folder)
+        if not os.path.isdir(folder_path):
+            continue
+        for filename in sorted(os.listdir(folder_path)):
+            if not filename.endswith('.csv'):
+                continue
+            path = os.path.join(folder_path, filename)
+            try:
+                df = _read_csv(path)
+            except Exception as err:
+                logger.warning('{} not stored: {}'.format(path, err))
+                continue
+            if df is None:
+                continue
+
+            for i, group in enumerate(groups):
+                if group['index'].equals(df.index):
+                    break
+            else:
+                i = len(groups)
+                groups.append({'index': df.index, 'freq': pd.infer_freq(df.index), 'dfs': []})
+            group = groups[i]
+            offset = sum(len(group_df.columns) for group_df in group['dfs'])
+            group['dfs'].append(df)
+            files['/'.join([folder, filename])] = {
+                'group': i,
+                'offset': offset,
+                'columns': list(df.columns),
+                'stamp': _file_stamp(path)
+            }
+
+    manifest = {'groups': [], 'files': files}
+    for i, group in enumerate(groups):
+        values = np.concatenate([df.values.astype(np.float64) for df in group['dfs']], axis=1)
+        np.save(os.path.join(store_path, '{}.npy'.format(i)), values)
+        np.save(os.path.join(store_path, '{}_dates.npy'.format(i)), group['index'].values.astype('datetime64[D]'))
+        manifest['groups'].append({'freq': group['freq'], 'shape': list(values.shape)})
+
+    # the manifest is written last, so that a partly built store is not used
+    with open(os.path.join(store_path, MANIFEST_FILENAME), 'w') as f:
+        json.dump(manifest, f)
+
+    return manifest
+
+
+class HydrologyStore(object):
+    """
+    A climate's hydrology store (see build_store), with arrays memory-mapped on first use.
+    """
+
+    def __init__(self, climate_path):
+        self.climate_path = climate_path
+        self.store_path = os.path.join(climate_path, STORE_DIRNAME)
+        with open(os.path.join(self.store_path, MANIFEST_FILENAME)) as f:
+            manifest = json.load(f)
+        self.groups = manifest['groups']
+        self.files = manifest['files']
+        self._arrays = {}
+
+    def _group(self, i):
+        group = self._arrays.get(i)
+        if group is None:
+            values = np.load(os.path.join(self.store_path, '{}.npy'.format(i)), mmap_mode='r')
+            dates = np.load(os.path.join(self.store_path, '{}_dates.npy'.format(i)))
+            index = pd.DatetimeIndex(dates, freq=self.groups[i]['freq'])
+            group = self._arrays[i] = (values, index)
+        return group
+
+    def read(self, filename):
+        """
+        Read a file from the store.
+        :param filename: the file, relative to the climate folder (e.g., 'runoff_aggregated/SJN_01 mcm.csv')
+        :return: a DataFrame, or None if the file is not stored or has changed since the store was built
+        """
+        entry = self.files.get(filename)
+        if entry is None:
+            return None
+        path = os.path.join(self.climate_path, *filename.split('/'))
+        if not os.path.exists(path) or _file_stamp(path) != entry['stamp']:
+            return None
+
+        values, index = self._group(entry['group'])
+        offset = entry['offset']
+        columns = entry['columns']
+        return pd.DataFrame(values[:, offset:offset + len(columns)], index=index, columns=columns, copy=False)
+
+
+def get_store(climate_path):
+    """
+    Get a climate's hydrology store, if there is one.
+    :param climate_path:
+    :return: the HydrologyStore, or None
+    """
+    if climate_path not in _stores:
+        store = None
+        if os.path.exists(os.path.join(climate_path, STORE_DIRNAME, MANIFEST_FILENAME)):
+            try:
+                store = HydrologyStore(climate_path)
+            except Exception as err:
+                logger.warning('Hydrology store in {} not used: {}'.format(climate_path, err))
+        _stores[climate_path] = store
+    return _stores[climate_path]
+
+
+def read_stored(url, data):
+    """
+    Read an input from the hydrology store, with the same result as reading the CSV file with Pywr.
+    :param url: the input url
+    :param data: the input's read options (passed to pandas.read_csv by Pywr)
+    :return: a DataFrame or Series, or None if the input is not in a store
+    """
+    if not url.endswith('.csv'):
+        return None
+    for option, value in data.items():
+        if not _is_store_option(option, value):
+            return None
+    if data.get('index_col') != 0 or not data.get('parse_dates'):
+        return None
+
+    match = climate_path_pattern.match(url)
+    if not match:
+        return None
+    store = get_store(match.group(1))
+    if store is None:
+        return None
+    df = store.read(match.group(2).replace('\\', '/'))
+    if df is None:
+        return None
+
+    if data.get('squeeze') and len(df.columns) == 1:
+        df = df[df.columns[0]]
+    return df
+
+
+def load_dataframe(model, data):
+    """
+    Load a dataframe input, as with Pywr's load_dataframe, from the hydrology store where possible.
+    :param model: the Pywr model
+    :param data: the input definition, which is consumed as by Pywr
+    :return: a DataFrame or Series
+    """
+    url = data.get('url')
+    if url is not None and 'table' not in data and 'index' not in data and 'filetype' not in data:
+        if not os.path.isabs(url) and model.path is not None:
+            url = os.path.join(model.path, url)
+        read_options = {k: v for k, v in data.items() if k not in ['url', 'column', 'comment', 'checksum']}
+        df = None if 'checksum' in data else read_stored(url, read_options)
+        if df is not None:
+            column = data.pop('column', None)
+            # as with Pywr, read options are consumed
+            data.clear()
+            if column is not None:
+                try:
+                    df = df[column]
+                except KeyError:
+                    raise KeyError('Column "{}" not found in dataset "{}"'.format(column, url))
+            return df
+
+    return pywr_load_dataframe(model, data)
@@ -0,0 +1,141 @@
+import os
+import json
+from functools import lru_cache
+
+import pandas as pd
+
+from sierra.utilities.climates import climate_dates
+
+MODELS_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'models')
+RUNTIME_HISTORY_FILENAME = 'runtime_history.csv'
+RUNTIME_HISTORY_COLUMNS = ['date', 'run_name', 'basin', 'climate', 'num_climates', 'years', 'include_planning',
+                           'seconds']
+
+# a priori cost of a run, until there is a history of runtimes
+SECONDS_PER_NODE_YEAR = 0.1
+PLANNING_COST_FACTOR = 2.0
+
+# basins without a planning model (see run_basin_model)
+NO_PLANNING_BASINS = ['merced', 'tuolumne']
+
+
+@lru_cache(maxsize=None)
+def basin_size(basin):
+    """
+    Get the size of a basin model, as its number of nodes.
+    :param basin:
+    :return: the number of nodes
+    """
+    with open(os.path.join(MODELS_PATH, basin, 'pywr_model.json')) as f:
+        return len(json.load(f)['nodes'])
+
+
+def run_years(climate, start=None, end=None):
+    """
+    Get the number of years a climate is run for.
+    :param climate: the climate (or list of climates, with the same dates)
+    :param start: the start date, if not the climate's default
+    :param end: the end date, if not the climate's default
+    :return: years
+    """
+    climate = climate if isinstance(climate, str) else climate[0]
+    if start is None or end is None:
+        start, end = climate_dates(climate)
+    return (pd.Timestamp(end) - pd.Timestamp(start)).days / 365.25
+
+
+def job_features(climate, basin, start=None, end=None, include_planning=False):
+    """
+    Get the features of a job (a model run) that its cost depends on.
+    :param climate: the climate (or list of climates, run together as a scenario)
+    :param basin:
+    :param start:
+    :param end:
+    :param include_planning:
+    :return: a dict
+    """
+    return {
+        'basin': basin,
+        'climate': climate if isinstance(climate, str) else climate[0],
+        'num_climates': 1 if isinstance(climate, str) else len(climate),
+        'years': run_years(climate, start, end),
+        'include_planning': bool(include_planning) and basin not in NO_PLANNING_BASINS
+    }
+
+
+class JobCostEstimator(object):
+    """
+    Estimates of the runtime of model runs, for scheduling.
+
+    Without a history of runtimes, the cost of a run is proportional to years x climates x basin size, and higher with
+    the planning model. Past runtimes refine this: a basin's seconds per climate-year (with or without planning) are
+    used where there is a history for the basin, and the a priori cost is scaled by the median ratio of actual to a
+    priori runtimes otherwise.
+    """
+
+    def __init__(self, history=None):
+        """
+        :param history: a DataFrame of past runtimes (see load_runtime_history)
+        """
+        self.rates = {}
+        self.scale = 1.0
+        if history is not None and len(history):
+            history = history.dropna(subset=['seconds'])
+            history = history[history['years'] > 0]
+        if history is None or not len(history):
+            return
+
+        climate_years = history['years'] * history['num_climates']
+        rates = (history['seconds'] / climate_years).groupby([history['basin'], history['include_planning']]).median()
+        self.rates = rates.to_dict()
+        prior = [self.prior_rate(basin, planning) for basin, planning in zip(history['basin'],
+                                                                              history['include_planning'])]
+        self.scale = (history['seconds'] / climate_years / prior).median()
+
+    @staticmethod
+    def prior_rate(basin, include_planning):
+        rate = SECONDS_PER_NODE_YEAR * basin_size(basin)
+        return rate * PLANNING_COST_FACTOR if include_planning else rate
+
+    def estimate(self, features):
+        """
+        Estimate the runtime of a job.
+        :param features: the job's features (see job_features)
+        :return: seconds
+        """
+        key = (features['basin'], features['include_planning'])
+        rate = self.rates.get(key)
+        if rate is None:
+            rate = self.prior_rate(*key) * self.scale
+        return rate * features['years'] * features['num_climates']
+
+
+def load_runtime_history(path):
+    """
+    Load the history of runtimes.
+    :param path: the history file
+    :return: a DataFrame, or None if there is no history
+    """
+    if not os.path.exists(path):
+        return None
+    history = pd.read_csv(path)
+    history['include_planning'] = history['include_planning'].astype(bool)
+    return history
+
+
+def save_runtimes(path, runtimes):
+    """
+    Add runtimes to the history.
+    :param path: the history file
+    :param runtimes: a list of dicts, with job features, 'run_name' and 'seconds'
+    :return:
+    """
+    if not runtimes:
+        return
+    df = pd.DataFrame(runtimes)
+    df['date'] = pd.Timestamp.now().strftime('%Y-%m-%d %H:%M:%S')
+    df = df[RUNTIME_HISTORY_COLUMNS]
+    dirname = os.path.dirname(path)
+    if dirname and not os.path.exists(dirname):
+        os.makedirs(dirname)
+    df.to_csv(path, mode='a', header=not os.path.exists(path), index=False)
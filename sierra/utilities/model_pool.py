@@ -0,0 +1,184 @@
+import json
+from collections import OrderedDict
+from time import perf_counter
+
+import pandas as pd
+from loguru import logger
+
+from sierra.utilities.climates import climate_parameter_types
+from sierra.utilities.hydrology_store import load_dataframe
+from sierra.utilities.tables import prepare_table
+
+# loaded models kept by this process (e.g., a dask worker), one set of models per basin and model options
+MAX_POOLED_MODELS = 4
+
+# parameter keys that are not read options of the parameter's input
+PARAMETER_KEYS = ['type', 'name', 'comment', 'scenario']
+
+_pool = OrderedDict()
+
+
+def climate_inputs(m, climate):
+    """
+    Find the climate-dependent inputs of a model document: tables and dataframe parameters with urls in the climate's
+    hydrology folder, and dataframe parameters that read climate-dependent tables.
+    :param m: the model document
+    :param climate: the climate the document was prepared for
+    :return: a dict of table definitions and a dict of parameter definitions, by name
+    :raises ValueError: if the model has climate-dependent inputs that cannot be replaced
+    """
+    tables = {name: table for name, table in m.get('tables', {}).items() if climate in table.get('url', '')}
+    parameters = {}
+    for name, param in m.get('parameters', {}).items():
+        if not isinstance(param, dict):
+            continue
+        if climate not in param.get('url', '') and param.get('table') not in tables:
+            continue
+        if param.get('type', '').lower() not in climate_parameter_types:
+            raise ValueError('Parameter {} ({}) has climate inputs'.format(name, param.get('type')))
+        if 'climate_urls' in param:
+            raise ValueError('Parameter {} reads inputs for more than one climate'.format(name))
+        parameters[name] = param
+
+    # inputs defined elsewhere (e.g., parameters defined within nodes) are not found by name
+    values = [m.get('nodes', []), m.get('recorders', {})] + [p for p in m.get('parameters', {}).values()
+                                                             if p not in parameters.values()]
+    while values:
+        value = values.pop()
+        if isinstance(value, dict):
+            if climate in value.get('url', '') or value.get('table') in tables:
+                raise ValueError('Climate inputs of {} cannot be replaced'.format(value.get('name', 'a component')))
+            values.extend(value.values())
+        elif isinstance(value, list):
+            values.extend(value)
+
+    return tables, parameters
+
+
+def setup_components(model):
+    """
+    Set up a model's nodes and components, as with Model.setup, but without setting up the solver again. The solver
+    depends only on the network and scenarios, which do not change when climate inputs are replaced.
+    :param model: the Pywr model
+    :return:
+    """
+    model.timestepper.setup()
+    model.scenarios.setup()
+    model.timestepper.reset()
+    for node in model.graph.nodes():
+        node.setup(model)
+    for component in model.flatten_component_tree(rebuild=False):
+        component.setup()
+    model.reset()
+
+
+class PooledModels(object):
+    """
+    Models of a basin (the daily model and, if any, the planning model), loaded for one climate, that can be run again
+    for another climate by replacing their climate inputs.
+
+    Only inputs are replaced: model state is reset as for any other run (see Model.reset), so parameters must not keep
+    state that their reset methods do not clear.
+    """
+
+    def __init__(self, climate, models, documents):
+        """
+        :param climate: the climate the models were loaded for
+        :param models: the Pywr models
+        :param documents: the model documents (or their file paths), in the same order
+        """
+        self.climate = climate
+        self.document_climate = climate
+        self.models = models
+        self.inputs = []
+        for m in documents:
+            if isinstance(m, str):
+                with open(m) as f:
+                    m = json.load(f)
+            self.inputs.append(climate_inputs(m, climate))
+
+    def replace_climate(self, climate, start, end):
+        """
+        Replace the models' climate inputs and dates, and set up the models to run.
+        :param climate: the new climate
+        :param start: the new start date
+        :param end: the new end date
+        :return:
+        """
+        # urls are replaced in the documents the models were loaded from
+        for model, (tables, parameters) in zip(self.models, self.inputs):
+            for name, table in tables.items():
+                url = table['url'].replace(self.document_climate, climate)
+                model.tables[name] = load_dataframe(model, dict(table, url=url))
+                table_array = prepare_table(model.tables[name])
+                if table_array is not None:
+                    model.table_arrays[name] = table_array
+                else:
+                    model.table_arrays.pop(name, None)
+
+            for name, param in parameters.items():
+                data = {k: v for k, v in param.items() if k not in PARAMETER_KEYS}
+                if 'url' in data:
+                    data['url'] = data['url'].replace(self.document_climate, climate)
+                model.parameters[name].dataframe = load_dataframe(model, data)
+
+            # indexes built from the previous climate's inputs are rebuilt when parameters next use them
+            model.flow_indexes = {}
+            model.energy_price_index = None
+
+            model.timestepper.start = pd.Timestamp(start)
+            model.timestepper.end = pd.Timestamp(end)
+            model.blocks = {}
+            setup_components(model)
+
+        self.climate = climate
+
+
+def pool_models(key, climate, models, documents):
+    """
+    Keep models loaded by this process, to run for other climates (see get_pooled_models).
+    :param key: the key of the models (e.g., from model_cache_key, without the climate and dates)
+    :param climate: the climate the models were last run for
+    :param models: the Pywr models, or PooledModels
+    :param documents: the model documents, if models are not PooledModels
+    :return:
+    """
+    if isinstance(models, PooledModels):
+        pooled = models
+    else:
+        try:
+            pooled = PooledModels(climate, models, documents)
+        except ValueError as err:
+            logger.info('Models are not reused: {}'.format(err))
+            return
+
+    _pool[key] = pooled
+    _pool.move_to_end(key)
+    while len(_pool) > MAX_POOLED_MODELS:
+        _pool.popitem(last=False)
+
+
+def get_pooled_models(key, climate, start, end):
+    """
+    Get models loaded by this process for another climate, with this climate's inputs and dates. Models are removed
+    from the pool while they are used, and should be returned to it with pool_models after a successful run.
+    :param key: the key of the models
+    :param climate: the climate
+    :param start:
+    :param end:
+    :return: PooledModels, or None if there are none to reuse
+    """
+    pooled = _pool.pop(key, None)
+    if pooled is None:
+        return None
+
+    t0 = perf_counter()
+    try:
+        pooled.replace_climate(climate, start, end)
+    except Exception as err:
+        # e.g., missing inputs; the models are loaded from scratch, which will report any error
+        logger.warning('Could not reuse models for {}: {}'.format(climate, err))
+        return None
+    logger.info('Reusing loaded models with {} inputs ({:.1f} seconds)'.format(climate, perf_counter() - t0))
+
+    return pooled
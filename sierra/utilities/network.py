@@ -1,11 +1,11 @@
 import os
 import json
+import heapq
 
 
 def simplify_network(m, scenario_path=None, basin=None, climate=None, delete_gauges=False, delete_observed=True, delete_scenarios=False,
                      aggregate_runoff=True, create_graphs=False):
     # simplify the network
-    mission_complete = False
     obsolete_gauges = []
 
     if delete_scenarios:
@@ -18,82 +18,132 @@ def simplify_network(m, scenario_path=None, basin=None, climate=None, delete_gau
         #         scenarios.append(scen)
         # m['scenarios'] = scenarios
         m.pop('scenarios', None)
+    node_lookup = {n['name']: n for n in m['nodes']}
+    node_positions = {n['name']: i for i, n in enumerate(m['nodes'])}
+
+    # Index the network as an ordered edge list with adjacency sets, so that nodes can be removed without rescanning
+    # the whole network. Edges are kept in the same order as the edge list (existing edges first, followed by new edges
+    # in the order they are created), so the output is the same as if the edge list were rebuilt after each removal.
+    edge_order = {}  # edge -> order key
+    edge_counts = {}  # edge -> number of times it appears in the edge list
+    in_edges = {n: set() for n in node_lookup}
+    out_edges = {n: set() for n in node_lookup}
+    next_key = 0
+
+    def add_edge(edge):
+        nonlocal next_key
+        if edge in edge_order:
+            return
+        edge_order[edge] = next_key
+        edge_counts[edge] = 1
+        next_key += 1
+        a, b = edge
+        out_edges.setdefault(a, set()).add(edge)
+        in_edges.setdefault(b, set()).add(edge)
+
+    def remove_edge(edge):
+        del edge_order[edge]
+        del edge_counts[edge]
+        a, b = edge
+        out_edges[a].discard(edge)
+        in_edges[b].discard(edge)
+
+    def in_degree(node_name):
+        return sum(edge_counts[e] for e in in_edges.get(node_name, ()))
+
+    def out_degree(node_name):
+        return sum(edge_counts[e] for e in out_edges.get(node_name, ()))
+
+    def ordered(edges):
+        return sorted(edges, key=edge_order.get)
+
+    for a, b in m['edges']:
+        if (a, b) in edge_order:
+            edge_counts[(a, b)] += 1
+        else:
+            add_edge((a, b))
+
+    node_info = {}
+    for node in m['nodes']:
+        node_info[node['name']] = (node['type'].lower(), json.loads(node.get('comment', '{}')), set(node.keys()))
+
+    def get_removal(node_name):
+        """Determine if and how a node can be removed, given the current network"""
+        node = node_lookup[node_name]
+        node_type, metadata, keys_set = node_info[node_name]
+
+        # delete links adjacent to hydropower facilities
+        if len({'cost', 'max_flow'} & keys_set) >= 1 and out_degree(node_name) == 1 \
+                and in_degree(node_name) == 1 \
+                and 'hydropower' not in node_type \
+                and 'reservoir' not in node_type:
+            up_edge = ordered(in_edges[node_name])[0]
+            up_node = node_lookup[up_edge[0]]
+            up_type = up_node['type'].lower()
+            down_edge = ordered(out_edges[node_name])[0]
+            down_node = node_lookup[down_edge[1]]
+            down_type = down_node['type'].lower()
+            if 'hydropower' in up_type or 'hydropower' in down_type:
+                return [up_edge, down_edge], [(up_node['name'], down_node['name'])]
+
+        if keys_set in [{'name', 'type'}, {'name', 'type', 'comment'}] and not metadata.get('keep') \
+                or delete_gauges and node_type == 'rivergauge' \
+                or node_type == 'reservoir' and not node.get('max_volume'):
+            if in_degree(node_name) == 0:
+                # upstream-most node
+                down_edge = ordered(out_edges[node_name])[0]
+                return [down_edge], []
+            elif out_degree(node_name) == 1:
+                down_edge = ordered(out_edges[node_name])[0]
+                up_edges = ordered(in_edges[node_name])
+                return [down_edge] + up_edges, [(up_edge[0], down_edge[1]) for up_edge in up_edges]
+
+        return None
+
+    if delete_gauges:
+        obsolete_gauges = [n['name'] for n in m['nodes'] if n['type'].lower() == 'rivergauge']
+
+    # Remove nodes one at a time, always removing the first removable node in the node list. Only the nodes next to a
+    # removed node can change, so only those are checked again.
     obsolete_nodes = []
-
-    while not mission_complete:
-        mission_complete = True
-        up_nodes = []
-        down_nodes = []
-        up_edges = {}
-        down_edges = {}
-        for edge in m['edges']:
-            a, b = edge
-            up_nodes.append(a)
-            down_nodes.append(b)
-            down_edges[a] = [edge] if a not in down_edges else down_edges[a] + [edge]
-            up_edges[b] = [edge] if b not in up_edges else up_edges[b] + [edge]
-
-        obsolete_edges = []
-        new_edges = []
-
-        node_lookup = {n['name']: n for n in m['nodes']}
-
-        for node in m['nodes']:
-            # is the node a simple link? if so, we might be able to remove it
-            node_name = node['name']
-            node_type = node['type'].lower()
-            metadata = json.loads(node.get('comment', '{}'))
-            keys_set = set(node.keys())
-
-            # delete links adjacent to hydropower facilities
-            if len({'cost', 'max_flow'} & keys_set) >= 1 and up_nodes.count(
-                    node_name) == 1 \
-                    and down_nodes.count(node_name) == 1 \
-                    and 'hydropower' not in node_type \
-                    and 'reservoir' not in node_type:
-                up_edge = up_edges[node_name][0]
-                up_node = node_lookup[up_edge[0]]
-                up_type = up_node['type'].lower()
-                down_edge = down_edges[node_name][0]
-                down_node = node_lookup[down_edge[1]]
-                down_type = down_node['type'].lower()
-                # print(node_name, down_type)
-                if 'hydropower' in up_type or 'hydropower' in down_type:
-                    obsolete_nodes.append(node_name)
-                    obsolete_edges.extend([up_edge, down_edge])
-                    new_edges.append([up_node['name'], down_node['name']])
-                    mission_complete = False
-                    break
-
-            if keys_set in [{'name', 'type'}, {'name', 'type', 'comment'}] and not metadata.get('keep') \
-                    or delete_gauges and node_type == 'rivergauge' \
-                    or node_type == 'reservoir' and not node.get('max_volume'):
-                if delete_gauges and node_type == 'rivergauge':
-                    obsolete_gauges.append(node_name)
-                if down_nodes.count(node_name) == 0:
-                    # upstream-most node
-                    down_edge = down_edges[node_name][0]
-                    obsolete_nodes.append(node_name)
-                    obsolete_edges.append(down_edge)
-                    mission_complete = False
-                    break
-                elif up_nodes.count(node_name) == 1:
-                    down_edge = down_edges[node_name][0]
-                    obsolete_nodes.append(node_name)
-                    obsolete_edges.append(down_edge)
-                    for up_edge in up_edges[node_name]:
-                        obsolete_edges.append(up_edge)
-                        new_edges.append([up_edge[0], down_edge[1]])
-                    mission_complete = False
-                    break
-
-        m['nodes'] = [node for node in m['nodes'] if node['name'] not in obsolete_nodes]
-        m['edges'] = [edge for edge in m['edges'] if edge not in obsolete_edges] + new_edges
-        edges_set = []
-        for edge in m['edges']:
-            if edge not in edges_set:
-                edges_set.append(edge)
-        m['edges'] = edges_set
+    worklist = list(node_positions.values())
+    heapq.heapify(worklist)
+    node_names = [n['name'] for n in m['nodes']]
+    deduplicated = False
+    while worklist:
+        node_name = node_names[heapq.heappop(worklist)]
+        if node_name not in node_lookup:
+            continue
+        removal = get_removal(node_name)
+        if removal is None:
+            continue
+
+        obsolete_edges, new_edges = removal
+        affected = {node_name}
+        for edge in obsolete_edges + new_edges + list(in_edges[node_name] | out_edges[node_name]):
+            affected.update(edge)
+
+        obsolete_nodes.append(node_name)
+        del node_lookup[node_name]
+        for edge in set(obsolete_edges):
+            remove_edge(edge)
+        for edge in new_edges:
+            add_edge(edge)
+
+        # the edge list is deduplicated after the first removal
+        if not deduplicated:
+            for edge, count in edge_counts.items():
+                if count > 1:
+                    edge_counts[edge] = 1
+                    affected.update(edge)
+            deduplicated = True
+
+        for name in affected:
+            if name in node_lookup:
+                heapq.heappush(worklist, node_positions[name])
+
+    m['nodes'] = [node for node in m['nodes'] if node['name'] in node_lookup]
+    m['edges'] = [list(edge) for edge in ordered(edge_order)]
 
     # delete obsolete parameters and recorders
     obsolete_gauges_set = set(obsolete_gauges)
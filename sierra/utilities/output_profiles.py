@@ -0,0 +1,177 @@
+import os
+import re
+import json
+
+SIERRA_PATH = os.path.dirname(os.path.dirname(os.path.realpath(__file__)))
+
+# Output profiles select the recorders of a model, and how their results are aggregated. A profile is a list of rules,
+# and each recorder is kept according to the first rule that matches it (by attribute, node type and/or node name), or
+# removed if none does. A rule without aggregations keeps the recorder's daily results; otherwise, the recorder is
+# replaced by one recorder per [period, function] (see sierra.recorders.temporal).
+OUTPUT_PROFILES = {
+    # all recorders in the model, with daily results
+    'full': None,
+    'energy_only': [
+        {'attributes': ['energy']},
+    ],
+    'ensemble_summary': [
+        {'attributes': ['storage'], 'aggregations': [['monthly', 'mean'], ['water_year', 'min']]},
+        {'attributes': ['energy'], 'aggregations': [['monthly', 'sum'], ['water_year', 'sum']]},
+        {'attributes': ['flow'], 'node_types': ['InstreamFlowRequirement'],
+         'aggregations': [['water_year', 'sum'], ['water_year', 'min']]},
+    ],
+}
+
+# temporal recorder types that replace daily recorder types
+TEMPORAL_RECORDER_TYPES = {
+    'numpyarraynoderecorder': 'TemporalNodeRecorder',
+    'numpyarraystoragerecorder': 'TemporalStorageRecorder',
+    'numpyarraylevelrecorder': 'TemporalLevelRecorder',
+    'numpyarrayparameterrecorder': 'TemporalParameterRecorder',
+}
+
+# recorder types whose results can be streamed (see sierra.utilities.streaming)
+STREAMED_RECORDER_TYPES = [t.lower() for t in TEMPORAL_RECORDER_TYPES.values()] + ['hydropowerenergyrecorder']
+
+# daily recorder options that temporal recorders do not have
+DAILY_RECORDER_OPTIONS = ['temporal_agg_func']
+
+recorder_reference_pattern = re.compile(r'''recorders\[\s*["']([^"']+)["']\s*\]''')
+
+
+def get_output_profile(name):
+    """
+    Get the rules of an output profile.
+    :param name: the name of a profile in OUTPUT_PROFILES, or the path of a JSON file with a list of rules
+    :return: a list of rules, or None to keep all recorders as they are
+    """
+    if name in OUTPUT_PROFILES:
+        return OUTPUT_PROFILES[name]
+    if os.path.isfile(name):
+        with open(name) as f:
+            return json.load(f)
+    raise Exception('Output profile {} not recognized. Must be one of {} or a JSON file.'.format(
+        name, list(OUTPUT_PROFILES)))
+
+
+def required_recorders(basin):
+    """
+    Find the recorders that parameters read during a run, which are kept whatever the output profile.
+    :param basin:
+    :return: a set of recorder names
+    """
+    folders = [os.path.join(SIERRA_PATH, 'parameters'), os.path.join(SIERRA_PATH, 'base_parameters'),
+               os.path.join(SIERRA_PATH, 'models', basin, '_parameters')]
+    names = set()
+    for folder in folders:
+        if not os.path.isdir(folder):
+            continue
+        for filename in os.listdir(folder):
+            if filename.endswith('.py'):
+                with open(os.path.join(folder, filename)) as f:
+                    names.update(recorder_reference_pattern.findall(f.read()))
+    return names
+
+
+def _matches(rule, attr, node_name, node_type):
+    if 'attributes' in rule and attr not in rule['attributes']:
+        return False
+    if 'nodes' in rule and node_name not in rule['nodes']:
+        return False
+    if 'node_types' in rule and node_type.lower() not in [t.lower() for t in rule['node_types']]:
+        return False
+    return True
+
+
+def temporal_recorder(recorder, period, function):
+    """
+    Get the definition of a recorder that aggregates the results of a daily recorder.
+    :param recorder: the daily recorder definition
+    :param period: 'monthly' or 'water_year'
+    :param function: 'sum', 'mean', 'min' or 'max'
+    :return: the recorder definition
+    """
+    recorder_type = recorder['type'].lower()
+    if recorder_type == 'hydropowerenergyrecorder':
+        if function != 'sum':
+            raise Exception('Hydropower energy can only be aggregated as a sum, not {}'.format(function))
+        return dict(recorder, aggregation_period=period)
+    if recorder_type not in TEMPORAL_RECORDER_TYPES:
+        raise Exception('Recorders of type {} cannot be aggregated'.format(recorder['type']))
+
+    recorder = {k: v for k, v in recorder.items() if k not in DAILY_RECORDER_OPTIONS}
+    return dict(recorder, type=TEMPORAL_RECORDER_TYPES[recorder_type], period=period, function=function)
+
+
+def apply_output_profile(m, profile, basin):
+    """
+    Select and aggregate the recorders of a model document according to an output profile.
+
+    Recorders that parameters read (see required_recorders) are kept with their daily results, but are listed in the
+    document's metadata as unsaved_recorders if the profile would not keep them as they are.
+    :param m: the model document, which is updated
+    :param profile: the profile name (see get_output_profile)
+    :param basin:
+    :return: the model document
+    """
+    rules = get_output_profile(profile)
+    if rules is None:
+        return m
+
+    node_types = {node['name']: node.get('type', '') for node in m['nodes']}
+    required = required_recorders(basin)
+
+    recorders = {}
+    unsaved = []
+    for name, recorder in m.get('recorders', {}).items():
+        node_name, attr = name.split('/', 1)
+        rule = None
+        for r in rules:
+            if _matches(r, attr, node_name, node_types.get(node_name, '')):
+                rule = r
+                break
+
+        aggregations = rule.get('aggregations') if rule else None
+        if rule is not None and not aggregations:
+            recorders[name] = recorder
+            continue
+        if name in required:
+            recorders[name] = recorder
+            unsaved.append(name)
+        for period, function in aggregations or []:
+            label = '{} {}'.format(period.replace('_', ' '), function)
+            recorders['{}/{} ({})'.format(node_name, attr, label)] = temporal_recorder(recorder, period, function)
+
+    m['recorders'] = recorders
+    m['metadata'] = dict(m.get('metadata', {}), output_profile=profile, unsaved_recorders=unsaved)
+
+    return m
+
+
+def stream_recorders(m, basin):
+    """
+    Replace the daily recorders of a model document with temporal recorders of daily values, whose results can be
+    streamed to disk as the model runs (see sierra.utilities.streaming). Recorders that parameters read are not
+    streamed, as they need all of their results in memory.
+
+    The recorders to stream are listed in the document's metadata as streamed_recorders.
+    :param m: the model document, which is updated
+    :param basin:
+    :return: the model document
+    """
+    required = required_recorders(basin)
+
+    streamed = []
+    for name, recorder in m.get('recorders', {}).items():
+        if name in required:
+            continue
+        recorder_type = recorder['type'].lower()
+        if recorder_type in TEMPORAL_RECORDER_TYPES:
+            m['recorders'][name] = temporal_recorder(recorder, 'daily', 'sum')
+        elif recorder_type not in STREAMED_RECORDER_TYPES:
+            continue
+        streamed.append(name)
+
+    m['metadata'] = dict(m.get('metadata', {}), streamed_recorders=streamed)
+
+    return m
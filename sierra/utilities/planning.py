@@ -1,5 +1,7 @@
 import json
+from collections import deque
 from sierra.utilities import simplify_network
+from sierra.utilities.climates import add_climate_scenario
 
 RIM_DAMS = {
     'stanislaus': 'New Melones Lake',
@@ -25,24 +27,25 @@ PARAMETERS_TO_REMOVE = {
 
 
 def prepare_planning_model(m, basin, climate, outpath, steps=12, blocks=8, parameters_to_expand=None, debug=False,
-                           remove_rim_dams=False):
+                           remove_rim_dams=False, climates=None):
     """
     Convert the daily scheduling model to a planning model.
     :param m:
-    :param outpath:
+    :param outpath: path to save the planning model to; if None, the model is only returned
     :param steps:
     :param blocks:
     :param parameters_to_expand:
     :param debug:
     :param include_rim_dams: Not used.
-    :return:
+    :param climates: climates to run together as a scenario, if any
+    :return: the planning model
     """
     # update time step
     # m['timestepper']['end'] = m['timestepper']['start']
     # m['timestepper']['timestep'] = 'M'
     # m['metadata']['title'] += ' - planning'
 
-    parameters_to_expand = PARAMETERS_TO_EXPAND.get(basin, []) + PARAMETERS_TO_EXPAND.get('common', [])
+    parameters_to_expand = set(PARAMETERS_TO_EXPAND.get(basin, []) + PARAMETERS_TO_EXPAND.get('common', []))
 
     m = simplify_network(m, basin=basin, climate=climate, delete_gauges=True, delete_observed=True,
                          delete_scenarios=False)
@@ -62,8 +65,8 @@ def prepare_planning_model(m, basin, climate, outpath, steps=12, blocks=8, param
 
     gauges = {}
 
-    parameters_to_expand = parameters_to_expand or []
-    parameters_to_delete = []
+    parameters_to_expand = parameters_to_expand or set()
+    parameters_to_delete = set()
     # black_list = ['min_volume', 'max_volume']
     black_list = ['max_volume']
     storage_recorders = {}
@@ -71,15 +74,19 @@ def prepare_planning_model(m, basin, climate, outpath, steps=12, blocks=8, param
     if remove_rim_dams:
         rim_dam = RIM_DAMS.get(basin)
         parameters_to_remove = PARAMETERS_TO_REMOVE.get(basin, [])
-        downstream_nodes = []
-        downstream_edges = []
-        finished = False
-        while not finished:
-            finished = True
-            for n1, n2 in m['edges']:
-                if (n1 == rim_dam or n1 in downstream_nodes) and n2 not in downstream_nodes:
-                    downstream_nodes.append(n2)
-                    finished = False
+
+        # find all nodes downstream of the rim dam
+        down_nodes = {}
+        for n1, n2 in m['edges']:
+            down_nodes.setdefault(n1, []).append(n2)
+        downstream_nodes = set()
+        queue = deque([rim_dam])
+        while queue:
+            for n2 in down_nodes.get(queue.popleft(), []):
+                if n2 not in downstream_nodes:
+                    downstream_nodes.add(n2)
+                    queue.append(n2)
+
         m['nodes'] = [n for n in m['nodes'] if n['name'] not in downstream_nodes]
         m['edges'] = [e for e in m['edges'] if e[1] not in downstream_nodes and e[0]]
         for section in ['parameters', 'recorders']:
@@ -114,8 +121,7 @@ def prepare_planning_model(m, basin, climate, outpath, steps=12, blocks=8, param
             if node_type == 'Reservoir' and key == 'cost':
                 continue
             if type(value) == str and value in m['parameters']:
-                if value not in parameters_to_expand:
-                    parameters_to_expand.append(value)
+                parameters_to_expand.add(value)
 
         res_class = 'network'
         # res_name = 'network'
@@ -178,8 +184,7 @@ def prepare_planning_model(m, basin, climate, outpath, steps=12, blocks=8, param
                 if 'min_volume' in node:
                     min_volume = node['min_volume']
                     if type(min_volume) == str:
-                        if min_volume not in parameters_to_expand:
-                            parameters_to_expand.append(min_volume)
+                        parameters_to_expand.add(min_volume)
                         min_volume += month
                     storage_link['min_flow'] = min_volume
                 if 'max_volume' in node:
@@ -187,8 +192,7 @@ def prepare_planning_model(m, basin, climate, outpath, steps=12, blocks=8, param
                 cost = node.get('cost', None)
                 if cost:
                     if type(cost) == str:
-                        if cost not in parameters_to_expand:
-                            parameters_to_expand.append(cost)
+                        parameters_to_expand.add(cost)
                         cost += '/{}'.format(t)
                     storage_link['cost'] = cost
                 # for now, set cost to zero (by omission)
@@ -251,8 +255,7 @@ def prepare_planning_model(m, basin, climate, outpath, steps=12, blocks=8, param
                     if type(value) == str and value in m['parameters']:
                         if key not in black_list:
                             new_node[key] += month
-                            if value not in parameters_to_expand:
-                                parameters_to_expand.append(value)
+                            parameters_to_expand.add(value)
 
                     elif type(value) in [float, int]:
                         if key in ["max_flow", "turbine_capacity"]:
@@ -263,8 +266,7 @@ def prepare_planning_model(m, basin, climate, outpath, steps=12, blocks=8, param
                         new_values = []
                         for j, v in enumerate(value):
                             if type(v) == str:
-                                if v not in parameters_to_expand:
-                                    parameters_to_expand.append(v)
+                                parameters_to_expand.add(v)
                                 parts = v.split('/')
                                 if j == 0 or len(parts) == 2:
                                     for b in range(blocks):
@@ -305,13 +307,13 @@ def prepare_planning_model(m, basin, climate, outpath, steps=12, blocks=8, param
                 updated_node_names.get(new_n2, new_n2),
             ])
 
-    block_params_expanded = []
+    block_params_expanded = set()
 
     for param_name, param in m['parameters'].items():
         if 'control_curves' in param:
             for cc in param['control_curves']:
-                if type(cc) == str and cc not in parameters_to_expand:
-                    parameters_to_expand.append(cc)
+                if type(cc) == str:
+                    parameters_to_expand.add(cc)
 
     for param_name in m['parameters']:
 
@@ -347,7 +349,7 @@ def prepare_planning_model(m, basin, climate, outpath, steps=12, blocks=8, param
                     block_param = (res_name, attribute, t)
                     if block_param in block_params_expanded:
                         continue  # continue if we have
-                    block_params_expanded.append(block_param)
+                    block_params_expanded.add(block_param)
 
                 new_param = param.copy()
                 if attribute == 'Runoff':
@@ -488,6 +490,33 @@ def prepare_planning_model(m, basin, climate, outpath, steps=12, blocks=8, param
     m['parameters'] = new_parameters
     m['recorders'] = new_recorders
 
-    with open(outpath, 'w') as f:
-        json.dump(m, f, indent=4)
-    return
+    if climates:
+        add_climate_scenario(m, climates)
+
+    if outpath:
+        with open(outpath, 'w') as f:
+            json.dump(m, f, indent=4)
+
+    return m
+
+
+def roll_planning_model(model, start):
+    """
+    Advance the planning model to a new start date, keeping the solver's basis.
+
+    This resets nodes, parameters and recorders as `model.reset(start=...)` does, so planning results are the same,
+    but does not reset the solver, which would discard its basis. Since the planning problem only differs in its
+    bounds and costs from one month to the next, the previous basis is a warm start for the next solve. If the
+    timestepper's length changes, components need to be set up again, so the model is fully reset.
+    :param model: The planning model
+    :param start: The new start date (i.e., the first of the month)
+    :return:
+    """
+    length_changed = model.timestepper.reset(start=start)
+    if length_changed:
+        model.reset(start=start)
+        return
+    for node in model.nodes:
+        node.reset()
+    for component in model.flatten_component_tree(rebuild=False):
+        component.reset()
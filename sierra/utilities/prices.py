@@ -0,0 +1,109 @@
+from calendar import isleap
+
+import numpy as np
+import pandas as pd
+
+
+class EnergyPriceIndex(object):
+    """
+    Hourly energy prices, indexed for fast threshold and production hour lookups.
+
+    The prices table ("All Energy Price Values") has one row per day, with dates formatted as YYYY-MM-DD, and one column
+    per hour. Prices are sorted once here, so that the monthly price threshold is a simple index into the month's sorted
+    prices and the daily production hours count is a binary search on the day's sorted prices.
+    """
+
+    def __init__(self, prices):
+        dates = pd.to_datetime(prices.index)
+
+        self.prices = prices.values.astype(np.float64)
+        self.rows = {(d.year, d.month, d.day): i for i, d in enumerate(dates)}
+
+        # daily prices, sorted in ascending order
+        self.daily_sorted = np.sort(self.prices, axis=1)
+
+        # monthly prices, sorted in descending order
+        self.monthly_sorted = {}
+        self._years = dates.year.values
+        self._months = dates.month.values
+        self._days = dates.day.values
+        for year, month in set(zip(self._years, self._months)):
+            self.monthly_sorted[(year, month, None)] = self._sort_month(year, month)
+
+    def _sort_month(self, year, month, ndays=None):
+        mask = (self._years == year) & (self._months == month)
+        if ndays is not None:
+            mask &= self._days <= ndays
+        month_prices = self.prices[mask].flatten()
+        return -np.sort(-month_prices)
+
+    def row(self, price_year, month, day):
+        """
+        Get the row of the prices table for a date, with the date's year replaced by the price year.
+        As with the original string-based lookup, Feb. 29 is mapped to Feb. 28.
+        """
+        if month == 2 and day == 29:
+            day = 28
+        return self.rows[(price_year, month, day)]
+
+    def month_prices(self, price_year, month, end_day):
+        """
+        Get the hourly prices for a price year and month, sorted in descending order.
+        :param price_year:
+        :param month:
+        :param end_day: the last day of the simulated month
+        :return:
+        """
+        if month == 2 and (end_day == 28 or not isleap(price_year)):
+            # Feb. 29 is excluded if either the price year or the simulated year is not a leap year
+            key = (price_year, month, 28)
+        else:
+            key = (price_year, month, None)
+        if key not in self.monthly_sorted:
+            self.monthly_sorted[key] = self._sort_month(price_year, month, key[2])
+        return self.monthly_sorted[key]
+
+    def price_thresholds(self, price_year, month, end_day, release_fractions):
+        """
+        Calculate the price above which a powerhouse should generate, given the fraction of the month's turbine
+        capacity released in the planning model.
+        :param price_year:
+        :param month:
+        :param end_day: the last day of the simulated month
+        :param release_fractions: array of release fractions, one per scenario
+        :return: array of price thresholds
+        """
+        energy_prices = self.month_prices(price_year, month, end_day)
+        price_index = (len(energy_prices) * np.minimum(release_fractions, 1.0)).astype(int) - 1
+
+        # a negative index means no production this month (unlikely)
+        return np.where(price_index < 0, 1e6, energy_prices[np.maximum(price_index, 0)])
+
+    def production_hours(self, price_year, month, day, thresholds, block=1):
+        """
+        Count the hours in a day in which prices are at or above (block 1) or below (other blocks) the price threshold.
+        :param price_year:
+        :param month:
+        :param day:
+        :param thresholds: array of price thresholds, one per scenario
+        :param block:
+        :return: array of production hours
+        """
+        daily_prices = self.daily_sorted[self.row(price_year, month, day)]
+        below_threshold = np.searchsorted(daily_prices, thresholds, side='left')
+        if block == 1:
+            return len(daily_prices) - below_threshold
+        else:
+            return below_threshold - np.searchsorted(daily_prices, 0.0, side='right')
+
+
+def get_energy_price_index(model):
+    """
+    Get the energy price index for a model, building it the first time it is requested.
+    The index is shared by all parameters in the model.
+    """
+    price_index = getattr(model, 'energy_price_index', None)
+    if price_index is None:
+        price_index = EnergyPriceIndex(model.tables['All Energy Price Values'])
+        model.energy_price_index = price_index
+    return price_index
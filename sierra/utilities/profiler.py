@@ -0,0 +1,117 @@
+import os
+import json
+from time import perf_counter
+
+import pandas as pd
+
+PROFILE_FORMATS = ['csv', 'json']
+
+
+class ModelProfiler(object):
+    """
+    Call counts and cumulative times of model components (parameters, recorders, the solver and the planning model).
+
+    Components are instrumented by replacing their methods on the instance, so models that are not profiled are not
+    affected at all. Total time includes calls to other instrumented components (e.g., a parameter getting the value of
+    another parameter); self time does not.
+    """
+
+    def __init__(self):
+        self.stats = {}
+        self._child_seconds = []
+
+    def record(self, model_name, kind, name, seconds, self_seconds=None):
+        key = (model_name, kind, name)
+        stats = self.stats.get(key)
+        if stats is None:
+            stats = self.stats[key] = [0, 0.0, 0.0]
+        stats[0] += 1
+        stats[1] += seconds
+        stats[2] += seconds if self_seconds is None else self_seconds
+
+    def wrap(self, model_name, kind, name, method):
+        """
+        Wrap a method so that its calls are recorded.
+        :param model_name: 'daily' or 'planning'
+        :param kind: the component kind (e.g., 'parameter.value')
+        :param name: the component name
+        :param method: the bound method
+        :return: the wrapped method
+        """
+        child_seconds = self._child_seconds
+        record = self.record
+
+        def wrapper(*args, **kwargs):
+            child_seconds.append(0.0)
+            t0 = perf_counter()
+            try:
+                return method(*args, **kwargs)
+            finally:
+                seconds = perf_counter() - t0
+                children = child_seconds.pop()
+                if child_seconds:
+                    child_seconds[-1] += seconds
+                record(model_name, kind, name, seconds, seconds - children)
+
+        return wrapper
+
+    def instrument(self, model, model_name='daily'):
+        """
+        Instrument a model: the value and before methods of WaterLP parameters, the after method of custom (non-Pywr)
+        recorders, and the model's solve (and step, for the planning model).
+        :param model: the Pywr model
+        :param model_name: 'daily' or 'planning'
+        :return:
+        """
+        from sierra.base_parameters import WaterLPParameter
+
+        for parameter in model.parameters:
+            if isinstance(parameter, WaterLPParameter):
+                parameter.value = self.wrap(model_name, 'parameter.value', parameter.name, parameter.value)
+                parameter.before = self.wrap(model_name, 'parameter.before', parameter.name, parameter.before)
+
+        for recorder in model.recorders:
+            if not type(recorder).__module__.startswith('pywr'):
+                recorder.after = self.wrap(model_name, 'recorder.after', recorder.name, recorder.after)
+
+        model.solve = self.wrap(model_name, 'solver', model.solver.name, model.solve)
+        if model_name == 'planning':
+            model.step = self.wrap(model_name, 'model', 'step', model.step)
+
+    def report(self, total_seconds=None):
+        """
+        Get the profile, sorted by self time.
+        :param total_seconds: the total run time, to calculate each component's share of it
+        :return: a DataFrame
+        """
+        rows = [list(key) + stats for key, stats in self.stats.items()]
+        df = pd.DataFrame(rows, columns=['model', 'kind', 'name', 'calls', 'total_seconds', 'self_seconds'])
+        df['seconds_per_call'] = df['total_seconds'] / df['calls']
+        if total_seconds:
+            df['self_pct'] = df['self_seconds'] / total_seconds * 100
+        return df.sort_values('self_seconds', ascending=False).reset_index(drop=True)
+
+    def save(self, path, profile_format='csv', total_seconds=None):
+        """
+        Save the profile report.
+        :param path: the file path, without extension
+        :param profile_format: 'csv' or 'json'
+        :param total_seconds: the total run time
+        :return: the file path
+        """
+        if profile_format not in PROFILE_FORMATS:
+            raise Exception('Profile format {} not recognized. Must be one of {}.'.format(profile_format,
+                                                                                          PROFILE_FORMATS))
+        dirname = os.path.dirname(path)
+        if dirname and not os.path.exists(dirname):
+            os.makedirs(dirname)
+
+        df = self.report(total_seconds=total_seconds)
+        path = '{}.{}'.format(path, profile_format)
+        if profile_format == 'csv':
+            df.to_csv(path, index=False)
+        else:
+            with open(path, 'w') as f:
+                json.dump({'total_seconds': total_seconds, 'components': df.to_dict(orient='records')}, f, indent=2)
+
+        return path
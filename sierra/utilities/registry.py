@@ -0,0 +1,201 @@
+import os
+import ast
+import json
+from importlib import import_module
+
+from loguru import logger
+
+SIERRA_PATH = os.path.dirname(os.path.dirname(os.path.realpath(__file__)))
+MODELS_PATH = os.path.join(SIERRA_PATH, 'models')
+
+# the generated manifest of custom types (not under version control; rebuilt when a module changes)
+REGISTRY_PATH = os.path.join(SIERRA_PATH, 'registry.json')
+
+# folders of modules that register custom parameters and recorders with Pywr when imported
+COMMON_FOLDERS = ['parameters', 'recorders']
+BASIN_FOLDER = '_parameters'
+
+# modules whose node classes are registered with Pywr when the classes are defined
+NODE_MODULES = [os.path.join('domains', 'domains.py')]
+
+# manifest and modules loaded by this process
+_registry = None
+
+
+def _file_stamp(path):
+    stat = os.stat(path)
+    return [stat.st_size, int(stat.st_mtime)]
+
+
+def registered_types(path, node_classes=False):
+    """
+    Find the custom types a module registers with Pywr, without importing it.
+    :param path: the module file
+    :param node_classes: include all top-level classes (node classes are registered when they are defined)
+    :return: a list of type names
+    """
+    with open(path) as f:
+        tree = ast.parse(f.read(), filename=path)
+
+    names = []
+    for statement in tree.body:
+        if node_classes and isinstance(statement, ast.ClassDef):
+            names.append(statement.name)
+        elif isinstance(statement, ast.Expr) and isinstance(statement.value, ast.Call):
+            func = statement.value.func
+            if isinstance(func, ast.Attribute) and func.attr == 'register' and isinstance(func.value, ast.Name):
+                names.append(func.value.id)
+    return names
+
+
+def _module_files():
+    """
+    Get the modules that may register custom types.
+    :return: a list of (file path relative to the sierra folder, module name, basin or None, node_classes)
+    """
+    files = []
+    for folder in COMMON_FOLDERS:
+        for filename in sorted(os.listdir(os.path.join(SIERRA_PATH, folder))):
+            if filename.endswith('.py') and '__init__' not in filename:
+                files.append((os.path.join(folder, filename), None, False))
+    for path in NODE_MODULES:
+        files.append((path, None, True))
+    for basin in sorted(os.listdir(MODELS_PATH)):
+        folder = os.path.join('models', basin, BASIN_FOLDER)
+        if not os.path.isdir(os.path.join(SIERRA_PATH, folder)):
+            continue
+        for filename in sorted(os.listdir(os.path.join(SIERRA_PATH, folder))):
+            if filename.endswith('.py') and '__init__' not in filename:
+                files.append((os.path.join(folder, filename), basin, False))
+
+    return [(path, 'sierra.' + os.path.splitext(path)[0].replace(os.sep, '.'), basin, node_classes)
+            for path, basin, node_classes in files]
+
+
+def build_registry(previous=None):
+    """
+    Build the manifest of custom types, mapping each type to the module that registers it. Modules that have not
+    changed since the previous manifest are not parsed again.
+    :param previous: the previous manifest
+    :return: the manifest
+    """
+    previous_files = (previous or {}).get('files', {})
+    files = {}
+    for path, module, basin, node_classes in _module_files():
+        stamp = _file_stamp(os.path.join(SIERRA_PATH, path))
+        entry = previous_files.get(path)
+        if entry is None or entry['stamp'] != stamp:
+            try:
+                types = registered_types(os.path.join(SIERRA_PATH, path), node_classes=node_classes)
+            except SyntaxError as err:
+                # the error is raised if the module is used
+                logger.warning('Could not parse {}: {}'.format(path, err))
+                types = []
+            entry = {'stamp': stamp, 'types': types}
+        files[path] = dict(entry, module=module, basin=basin)
+
+    return {'files': files}
+
+
+def save_registry(registry, path=REGISTRY_PATH):
+    # workers may build the manifest at the same time, so it is replaced rather than written in place
+    tmp_path = '{}.{}.tmp'.format(path, os.getpid())
+    with open(tmp_path, 'w') as f:
+        json.dump(registry, f, indent=2)
+    os.replace(tmp_path, path)
+
+
+def load_registry(path=REGISTRY_PATH):
+    """
+    Load the manifest of custom types, rebuilding it if modules have been added, removed or changed.
+    :param path: the manifest file
+    :return: a dict of {basin or None: {lowercase type name: module}}
+    """
+    global _registry
+    if _registry is not None:
+        return _registry
+
+    registry = None
+    if os.path.exists(path):
+        try:
+            with open(path) as f:
+                registry = json.load(f)
+        except ValueError:
+            registry = None
+
+    updated = build_registry(registry)
+    if updated != registry:
+        try:
+            save_registry(updated, path)
+        except OSError as err:
+            logger.warning('Could not save the type registry: {}'.format(err))
+
+    _registry = {}
+    for entry in updated['files'].values():
+        types = _registry.setdefault(entry['basin'], {})
+        for name in entry['types']:
+            types[name.lower()] = entry['module']
+
+    return _registry
+
+
+def model_types(data):
+    """
+    Get the types used in a model document, including those of parameters and recorders defined within others.
+    :param data: the model document
+    :return: a set of types
+    """
+    types = set()
+    values = [data]
+    while values:
+        value = values.pop()
+        if isinstance(value, dict):
+            if isinstance(value.get('type'), str):
+                types.add(value['type'])
+            values.extend(value.values())
+        elif isinstance(value, list):
+            values.extend(value)
+    return types
+
+
+def _registry_keys(type_name):
+    # as with Pywr, a type may be given with or without its "parameter" or "recorder" suffix
+    key = type_name.lower()
+    keys = [key, key + 'parameter', key + 'recorder']
+    for suffix in ['parameter', 'recorder']:
+        if key.endswith(suffix):
+            keys.append(key[:-len(suffix)])
+    return keys
+
+
+def register_model_types(data, basin=None):
+    """
+    Import the modules of the custom types used in a model document, which registers the types with Pywr.
+    :param data: the model document
+    :param basin: the basin, for basin-specific parameters
+    :return: a list of the modules imported
+    """
+    registry = load_registry()
+    common_types = registry.get(None, {})
+    basin_types = registry.get(basin, {}) if basin else {}
+
+    modules = []
+    for type_name in sorted(model_types(data)):
+        for key in _registry_keys(type_name):
+            module = basin_types.get(key) or common_types.get(key)
+            if module and module not in modules:
+                modules.append(module)
+
+    for module in modules:
+        import_module(module)
+    logger.debug('Registered custom types from {} modules'.format(len(modules)))
+
+    return modules
+
+
+if __name__ == '__main__':
+    # rebuild the manifest (e.g., python -m sierra.utilities.registry)
+    registry = build_registry()
+    save_registry(registry)
+    print('Saved {} types from {} modules to {}'.format(
+        sum(len(entry['types']) for entry in registry['files'].values()), len(registry['files']), REGISTRY_PATH))
@@ -1,16 +1,157 @@
 import os
+import warnings
+import numpy as np
 import pandas as pd
 
+from sierra.utilities.climates import CLIMATE_SCENARIO
 
-def save_model_results(model, results_path, file_suffix):
-    results_df = model.to_dataframe()
-    results_df.index.name = 'Date'
+RESULTS_FORMATS = ['csv', 'hdf5']
+HDF5_FILENAME = 'results.h5'
+HDF5_INDEX_KEY = 'results_index'
+
+
+def get_unit(attr):
+    # aggregated results (e.g., 'storage (monthly mean)') have the unit of the attribute
+    attr = attr.split(' (')[0]
+    if attr == 'elevation':
+        unit = 'm'
+    elif attr == 'energy':
+        unit = 'MWh'
+    else:
+        unit = 'mcm'
+    return unit
+
+
+def recorder_dataframe(model, recorder):
+    """
+    Get the results of a recorder, including any results from before the run was resumed from a checkpoint and any
+    results already streamed to disk (see sierra.utilities.streaming).
+    :param model: the Pywr model
+    :param recorder:
+    :return: a DataFrame
+    """
+    stream = getattr(model, 'results_stream', None)
+    df = stream.recorder_dataframe(recorder) if stream is not None else recorder.to_dataframe()
+    resumed_results = getattr(model, 'resumed_results', None)
+    if resumed_results and recorder.name in resumed_results:
+        # rows before the checkpoint are zero in the resumed run (or partly filled, for aggregated results)
+        resumed_df = resumed_results[recorder.name]
+        df.loc[resumed_df.index] = df.loc[resumed_df.index].values + resumed_df.values
+    return df
+
+
+def recorder_results(model):
+    """
+    Get the results of each recorder that has them, except recorders that the model's output profile does not save
+    (see sierra.utilities.output_profiles).
+    :param model: the Pywr model
+    :return: a generator of (recorder name, DataFrame)
+    """
+    unsaved = set(getattr(model, 'metadata', {}).get('unsaved_recorders', []))
+    for recorder in model.recorders:
+        if not hasattr(recorder, 'to_dataframe') or recorder.name in unsaved:
+            continue
+        try:
+            yield recorder.name, recorder_dataframe(model, recorder)
+        except NotImplementedError:
+            continue
+
+
+def recorder_types(model):
+    """
+    Get the node type of each recorder, by which results are grouped.
+    :param model: the Pywr model
+    :return: a dict of node types (or 'Other'), by recorder name
+    """
+    types = {}
+    for recorder in model.recorders:
+        res_name = recorder.name.split('/')[0]
+        types[recorder.name] = type(model.nodes[res_name]).__name__ if res_name in model.nodes else 'Other'
+    return types
+
+
+def model_dataframe(model):
+    """
+    Get the results of all recorders, as with Model.to_dataframe, including results from before a resumed run.
+    :param model: the Pywr model
+    :return: a DataFrame
+    """
+    df = pd.concat(dict(recorder_results(model)), axis=1)
+    df.columns.set_names('Recorder', level=0, inplace=True)
+    return df
+
+
+def save_model_results(model, results_path, file_suffix, results_format='csv', float32=False, complevel=5,
+                       climate=None):
+    """
+    Save model results, grouped by node type and attribute.
+    :param model: the Pywr model
+    :param results_path: the folder to save results to
+    :param file_suffix:
+    :param results_format: 'csv' (one file per node type and attribute) or 'hdf5' (one compressed file per run)
+    :param float32: save HDF5 results as 32-bit floats
+    :param complevel: HDF5 compression level (0-9)
+    :param climate: save results for this climate only, if climates are run as a scenario
+    :return:
+    """
     scenario_names = [s.name for s in model.scenarios.scenarios]
-    if not scenario_names:
-        scenario_names = [0]
+    save_results(recorder_results(model), recorder_types(model), scenario_names, results_path, file_suffix,
+                 results_format=results_format, float32=float32, complevel=complevel, climate=climate)
+
+
+def save_results(results, types, scenario_names, results_path, file_suffix, results_format='csv', float32=False,
+                 complevel=5, climate=None):
+    """
+    Save recorder results, grouped by node type and attribute. Results can be from a model (see save_model_results)
+    or, e.g., stitched together from several runs.
+    :param results: an iterable of (recorder name, DataFrame)
+    :param types: the node type of each recorder (see recorder_types)
+    :param scenario_names: the model's scenario names
+    :param results_path: the folder to save results to
+    :param file_suffix:
+    :param results_format: 'csv' or 'hdf5'
+    :param float32:
+    :param complevel:
+    :param climate:
+    :return:
+    """
     if not os.path.exists(results_path):
         os.makedirs(results_path)
 
+    if results_format == 'hdf5':
+        save_results_hdf5(results, types, results_path, float32=float32, complevel=complevel, climate=climate)
+        return
+    elif results_format != 'csv':
+        raise Exception('Results format {} not recognized. Must be one of {}.'.format(results_format, RESULTS_FORMATS))
+
+    # results aggregated by period (e.g., 'storage (monthly mean)') have their own index, so are saved separately
+    aggregations = {}
+    for recorder_name, df in results:
+        aggregation = recorder_name.split('/', 1)[1].partition(' (')[2]
+        aggregations.setdefault(aggregation, {})[recorder_name] = df
+    for aggregation_results in aggregations.values():
+        save_results_csv(aggregation_results, types, scenario_names, results_path, climate=climate)
+
+
+def save_results_csv(results, types, scenario_names, results_path, climate=None):
+    """
+    Save recorder results with the same index to CSV files, one per node type and attribute.
+    :param results: a dict of recorder DataFrames
+    :param types:
+    :param scenario_names:
+    :param results_path:
+    :param climate:
+    :return:
+    """
+    results_df = pd.concat(results, axis=1)
+    results_df.index.name = 'Date'
+    scenario_names = list(scenario_names)
+    if climate is not None:
+        results_df = select_climate(results_df, climate)
+        scenario_names.remove(CLIMATE_SCENARIO)
+    if not scenario_names:
+        scenario_names = [0]
+
     # if df_planning is not None:
     #     df_planning.to_csv(os.path.join(results_path, 'planning_debug.csv'))
 
@@ -19,17 +160,15 @@ def save_model_results(model, results_path, file_suffix):
     recorder_items = set(results_df.columns.get_level_values(0))
     if len(results_df.columns) == len(recorder_items):
         has_scenarios = False
-        results_df.columns = results_df.columns.droplevel(1)
+        if results_df.columns.nlevels > 1:
+            results_df.columns = results_df.columns.droplevel(1)
 
     columns = {}
     # nodes_of_type = {}
     for c in results_df.columns:
-        res_name, attr = (c[0] if has_scenarios else c).split('/')
-        if res_name in model.nodes:
-            node = model.nodes[res_name]
-            _type = type(node).__name__
-        else:
-            _type = 'Other'
+        recorder_name = c[0] if has_scenarios else c
+        res_name, attr = recorder_name.split('/')
+        _type = types[recorder_name]
         key = (_type, attr)
         if key in columns:
             columns[key].append(c)
@@ -38,12 +177,7 @@ def save_model_results(model, results_path, file_suffix):
         # nodes_of_type[_type] = nodes_of_type.get(_type, []) + [node]
 
     for (_type, attr), cols in columns.items():
-        if attr == 'elevation':
-            unit = 'm'
-        elif attr == 'energy':
-            unit = 'MWh'
-        else:
-            unit = 'mcm'
+        unit = get_unit(attr)
         # file_path = os.path.join(results_path, '{}_{}_{}_{}'.format(_type, attr.title(), unit, file_suffix))
         file_path = os.path.join(results_path, '{}_{}_{}'.format(_type, attr.title(), unit))
         df = results_df[cols]
@@ -54,3 +188,88 @@ def save_model_results(model, results_path, file_suffix):
         else:
             df.columns = [c.split('/')[0] for c in df.columns]
         df.to_csv(file_path + '.csv')
+
+
+def save_results_hdf5(results, types, results_path, float32=False, complevel=5, climate=None):
+    """
+    Save recorder results to a single compressed HDF5 file, with one dataset per recorder.
+
+    Recorder results are written one at a time, rather than first being combined into one large DataFrame. Each
+    dataset is stored under /<node type>/<attribute>/<node>, with the scenario combinations as (MultiIndex) columns. An
+    index of all datasets, in recorder order, is saved as well, so load_model_results can reassemble the same
+    DataFrames that are saved as CSV files.
+    :param results:
+    :param types:
+    :param results_path:
+    :param float32:
+    :param complevel:
+    :param climate:
+    :return:
+    """
+    import tables
+
+    path = os.path.join(results_path, HDF5_FILENAME)
+    index = []
+    with warnings.catch_warnings():
+        # node names are not valid Python identifiers, which PyTables warns about
+        warnings.simplefilter('ignore', tables.NaturalNameWarning)
+
+        with pd.HDFStore(path, mode='w', complevel=complevel, complib='blosc') as store:
+            for recorder_name, df in results:
+                res_name, attr = recorder_name.split('/')
+                _type = types[recorder_name]
+
+                if isinstance(df.index, pd.PeriodIndex):
+                    df.index = df.index.to_timestamp()
+                df.index.name = 'Date'
+                if climate is not None:
+                    df = select_climate(df, climate)
+                if float32:
+                    df = df.astype(np.float32)
+
+                key = '/'.join(['', _type, attr, res_name])
+                store.put(key, df, format='fixed')
+                index.append((_type, attr, get_unit(attr), res_name, key))
+
+            store.put(HDF5_INDEX_KEY, pd.DataFrame(index, columns=['type', 'attribute', 'unit', 'node', 'key']))
+
+
+def select_climate(df, climate):
+    """
+    Select the results for one climate, if climates are run as a scenario, and drop the climate column level.
+    :param df: results, with scenarios as (MultiIndex) columns
+    :param climate:
+    :return:
+    """
+    level = df.columns.names.index(CLIMATE_SCENARIO)
+    df = df.loc[:, df.columns.get_level_values(level) == climate]
+    if df.columns.nlevels > 1:
+        df.columns = df.columns.droplevel(level)
+    return df
+
+
+def load_model_results(results_path, node_type, attr):
+    """
+    Load HDF5 model results for a node type and attribute, as the same DataFrame that is saved as a CSV file.
+    :param results_path: the results folder (or the HDF5 file)
+    :param node_type: the node type (e.g., 'Hydropower')
+    :param attr: the attribute (e.g., 'flow')
+    :return: a DataFrame of results, with nodes (and scenarios, if any) as columns
+    """
+    path = results_path if os.path.isfile(results_path) else os.path.join(results_path, HDF5_FILENAME)
+    with pd.HDFStore(path, mode='r') as store:
+        index = store[HDF5_INDEX_KEY]
+        index = index[(index['type'] == node_type) & (index['attribute'] == attr)]
+        if not len(index):
+            raise KeyError('No results found for {} {}'.format(node_type, attr))
+        dfs = [store[key] for key in index['key']]
+
+    if len(dfs[0].columns) == 1:
+        # no scenarios
+        df = pd.concat(dfs, axis=1)
+        df.columns = list(index['node'])
+    else:
+        df = pd.concat(dfs, axis=1, keys=list(index['node']))
+        df.columns.names = ['node'] + list(dfs[0].columns.names)
+
+    return df
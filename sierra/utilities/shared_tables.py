@@ -0,0 +1,217 @@
+import os
+import json
+from types import SimpleNamespace
+
+import numpy as np
+import pandas as pd
+from pywr.core import Model
+from pywr.dataframe_tools import load_dataframe
+from loguru import logger
+
+from sierra.utilities.registry import register_model_types
+
+MODELS_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'models')
+
+# the climate in model file urls, which is replaced by the climate being run
+TEMPLATE_CLIMATE = 'historical/Livneh'
+
+# shared memory segments attached to by this process, which must stay open while their tables are used
+_attached = {}
+
+
+def table_key(table):
+    """
+    Get the key of a table definition, by which shared tables are found.
+    :param table: the table definition (from a model document)
+    :return: the key
+    """
+    return json.dumps(table, sort_keys=True)
+
+
+def basin_tables(basin, data_path, climate=None, include_planning=False):
+    """
+    Get the table definitions of a basin model, with urls as they are in a prepared model (see _run_model).
+    :param basin:
+    :param data_path:
+    :param climate: include climate-dependent tables for this climate (otherwise they are left out)
+    :param include_planning: include the planning model's versions of tables, which use monthly data
+    :return: a list of table definitions
+    """
+    with open(os.path.join(MODELS_PATH, basin, 'pywr_model.json')) as f:
+        tables = json.load(f).get('tables', {})
+
+    definitions = []
+    for name, table in tables.items():
+        url = table.get('url')
+        if not url or 'observed' in name.lower():
+            continue
+        if TEMPLATE_CLIMATE in url:
+            if climate is None:
+                continue
+            url = url.replace(TEMPLATE_CLIMATE, climate)
+        if data_path:
+            url = url.replace('../data', data_path)
+        table = dict(table, url=url)
+        definitions.append(table)
+        if include_planning and 'daily' in table['url']:
+            definitions.append(dict(table, url=table['url'].replace('daily', 'monthly')))
+
+    return definitions
+
+
+class SharedTables(object):
+    """
+    Model tables loaded once, by the parent of worker processes, into shared memory.
+
+    The manifest is passed to workers (e.g., as the shared_tables argument of _run_model), where load_model attaches
+    to the shared values instead of reading the table files again. Only numeric tables are shared. Shared tables are
+    read-only in the workers.
+
+    Tables should be shared before worker processes are started, so that the workers use the parent's resource
+    tracker. A worker with its own tracker would remove the shared memory when it exits.
+    """
+
+    def __init__(self):
+        self.manifest = {}
+        self._segments = []
+
+    def add(self, table):
+        """
+        Load a table and copy its values to shared memory.
+        :param table: the table definition
+        :return: True if the table is shared
+        """
+        from multiprocessing import shared_memory
+
+        key = table_key(table)
+        if key in self.manifest:
+            return True
+
+        # only the model path is used to read a table
+        df = load_dataframe(SimpleNamespace(path=None, tables={}), dict(table))
+        if isinstance(df, pd.Series):
+            values = df.values
+            columns = df.name
+        else:
+            if not len(df.columns) or len(set(df.dtypes)) != 1:
+                return False
+            values = df.values
+            columns = df.columns
+        if not pd.api.types.is_numeric_dtype(values.dtype) or not values.size:
+            return False
+
+        segment = shared_memory.SharedMemory(create=True, size=values.nbytes)
+        shared_values = np.ndarray(values.shape, dtype=values.dtype, buffer=segment.buf)
+        shared_values[:] = values
+        self._segments.append(segment)
+        self.manifest[key] = {
+            'segment': segment.name,
+            'shape': values.shape,
+            'dtype': values.dtype.str,
+            'series': isinstance(df, pd.Series),
+            'index': df.index,
+            'columns': columns
+        }
+        return True
+
+    @property
+    def nbytes(self):
+        return sum(segment.size for segment in self._segments)
+
+    def close(self):
+        """
+        Release the shared memory, once workers are done with it.
+        :return:
+        """
+        for segment in self._segments:
+            segment.close()
+            segment.unlink()
+        self._segments = []
+        self.manifest = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+
+def share_tables(basins, data_path, climate=None, include_planning=False):
+    """
+    Load the tables of basin models into shared memory.
+    :param basins:
+    :param data_path:
+    :param climate: also share climate-dependent tables for this climate (e.g., when running time chunks)
+    :param include_planning:
+    :return: SharedTables
+    """
+    shared_tables = SharedTables()
+    for basin in basins:
+        for table in basin_tables(basin, data_path, climate=climate, include_planning=include_planning):
+            try:
+                shared_tables.add(table)
+            except Exception as err:
+                # the table is loaded by each model instead, which will report any error
+                logger.warning('Table {} not shared: {}'.format(table['url'], err))
+
+    logger.info('Shared {} tables ({:.1f} MB)'.format(len(shared_tables.manifest), shared_tables.nbytes / 1e6))
+    return shared_tables
+
+
+def attach_table(spec):
+    """
+    Get a shared table, as a read-only view of the shared values.
+    :param spec: the table's manifest entry
+    :return: a DataFrame or Series
+    """
+    from multiprocessing import shared_memory
+
+    segment = _attached.get(spec['segment'])
+    if segment is None:
+        segment = _attached[spec['segment']] = shared_memory.SharedMemory(name=spec['segment'])
+
+    values = np.ndarray(spec['shape'], dtype=np.dtype(spec['dtype']), buffer=segment.buf)
+    values.flags.writeable = False
+    if spec['series']:
+        return pd.Series(values, index=spec['index'], name=spec['columns'], copy=False)
+    return pd.DataFrame(values, index=spec['index'], columns=spec['columns'], copy=False)
+
+
+def load_model(data, path=None, shared_tables=None, basin=None):
+    """
+    Load a Pywr model, using shared tables where possible.
+
+    The custom types used by the model are registered first (see sierra.utilities.registry). Shared tables are added to
+    the model before the rest of the model document is loaded, so that parameters can refer to them as usual.
+    :param data: the model document, or its file path
+    :param path: the model path, for relative urls
+    :param shared_tables: the manifest of shared tables (see SharedTables)
+    :param basin: the basin, for basin-specific custom types
+    :return: the model
+    """
+    if isinstance(data, str):
+        path = data
+        with open(path) as f:
+            data = json.load(f)
+
+    register_model_types(data, basin=basin)
+
+    if not shared_tables:
+        return Model.load(data, path=path)
+
+    tables = {}
+    shared = {}
+    for name, table in data.get('tables', {}).items():
+        spec = shared_tables.get(table_key(table))
+        if spec is None:
+            tables[name] = table
+        else:
+            shared[name] = attach_table(spec)
+
+    # an empty model with the same solver and time steps, to which the rest of the document is added
+    base = {'metadata': data['metadata'], 'timestepper': data['timestepper'], 'nodes': [], 'edges': []}
+    if 'solver' in data:
+        base['solver'] = data['solver']
+    model = Model.load(base, path=path)
+    model.tables.update(shared)
+    return Model.load(dict(data, tables=tables), model=model, path=path)
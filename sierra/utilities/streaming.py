@@ -0,0 +1,147 @@
+import os
+
+import numpy as np
+import pandas as pd
+from loguru import logger
+
+# rows kept in memory by each streamed recorder between flushes: a water year of daily results
+STREAM_BUFFER_ROWS = 366
+
+
+def _read_recorder(group):
+    """
+    Read the results of a recorder from a stream file.
+    :param group: the recorder's group in the file
+    :return: a DataFrame
+    """
+    attrs = group._v_attrs
+    index = pd.to_datetime(group.index.read(), unit='ns').to_period(attrs.freq)
+    return pd.DataFrame(data=group.values.read(), index=index, columns=attrs.columns)
+
+
+class ResultsStream(object):
+    """
+    Recorder results written to an HDF5 file as a model runs, rather than kept in memory until the end of the run.
+
+    Only recorders listed in the model's streamed_recorders metadata are streamed (see
+    sierra.utilities.output_profiles.stream_recorders). Each keeps a buffer of recent results (see
+    sierra.recorders.temporal.TemporalAggregation), from which completed periods are appended to the file when the
+    stream is flushed (e.g., at the end of each water year). If a run fails, the file keeps the results up to the last
+    flush, which can be read with load_stream.
+    """
+
+    def __init__(self, path, complevel=5):
+        """
+        :param path: the stream file
+        :param complevel: HDF5 compression level (0-9)
+        """
+        self.path = path
+        self.complevel = complevel
+        self.model = None
+        self.groups = {}
+        self._file = None
+
+    def open(self, model, first_timestep=0):
+        """
+        Create the stream file, and switch the model's streamed recorders to buffers.
+        :param model: the Pywr model, which should already be set up
+        :param first_timestep: the index of the first timestep to be run (e.g., when a run is resumed)
+        :return:
+        """
+        import tables
+
+        folder = os.path.dirname(self.path)
+        if folder and not os.path.exists(folder):
+            os.makedirs(folder)
+
+        names = set(getattr(model, 'metadata', {}).get('streamed_recorders', []))
+        recorders = [recorder for recorder in model.recorders if recorder.name in names]
+
+        self.model = model
+        self.groups = {}
+        self._file = tables.open_file(self.path, mode='w',
+                                      filters=tables.Filters(complevel=self.complevel, complib='blosc'))
+        columns = model.scenarios.multiindex
+        for i, recorder in enumerate(recorders):
+            aggregation = recorder.aggregation
+            aggregation.set_buffer(STREAM_BUFFER_ROWS, first_timestep=first_timestep)
+
+            # recorder names are not valid HDF5 node names, so they are saved as attributes
+            group = self._file.create_group('/', 'recorder{}'.format(i))
+            group._v_attrs.name = recorder.name
+            group._v_attrs.freq = aggregation.index.freqstr
+            group._v_attrs.columns = columns
+            self._file.create_earray(group, 'values', tables.Float64Atom(), shape=(0, len(columns)),
+                                     expectedrows=len(aggregation.index))
+            self._file.create_earray(group, 'index', tables.Int64Atom(), shape=(0,),
+                                     expectedrows=len(aggregation.index))
+            self.groups[recorder.name] = group
+
+            # periods before the first timestep are not run, so their results are zero, as with other recorders
+            if aggregation.offset:
+                self._append(group, aggregation.index[:aggregation.offset],
+                             np.zeros((aggregation.offset, len(columns))))
+
+        self._file.flush()
+        logger.info('Streaming results of {} recorders to {}'.format(len(recorders), self.path))
+
+    @staticmethod
+    def _append(group, index, values):
+        group.values.append(values)
+        # periods are saved by their start times, in nanoseconds
+        group.index.append(index.to_timestamp().values.astype('datetime64[ns]').astype(np.int64))
+
+    def flush(self):
+        """
+        Append the results of completed periods to the file, and remove them from the recorders' buffers.
+        :return:
+        """
+        timestep_index = self.model.timestepper.current.index
+        for recorder in self.model.recorders:
+            group = self.groups.get(recorder.name)
+            if group is None:
+                continue
+            index, values = recorder.aggregation.flush(timestep_index)
+            if len(index):
+                self._append(group, index, values)
+        self._file.flush()
+
+    def recorder_dataframe(self, recorder):
+        """
+        Get all results of a recorder: results appended to the file and results still in its buffer.
+        :param recorder:
+        :return: a DataFrame, as from the recorder's to_dataframe if it were not streamed
+        """
+        df = recorder.to_dataframe()
+        group = self.groups.get(recorder.name)
+        if group is None:
+            return df
+        return pd.concat([_read_recorder(group), df])
+
+    def close(self, remove=False):
+        """
+        Close the stream file.
+        :param remove: remove the file (e.g., once results have been saved)
+        :return:
+        """
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        self.groups = {}
+        if remove and os.path.exists(self.path):
+            os.remove(self.path)
+
+
+def load_stream(path):
+    """
+    Load the results saved to a stream file (e.g., by a run that failed).
+    :param path: the stream file
+    :return: a dict of DataFrames, by recorder name
+    """
+    import tables
+
+    results = {}
+    with tables.open_file(path, mode='r') as f:
+        for group in f.root._f_iter_nodes('Group'):
+            results[group._v_attrs.name] = _read_recorder(group)
+    return results
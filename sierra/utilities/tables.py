@@ -0,0 +1,135 @@
+import re
+
+import pandas as pd
+
+DATE = 'date'
+MONTH_DAY = 'month-day'
+YEAR = 'year'
+
+date_pattern = re.compile(r'^\d{4}-\d{1,2}-\d{1,2}$')
+month_day_pattern = re.compile(r'^\d{1,2}-\d{1,2}$')
+
+
+def date_key(year, month, day):
+    return year * 10000 + month * 100 + day
+
+
+def month_day_key(month, day):
+    return month * 100 + day
+
+
+class TableArray(object):
+    """
+    A model table converted to a NumPy array, with an integer index precomputed from the table's date-like index.
+
+    Three kinds of index are supported:
+    - date: dates, either as a DatetimeIndex or as YYYY-MM-DD strings (e.g., energy prices)
+    - month-day: M-D strings (e.g., flood control curves) or (month, day) MultiIndexes (e.g., demand by WYT)
+    - year: integer years or water years (e.g., San Joaquin Valley Index)
+    """
+
+    def __init__(self, table, kind, keys):
+        self.kind = kind
+        self.rows = {key: i for i, key in enumerate(keys)}
+        if isinstance(table, pd.Series):
+            self.columns = {None: 0}
+            self.values = table.values.reshape(-1, 1)
+        else:
+            self.columns = {c: j for j, c in enumerate(table.columns)}
+            self.values = table.values
+
+    def row(self, year=None, month=None, day=None):
+        if self.kind == DATE:
+            return self.rows[date_key(year, month, day)]
+        elif self.kind == MONTH_DAY:
+            return self.rows[month_day_key(month, day)]
+        else:
+            return self.rows[year]
+
+    def value(self, column=None, year=None, month=None, day=None):
+        return self.values[self.row(year, month, day), self.columns[column]]
+
+
+def _index_keys(index):
+    """
+    Determine the kind of a table index and convert it to integer keys.
+    :param index: the table index
+    :return: the kind of index and a list of integer keys, or (None, None) if the index is not date-like
+    """
+
+    if isinstance(index, pd.DatetimeIndex):
+        return DATE, [date_key(d.year, d.month, d.day) for d in index]
+
+    if isinstance(index, pd.MultiIndex):
+        if index.nlevels != 2:
+            return None, None
+        try:
+            months = [int(m) for m in index.get_level_values(0)]
+            days = [int(d) for d in index.get_level_values(1)]
+        except (TypeError, ValueError):
+            return None, None
+        if all(1 <= m <= 12 for m in months) and all(1 <= d <= 31 for d in days):
+            return MONTH_DAY, [month_day_key(m, d) for m, d in zip(months, days)]
+        return None, None
+
+    if not pd.api.types.is_numeric_dtype(index) and all(isinstance(i, str) for i in index):
+        if all(date_pattern.match(i) for i in index):
+            keys = []
+            for i in index:
+                year, month, day = i.split('-')
+                keys.append(date_key(int(year), int(month), int(day)))
+            return DATE, keys
+        if all(month_day_pattern.match(i) for i in index):
+            keys = []
+            for i in index:
+                month, day = i.split('-')
+                keys.append(month_day_key(int(month), int(day)))
+            return MONTH_DAY, keys
+        return None, None
+
+    if pd.api.types.is_integer_dtype(index):
+        return YEAR, [int(i) for i in index]
+
+    return None, None
+
+
+def prepare_table(table):
+    """
+    Convert a model table to a TableArray, if it is numeric and has a date-like index.
+    :param table: a pandas DataFrame or Series
+    :return: a TableArray, or None if the table cannot be converted
+    """
+
+    if not isinstance(table, (pd.DataFrame, pd.Series)):
+        return None
+
+    dtypes = [table.dtype] if isinstance(table, pd.Series) else table.dtypes
+    if not all(pd.api.types.is_numeric_dtype(dtype) for dtype in dtypes):
+        return None
+
+    kind, keys = _index_keys(table.index)
+    if kind is None or len(set(keys)) != len(keys):
+        return None
+
+    return TableArray(table, kind, keys)
+
+
+def prepare_tables(model):
+    """
+    Convert the model's tables to NumPy arrays with integer date indexes, for fast lookups from parameters.
+    Tables that cannot be converted are left as-is in model.tables.
+    :param model: a Pywr model
+    :return:
+    """
+    model.table_arrays = {}
+    for name, table in model.tables.items():
+        table_array = prepare_table(table)
+        if table_array is not None:
+            model.table_arrays[name] = table_array
+
+    # climate-dependent tables, if climates are run as a scenario
+    model.climate_table_arrays = {}
+    for name, tables in getattr(model, 'climate_tables', {}).items():
+        table_arrays = [prepare_table(table) for table in tables]
+        if all(table_array is not None for table_array in table_arrays):
+            model.climate_table_arrays[name] = table_arrays
@@ -0,0 +1,280 @@
+import os
+import sys
+import json
+import warnings
+
+import numpy as np
+import pandas as pd
+from loguru import logger
+
+SIERRA_PATH = os.path.dirname(os.path.dirname(os.path.realpath(__file__)))
+
+# results of previous validations, by file (not under version control)
+VALIDATION_MANIFEST = os.path.join(SIERRA_PATH, 'validation.json')
+
+# increment when the checks change, so that all files are validated again
+VALIDATION_VERSION = 1
+
+# basin data folders that are not model inputs
+SKIPPED_FOLDERS = ['gauges']
+
+# valid (min, max) values of inputs, by folder; values in other folders are only checked for being finite
+VALUE_RANGES = {
+    'runoff': (0.0, None),
+    'runoff_aggregated': (0.0, None),
+    'runoff_monthly_forecasts': (0.0, None),
+    'precipitation': (0.0, None),
+}
+
+# rows read to find the date and numeric columns of a file
+SAMPLE_ROWS = 20
+
+
+def input_files(basin_path, climates):
+    """
+    Find the CSV input files of a basin, including the hydrology of the given climates only.
+    :param basin_path: the basin's data folder (e.g., <data path>/Stanislaus River)
+    :param climates: a list of climates (e.g., ['historical/Livneh'])
+    :return: a sorted list of file paths
+    """
+    folders = []
+    for name in os.listdir(basin_path):
+        if name in SKIPPED_FOLDERS:
+            continue
+        elif name == 'hydrology':
+            folders.extend(os.path.join(basin_path, name, climate) for climate in climates)
+        else:
+            folders.append(os.path.join(basin_path, name))
+
+    paths = set()
+    for folder in folders:
+        if os.path.isfile(folder):
+            if folder.endswith('.csv'):
+                paths.add(folder)
+            continue
+        for dirpath, dirnames, filenames in os.walk(folder):
+            paths.update(os.path.join(dirpath, filename) for filename in filenames if filename.endswith('.csv'))
+
+    return sorted(paths)
+
+
+def value_range(path):
+    """
+    Get the valid range of the values in a file, from the folders it is in (see VALUE_RANGES).
+    :param path:
+    :return: (min, max), either of which may be None
+    """
+    for folder in reversed(os.path.normpath(os.path.dirname(path)).split(os.sep)):
+        if folder in VALUE_RANGES:
+            return VALUE_RANGES[folder]
+    return None, None
+
+
+def _parse_dates(values):
+    try:
+        return pd.to_datetime(values, format='%Y-%m-%d')
+    except (ValueError, TypeError):
+        # values that are not dates are missing
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore')
+            return pd.to_datetime(values, errors='coerce')
+
+
+def _read_numeric(path):
+    """
+    Read the date index (if any) and numeric columns of a CSV file, skipping other columns.
+    :param path:
+    :return: the dates (or None) and a DataFrame of numeric columns
+    """
+    sample = pd.read_csv(path, nrows=SAMPLE_ROWS)
+    columns = list(sample.columns)
+    if not columns:
+        return None, sample
+
+    # the first column is an index of dates if its values are dates
+    date_column = None
+    first = sample[columns[0]].dropna()
+    if len(first) and not pd.api.types.is_numeric_dtype(first) and _parse_dates(first).notnull().all():
+        date_column = columns[0]
+    numeric = [c for c in columns if c != date_column and pd.api.types.is_numeric_dtype(sample[c])]
+    usecols = ([date_column] if date_column else []) + numeric
+
+    try:
+        df = pd.read_csv(path, usecols=usecols, dtype={c: np.float64 for c in numeric}, engine='c')
+    except ValueError:
+        # values that are not numbers after the first rows are counted as missing
+        df = pd.read_csv(path, usecols=usecols, engine='c')
+        for c in numeric:
+            df[c] = pd.to_numeric(df[c], errors='coerce')
+
+    dates = _parse_dates(df.pop(date_column)) if date_column else None
+    return dates, df
+
+
+def date_gaps(dates):
+    """
+    Count the missing dates in a daily or monthly date index.
+    :param dates: a DatetimeIndex (or Series of dates)
+    :return: the number of missing dates and the first date after a gap (or None)
+    """
+    dates = pd.DatetimeIndex(dates).dropna()
+    if len(dates) < 3:
+        return 0, None
+    days = np.diff(dates.values).astype('timedelta64[D]').astype(int)
+    step = np.bincount(days[days > 0]).argmax() if (days > 0).any() else 0
+    if step == 1:
+        missing = days - 1
+    elif 28 <= step <= 31:
+        months = np.diff(dates.year * 12 + dates.month)
+        missing = months - 1
+    else:
+        # other frequencies are not checked
+        return 0, None
+    missing = np.maximum(missing, 0)
+    if not missing.any():
+        return 0, None
+    return int(missing.sum()), str(dates[1:][missing > 0][0].date())
+
+
+def validate_file(path):
+    """
+    Validate a CSV input file, checking for missing values, gaps in its date index and values out of range.
+    :param path:
+    :return: a dict of results
+    """
+    try:
+        dates, df = _read_numeric(path)
+    except Exception as err:
+        return {'error': str(err)}
+
+    values = df.to_numpy(dtype=np.float64)
+    nans = int(np.isnan(values).sum()) + (int(dates.isnull().sum()) if dates is not None else 0)
+
+    lower, upper = value_range(path)
+    finite = values[np.isfinite(values)]
+    out_of_range = int(np.isinf(values).sum())
+    if lower is not None:
+        out_of_range += int((finite < lower).sum())
+    if upper is not None:
+        out_of_range += int((finite > upper).sum())
+
+    gaps, first_gap = date_gaps(dates) if dates is not None else (0, None)
+
+    return {'nans': nans, 'gaps': gaps, 'first_gap': first_gap, 'out_of_range': out_of_range}
+
+
+def _file_stamp(path):
+    # nanoseconds, so that a file rewritten within a second (with the same size) is validated again
+    stat = os.stat(path)
+    return [stat.st_size, stat.st_mtime_ns]
+
+
+def load_manifest(path=VALIDATION_MANIFEST):
+    if os.path.exists(path):
+        try:
+            with open(path) as f:
+                manifest = json.load(f)
+            if manifest.get('version') == VALIDATION_VERSION:
+                return manifest
+        except ValueError:
+            pass
+    return {'version': VALIDATION_VERSION, 'files': {}}
+
+
+def save_manifest(manifest, path=VALIDATION_MANIFEST):
+    # processes may validate inputs at the same time, so the manifest is replaced rather than written in place
+    tmp_path = '{}.{}.tmp'.format(path, os.getpid())
+    with open(tmp_path, 'w') as f:
+        json.dump(manifest, f)
+    os.replace(tmp_path, path)
+
+
+def validate_files(paths, num_cores=None, manifest_path=VALIDATION_MANIFEST):
+    """
+    Validate input files in parallel. Results are saved in a manifest, by file path, size and modification time, so
+    that files that have not changed since they were last validated are not read again.
+    :param paths: the file paths
+    :param num_cores: the number of processes (defaults to the number of CPUs)
+    :param manifest_path: the manifest file
+    :return: a dict of results (see validate_file), by path
+    """
+    import multiprocessing as mp
+
+    manifest = load_manifest(manifest_path)
+    files = manifest['files']
+
+    results = {}
+    stamps = {}
+    stale = []
+    for path in paths:
+        path = os.path.abspath(path)
+        stamps[path] = _file_stamp(path)
+        entry = files.get(path)
+        if entry is not None and entry['stamp'] == stamps[path]:
+            results[path] = entry['results']
+        else:
+            stale.append(path)
+
+    if stale:
+        num_cores = min(num_cores or mp.cpu_count(), len(stale))
+        # processes of a multiprocessing pool (e.g., model runs) cannot start their own
+        if num_cores > 1 and not mp.current_process().daemon:
+            with mp.Pool(processes=num_cores) as pool:
+                stale_results = pool.map(validate_file, stale, chunksize=max(len(stale) // (num_cores * 4), 1))
+        else:
+            stale_results = [validate_file(path) for path in stale]
+
+        for path, file_results in zip(stale, stale_results):
+            results[path] = file_results
+            files[path] = {'stamp': stamps[path], 'results': file_results}
+
+        try:
+            save_manifest(manifest, manifest_path)
+        except OSError as err:
+            logger.warning('Could not save the validation manifest: {}'.format(err))
+
+    logger.debug('Validated {} files ({} read)'.format(len(paths), len(stale)))
+
+    return results
+
+
+def validate_inputs(basin_path, climates, num_cores=None, manifest_path=VALIDATION_MANIFEST):
+    """
+    Validate the input files of a basin (see input_files), logging any problems found.
+    :param basin_path: the basin's data folder
+    :param climates: a climate, or a list of climates
+    :param num_cores:
+    :param manifest_path:
+    :return: a DataFrame of results, with a row for each file
+    """
+    climates = climates if isinstance(climates, list) else [climates]
+    results = validate_files(input_files(basin_path, climates), num_cores=num_cores, manifest_path=manifest_path)
+
+    df = pd.DataFrame.from_dict(results, orient='index', columns=['nans', 'gaps', 'first_gap', 'out_of_range', 'error'])
+    df[['nans', 'gaps', 'out_of_range']] = df[['nans', 'gaps', 'out_of_range']].fillna(0).astype(int)
+    df.index.name = 'path'
+
+    for path, row in df.iterrows():
+        name = os.path.relpath(path, basin_path)
+        if isinstance(row['error'], str):
+            logger.warning('Could not read {}: {}'.format(name, row['error']))
+        if row['nans']:
+            logger.warning('{} NaNs found in {}'.format(row['nans'], name))
+        if row['gaps']:
+            logger.warning('{} dates missing in {} (first gap before {})'.format(row['gaps'], name, row['first_gap']))
+        if row['out_of_range']:
+            logger.warning('{} values out of range in {}'.format(row['out_of_range'], name))
+
+    totals = df[['nans', 'gaps', 'out_of_range']].sum()
+    if totals.any() or df['error'].notnull().any():
+        logger.warning('{} NaNs, {} missing dates and {} values out of range found in {} data files'.format(
+            totals['nans'], totals['gaps'], totals['out_of_range'], len(df)))
+    else:
+        logger.info('No NaNs, missing dates or values out of range found in {} data files'.format(len(df)))
+
+    return df
+
+
+if __name__ == '__main__':
+    # e.g., python -m sierra.utilities.validation "../data/Stanislaus River" historical/Livneh
+    validate_inputs(sys.argv[1], sys.argv[2:])
@@ -0,0 +1,40 @@
+import os
+import time
+
+import pytest
+
+pytest.importorskip('pywr')
+
+from sierra.utilities.cache import cached_model_paths, prune_cache, touch_cached_models
+
+
+def write_cached_models(cache_dir, key, age_days):
+    paths = cached_model_paths(cache_dir, key)
+    mtime = time.time() - age_days * 24 * 3600
+    for path in paths:
+        with open(path, 'w') as f:
+            f.write('{}')
+        os.utime(path, (mtime, mtime))
+    return paths
+
+
+def test_prune_cache_keeps_recently_used_models(tmp_path):
+    cache_dir = str(tmp_path)
+    keys = ['{:064x}'.format(i) for i in range(5)]
+    for i, key in enumerate(keys):
+        write_cached_models(cache_dir, key, age_days=i)
+    write_cached_models(cache_dir, 'f' * 64, age_days=100)
+    other_path = os.path.join(cache_dir, 'pywr_model_Livneh.json')
+    open(other_path, 'w').close()
+
+    # using a model marks it as recent
+    touch_cached_models(cache_dir, keys[4])
+
+    removed = prune_cache(cache_dir, max_models=3, max_age_days=30)
+
+    assert sorted(removed) == sorted([keys[2], keys[3], 'f' * 64])
+    for key in [keys[0], keys[1], keys[4]]:
+        assert all(os.path.exists(path) for path in cached_model_paths(cache_dir, key))
+    for key in removed:
+        assert not any(os.path.exists(path) for path in cached_model_paths(cache_dir, key))
+    assert os.path.exists(other_path)
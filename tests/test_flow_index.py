@@ -0,0 +1,40 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+pytest.importorskip('pywr')
+
+from sierra.utilities.flow_index import FlowIndex
+
+
+@pytest.fixture
+def flows():
+    index = pd.date_range('2000-10-01', '2001-09-30', freq='D')
+    values = np.random.RandomState(0).uniform(0, 10, size=(len(index), 2))
+    values[[5, 100, 101, 300], 0] = np.nan
+    values[200:210, 1] = np.nan
+    return pd.DataFrame(values, index=index)
+
+
+@pytest.mark.parametrize('start, end', [
+    ('2000-10-01', '2000-10-31'),
+    ('2000-10-03', '2001-01-15'),
+    ('2001-01-10', '2001-01-10'),
+    ('2001-04-19', '2001-04-28'),
+    ('2001-02-01', '2001-09-30'),
+    ('2000-09-01', '2001-12-31'),
+])
+def test_date_window_sum_skips_missing_values(flows, start, end):
+    flow_index = FlowIndex(flows, scenario_columns=[0, 1, 1])
+
+    expected = flows[start:end].sum().values[[0, 1, 1]]
+
+    np.testing.assert_allclose(flow_index.date_window_sum(start, end), expected)
+
+
+def test_date_window_sum_of_series(flows):
+    series = flows[0]
+    flow_index = FlowIndex(series)
+
+    for start, end in [('2000-10-01', '2001-09-30'), ('2001-01-01', '2001-03-31')]:
+        np.testing.assert_allclose(flow_index.date_window_sum(start, end), [series[start:end].sum()])
@@ -0,0 +1,48 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+pytest.importorskip('pywr')
+
+from sierra.utilities import hydrology_store
+from sierra.utilities.hydrology_store import build_store, read_stored
+
+READ_OPTIONS = {'index_col': 0, 'parse_dates': True, 'header': 0, 'squeeze': True}
+
+
+@pytest.fixture
+def runoff_path(tmp_path, monkeypatch):
+    monkeypatch.setattr(hydrology_store, '_stores', {})
+    climate_path = os.path.join(str(tmp_path), 'hydrology', 'historical', 'Livneh')
+    os.makedirs(os.path.join(climate_path, 'runoff'))
+    path = os.path.join(climate_path, 'runoff', 'inflow.csv')
+    dates = pd.date_range('2000-10-01', periods=30, name='Date')
+    pd.DataFrame({'flow': np.arange(30.0)}, index=dates).to_csv(path)
+    build_store(climate_path)
+    return path
+
+
+def test_read_stored(runoff_path):
+    series = read_stored(runoff_path, dict(READ_OPTIONS))
+    expected = pd.read_csv(runoff_path, index_col=0, parse_dates=True, header=0)['flow']
+    np.testing.assert_array_equal(series.values, expected.values)
+    assert (series.index == expected.index).all()
+
+
+@pytest.mark.parametrize('option, value', [('index_col', False), ('header', False), ('parse_dates', 1)])
+def test_options_equal_to_store_options_are_not_stored(runoff_path, option, value):
+    assert read_stored(runoff_path, dict(READ_OPTIONS, **{option: value})) is None
+
+
+def test_file_rewritten_within_a_second_is_not_stored(runoff_path):
+    stat = os.stat(runoff_path)
+    df = pd.read_csv(runoff_path, index_col=0)
+    df['flow'] = df['flow'][::-1].values
+    df.to_csv(runoff_path)
+    # same size, and a modification time in the same second
+    os.utime(runoff_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1000))
+    assert os.stat(runoff_path).st_size == stat.st_size
+
+    assert read_stored(runoff_path, dict(READ_OPTIONS)) is None
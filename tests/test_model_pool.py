@@ -0,0 +1,111 @@
+import os
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+
+pytest.importorskip('pywr')
+
+from pywr.core import Model
+from pywr.parameters import Parameter
+
+from sierra.utilities.flow_index import get_flow_index
+from sierra.utilities.model_pool import PooledModels
+from sierra.utilities.tables import prepare_tables
+
+# the second climate's dates are outside the first climate's inputs
+CLIMATES = {
+    'historical/A': ('2000-10-01', '2000-12-31'),
+    'gcms/B': ('2030-10-01', '2030-12-31'),
+}
+
+
+class ForecastInflowParameter(Parameter):
+    """The inflow over the next 30 days, summed with the model's flow index (as WaterLPParameter.flow_window_sum)."""
+
+    def value(self, timestep, scenario_index):
+        start = timestep.datetime
+        sums = get_flow_index(self.model, 'Inflow/Runoff').date_window_sum(start, start + pd.DateOffset(days=29))
+        return sums[scenario_index.global_id]
+
+    @classmethod
+    def load(cls, model, data):
+        return cls(model, name=data.get('name'))
+
+
+ForecastInflowParameter.register()
+
+
+def write_inputs(folder):
+    for i, (climate, (start, end)) in enumerate(CLIMATES.items()):
+        runoff_path = os.path.join(folder, 'hydrology', climate, 'runoff')
+        os.makedirs(runoff_path)
+        dates = pd.date_range(start, pd.Timestamp(end) + pd.DateOffset(days=60), name='Date')
+        flows = np.random.default_rng(i).uniform(1.0, 10.0, len(dates))
+        pd.DataFrame({'flow': flows}, index=dates).to_csv(os.path.join(runoff_path, 'inflow.csv'))
+
+
+def write_model(folder, climate):
+    start, end = CLIMATES[climate]
+    m = {
+        'metadata': {'title': 'Model pool test', 'minimum_version': '0.1'},
+        'timestepper': {'start': start, 'end': end, 'timestep': 1},
+        'nodes': [
+            {'name': 'Inflow', 'type': 'Catchment', 'flow': 'Inflow/Runoff'},
+            {'name': 'Outflow', 'type': 'Output', 'cost': -10},
+        ],
+        'edges': [['Inflow', 'Outflow']],
+        'parameters': {
+            'Inflow/Runoff': {
+                'type': 'dataframe',
+                'url': 'hydrology/{}/runoff/inflow.csv'.format(climate),
+                'column': 'flow',
+                'index_col': 0,
+                'parse_dates': True,
+            },
+            'Forecast Inflow': {'type': 'ForecastInflowParameter'},
+        },
+        'recorders': {
+            'Inflow/flow': {'type': 'NumpyArrayNodeRecorder', 'node': 'Inflow'},
+            'Inflow/forecast': {'type': 'NumpyArrayParameterRecorder', 'parameter': 'Forecast Inflow'},
+        },
+    }
+    path = os.path.join(folder, 'pywr_model_{}.json'.format(climate.replace('/', '_')))
+    with open(path, 'w') as f:
+        json.dump(m, f)
+    return path
+
+
+def load(path):
+    model = Model.load(path)
+    prepare_tables(model)
+    model.setup()
+    return model
+
+
+def run(model):
+    model.run()
+    return {recorder.name: recorder.to_dataframe() for recorder in model.recorders}
+
+
+def test_replace_climate_matches_fresh_load(tmp_path):
+    write_inputs(str(tmp_path))
+    paths = {climate: write_model(str(tmp_path), climate) for climate in CLIMATES}
+    first, second = list(CLIMATES)
+
+    model = load(paths[first])
+    run(model)
+
+    pooled = PooledModels(first, [model], [paths[first]])
+    start, end = CLIMATES[second]
+    pooled.replace_climate(second, start, end)
+    pooled_results = run(model)
+
+    fresh_results = run(load(paths[second]))
+
+    assert set(pooled_results) == set(fresh_results)
+    for name, df in fresh_results.items():
+        assert pooled_results[name].index.equals(df.index), name
+        np.testing.assert_allclose(pooled_results[name].values, df.values, err_msg=name)
+    assert (fresh_results['Inflow/forecast'].values > 0).all()
@@ -0,0 +1,36 @@
+import os
+import json
+
+import pytest
+
+pytest.importorskip('pywr')
+
+from sierra.utilities.network import simplify_network
+
+TESTS_PATH = os.path.dirname(os.path.realpath(__file__))
+MODELS_PATH = os.path.join(os.path.dirname(TESTS_PATH), 'sierra', 'models')
+# simplified models saved from the original implementation of simplify_network
+SIMPLIFIED_PATH = os.path.join(TESTS_PATH, 'data', 'simplified')
+
+BASINS = ['stanislaus', 'tuolumne', 'merced', 'upper_san_joaquin']
+
+# aggregated runoff urls include the data path
+DATA_PATH = '../data'
+
+
+def simplified_model(basin):
+    """Simplify a basin's base model with the options used by _run_model."""
+    with open(os.path.join(MODELS_PATH, basin, 'pywr_model.json')) as f:
+        m = json.load(f)
+    return simplify_network(m, basin=basin, climate='historical/Livneh', delete_gauges=True, delete_observed=True)
+
+
+@pytest.mark.parametrize('basin', BASINS)
+def test_simplify_network_matches_saved_output(basin, monkeypatch):
+    monkeypatch.setenv('SIERRA_DATA_PATH', DATA_PATH)
+    with open(os.path.join(SIMPLIFIED_PATH, '{}.json'.format(basin))) as f:
+        expected = f.read()
+
+    # the saved files are compared as text, so that the order of nodes, parameters, etc. is checked too
+    assert json.dumps(simplified_model(basin), indent=2) == expected
+
@@ -0,0 +1,74 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+pytest.importorskip('pywr')
+
+from pywr.core import Model, Scenario
+from pywr.nodes import Input, Link, Output, Storage
+from pywr.parameters import DataFrameParameter, Parameter
+from pywr.recorders import NumpyArrayNodeRecorder, NumpyArrayStorageRecorder, NumpyArrayParameterRecorder
+
+from sierra.utilities.planning import roll_planning_model
+
+
+class StepsSinceResetParameter(Parameter):
+    """A parameter with state that carries over from one time step to the next, until the model is reset."""
+
+    def __init__(self, model, base, **kwargs):
+        super().__init__(model, **kwargs)
+        self.base = base
+        self.steps = 0
+
+    def reset(self):
+        super().reset()
+        self.steps = 0
+
+    def after(self):
+        super().after()
+        self.steps += 1
+
+    def value(self, timestep, scenario_index):
+        return self.base + self.steps + scenario_index.global_id
+
+
+def planning_model():
+    model = Model(start=pd.Timestamp('2000-10-01'), end=pd.Timestamp('2001-09-30'))
+    Scenario(model, 'scenario', size=2)
+
+    dates = pd.date_range('2000-10-01', '2001-09-30')
+    runoff = pd.Series(np.random.default_rng(0).uniform(1.0, 20.0, len(dates)), index=dates)
+
+    inflow = Input(model, 'Inflow', max_flow=DataFrameParameter(model, runoff), min_flow=0.0)
+    reservoir = Storage(model, 'Reservoir', max_volume=100.0, initial_volume=40.0, cost=-1.0)
+    release = Link(model, 'Release', max_flow=StepsSinceResetParameter(model, 5.0, name='Release/Max Flow'))
+    demand = Output(model, 'Demand', max_flow=12.0, cost=-5.0)
+    spill = Output(model, 'Spill', cost=2.0)
+    inflow.connect(reservoir)
+    reservoir.connect(release)
+    release.connect(demand)
+    reservoir.connect(spill)
+
+    recorders = [
+        NumpyArrayNodeRecorder(model, demand),
+        NumpyArrayStorageRecorder(model, reservoir),
+        NumpyArrayParameterRecorder(model, model.parameters['Release/Max Flow']),
+    ]
+    model.setup()
+    return model, recorders
+
+
+def test_rolled_planning_matches_reset():
+    reset_model, reset_recorders = planning_model()
+    rolled_model, rolled_recorders = planning_model()
+
+    # the planning model is stepped once at the start of each month
+    for start in pd.date_range('2000-10-01', '2001-03-01', freq='MS'):
+        reset_model.reset(start=start)
+        reset_model.step()
+        roll_planning_model(rolled_model, start)
+        rolled_model.step()
+
+        for reset_recorder, rolled_recorder in zip(reset_recorders, rolled_recorders):
+            np.testing.assert_allclose(rolled_recorder.data, reset_recorder.data)
+        np.testing.assert_allclose(rolled_model.nodes['Reservoir'].volume, reset_model.nodes['Reservoir'].volume)